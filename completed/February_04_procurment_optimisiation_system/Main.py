@@ -1,3 +1,7 @@
+import argparse
+import hashlib
+import json
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -6,39 +10,144 @@ from pathlib import Path
 # ============================================================
 
 DATA_DIR = Path(r"C:\Users\Samue\OneDrive\Documents\OneDrive\Projecs\ai-skills-challenge-log\challenge_data\February_04_2026")
+OUTPUT_DIR = Path(__file__).parent / "output"
+CLEANED_PO_PATH = OUTPUT_DIR / "purchase_orders_clean.parquet"
+PO_CHUNK_ROWS = 500_000  # rows per chunk in --chunked mode; bounds the per-chunk working set
+SNAPSHOT_DIR = OUTPUT_DIR / "snapshot"
+# Bump whenever a cleanse_* function changes what it produces; invalidates snapshots
+CLEANSING_RULES_VERSION = 1
+AGGREGATES_DIR = OUTPUT_DIR / "aggregates"
+AGGREGATES_VERSION = 3  # layout of the persisted aggregate state
+AGGREGATE_BLOCK_ROWS = 10_000  # rows per watermark digest block; also the rows re-checked each run
+SOURCE_FILES = {
+    "po": "purchase_orders.csv",
+    "budgets": "department_budgets.csv",
+    "vendors": "vendor_information.csv",
+}
+
+
+# ---- Column schemas (standardised names; unlisted columns stay strings) ----
+# Low-cardinality text is read as category, dates are parsed at read time and
+# quantities use compact integers. Money stays float64 so cent-level total
+# validation is unaffected.
+PO_SCHEMA = {
+    "date": "datetime",
+    "department": "category",
+    "vendor_id": "category",
+    "category": "category",
+    "approver": "category",
+    "payment_terms": "category",
+    "quantity": "int32",
+    "unit_price": "float64",
+    "total_amount": "float64",
+}
+BUDGET_SCHEMA = {
+    "department": "category",
+    "annual_budget": "float64",
+    "quarterly_budget": "float64",
+    "current_quarter_spent": "float64",
+    "approver": "category",
+    "approval_limit": "float64",
+}
+VENDOR_SCHEMA = {
+    "vendor_id": "category",
+    "category": "category",
+    "payment_terms": "category",
+    "delivery_rating": "float64",
+    "quality_rating": "float64",
+    "contract_expiry": "datetime",
+}
 
 
 # ---- Load raw data ----
-def load_data():
-    purchase_orders = pd.read_csv(DATA_DIR / "purchase_orders.csv")
-    department_budgets = pd.read_csv(DATA_DIR / "department_budgets.csv")
-    vendor_info = pd.read_csv(DATA_DIR / "vendor_information.csv")
+def standard_column_name(name):
+    return name.strip().lower().replace(" ", "_")
+
+
+def read_csv_typed(path, schema, engine="c"):
+    """
+    Read a CSV with the dtypes in `schema` (keyed by standardised column
+    name). Numeric columns holding unparseable values fall back to
+    pd.to_numeric(errors="coerce"), and unparseable dates to NaT, as the
+    cleansing steps would.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    raw_names = {standard_column_name(name): name for name in header}
+    present = {raw_names[col]: kind for col, kind in schema.items() if col in raw_names}
+    dates = [name for name, kind in present.items() if kind == "datetime"]
+    numeric = {name: kind for name, kind in present.items() if kind not in ("datetime", "category")}
+    categories = {name: "category" for name, kind in present.items() if kind == "category"}
+
+    if engine == "pyarrow":
+        # pyarrow parses timestamps natively; parse_dates would go via Python date objects
+        typed, parse_dates = {**categories, **numeric, **{name: "datetime64[ns]" for name in dates}}, []
+    else:
+        typed, parse_dates = {**categories, **numeric}, dates
+
+    try:
+        df = pd.read_csv(path, dtype=typed, parse_dates=parse_dates, engine=engine)
+    except (ValueError, TypeError):
+        # Dirty values (text in a numeric or date column, blanks in an integer column): coerce after reading
+        df = pd.read_csv(path, dtype=categories, engine=engine)
+        for name, kind in numeric.items():
+            values = pd.to_numeric(df[name], errors="coerce")
+            if kind.startswith("int") and values.isna().any():
+                kind = "float64"  # integers with gaps stay float, as pd.to_numeric leaves them
+            df[name] = values.astype(kind)
+
+    for name in dates:
+        if not pd.api.types.is_datetime64_any_dtype(df[name]):
+            df[name] = pd.to_datetime(df[name], errors="coerce")
+    return df
+
+
+def load_data(engine="c"):
+    purchase_orders = read_csv_typed(DATA_DIR / "purchase_orders.csv", PO_SCHEMA, engine)
+    department_budgets = read_csv_typed(DATA_DIR / "department_budgets.csv", BUDGET_SCHEMA, engine)
+    vendor_info = read_csv_typed(DATA_DIR / "vendor_information.csv", VENDOR_SCHEMA, engine)
     return purchase_orders, department_budgets, vendor_info
 
 
-# ---- Cleansing Pipeline ----
-def cleanse_purchase_orders(df):
-    raw_count = len(df)
-    issues = []
+def map_strings(col, func):
+    """
+    Apply a vectorised string transform (Series -> Series) to a column. For
+    category columns only the categories are transformed; categories that
+    become equal are merged and the result stays sorted, so groupby order
+    matches that of plain strings.
+    """
+    if not isinstance(col.dtype, pd.CategoricalDtype):
+        return func(col)
+    new_codes, new_categories = pd.factorize(func(pd.Series(col.cat.categories)), sort=True)
+    codes = col.cat.codes.to_numpy()
+    codes = np.where(codes < 0, -1, new_codes[codes])
+    return pd.Series(pd.Categorical.from_codes(codes, new_categories), index=col.index, name=col.name)
 
-    # 1. Strip whitespace from string columns
+
+def strip_string_columns(df):
     str_cols = df.select_dtypes(include="object").columns
     df[str_cols] = df[str_cols].apply(lambda col: col.str.strip())
+    for col in df.select_dtypes(include="category").columns:
+        df[col] = map_strings(df[col], lambda values: values.str.strip())
+    return df
+
+
+# ---- Cleansing Pipeline ----
+def standardise_po_frame(df):
+    # 1. Strip whitespace from string columns
+    df = strip_string_columns(df)
 
     # 2. Standardise column names
     df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+    return df
 
-    # 3. Remove duplicate PO rows
-    dupes = df.duplicated(subset="po_id", keep="first").sum()
-    if dupes:
-        issues.append(f"Removed {dupes} duplicate PO rows")
-        df = df.drop_duplicates(subset="po_id", keep="first")
+
+def cleanse_po_values(df):
+    """Steps 4-10 of the PO cleansing, row by row; returns (df, counts) for the report."""
+    counts = {}
 
     # 4. Parse dates
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    bad_dates = df["date"].isna().sum()
-    if bad_dates:
-        issues.append(f"{bad_dates} unparseable dates set to NaT")
+    counts["bad_dates"] = df["date"].isna().sum()
 
     # 5. Ensure numeric types
     for col in ["quantity", "unit_price", "total_amount"]:
@@ -47,41 +156,76 @@ def cleanse_purchase_orders(df):
     # 6. Recalculate & validate total_amount
     expected = (df["quantity"] * df["unit_price"]).round(2)
     mismatch = (df["total_amount"] - expected).abs() > 0.01
-    n_mismatch = mismatch.sum()
-    if n_mismatch:
-        issues.append(f"Corrected {n_mismatch} total_amount mismatches (qty * unit_price)")
+    counts["mismatches"] = mismatch.sum()
+    if counts["mismatches"]:
         df.loc[mismatch, "total_amount"] = expected[mismatch]
 
     # 7. Flag missing contract IDs
-    missing_contracts = df["contract_id"].isna().sum()
-    if missing_contracts:
-        issues.append(f"{missing_contracts} POs have no contract_id (spot purchases)")
+    counts["missing_contracts"] = df["contract_id"].isna().sum()
 
     # 8. Standardise department names (title case, preserve abbreviations)
     ABBREVIATIONS = {"It": "IT", "Hr": "HR"}
-    df["department"] = df["department"].str.title().replace(ABBREVIATIONS)
+    df["department"] = map_strings(df["department"], lambda values: values.str.title().replace(ABBREVIATIONS))
 
     # 9. Standardise payment terms
-    df["payment_terms"] = df["payment_terms"].str.title()
+    df["payment_terms"] = map_strings(df["payment_terms"], lambda values: values.str.title())
 
     # 10. Flag negative or zero amounts
-    bad_amounts = (df["total_amount"] <= 0).sum()
-    if bad_amounts:
-        issues.append(f"{bad_amounts} POs with zero/negative total_amount")
+    counts["bad_amounts"] = (df["total_amount"] <= 0).sum()
+
+    return df, counts
+
 
+def po_cleansing_issues(dupes, counts):
+    issues = []
+    if dupes:
+        issues.append(f"Removed {dupes} duplicate PO rows")
+    if counts["bad_dates"]:
+        issues.append(f"{counts['bad_dates']} unparseable dates set to NaT")
+    if counts["mismatches"]:
+        issues.append(f"Corrected {counts['mismatches']} total_amount mismatches (qty * unit_price)")
+    if counts["missing_contracts"]:
+        issues.append(f"{counts['missing_contracts']} POs have no contract_id (spot purchases)")
+    if counts["bad_amounts"]:
+        issues.append(f"{counts['bad_amounts']} POs with zero/negative total_amount")
+    return issues
+
+
+def print_po_cleansing_report(raw_count, row_count, issues, columns, date_min, date_max,
+                              n_vendors, n_departments, total_spend):
     print(f"\n{'='*60}")
     print("PURCHASE ORDERS CLEANSING REPORT")
     print(f"{'='*60}")
     print(f"  Raw rows loaded       : {raw_count}")
-    print(f"  Rows after cleansing  : {len(df)}")
+    print(f"  Rows after cleansing  : {row_count}")
     print(f"  Issues found & fixed  : {len(issues)}")
     for i, issue in enumerate(issues, 1):
         print(f"    {i}. {issue}")
-    print(f"  Columns               : {list(df.columns)}")
-    print(f"  Date range            : {df['date'].min().date()} to {df['date'].max().date()}")
-    print(f"  Unique vendors        : {df['vendor_id'].nunique()}")
-    print(f"  Unique departments    : {df['department'].nunique()}")
-    print(f"  Total spend           : ${df['total_amount'].sum():,.2f}")
+    print(f"  Columns               : {list(columns)}")
+    print(f"  Date range            : {date_min.date()} to {date_max.date()}")
+    print(f"  Unique vendors        : {n_vendors}")
+    print(f"  Unique departments    : {n_departments}")
+    print(f"  Total spend           : ${total_spend:,.2f}")
+
+
+def cleanse_purchase_orders(df):
+    raw_count = len(df)
+
+    # 1-2. Strip strings & standardise column names
+    df = standardise_po_frame(df)
+
+    # 3. Remove duplicate PO rows
+    dupes = df.duplicated(subset="po_id", keep="first").sum()
+    if dupes:
+        df = df.drop_duplicates(subset="po_id", keep="first")
+
+    # 4-10. Dates, numerics, totals, names & flags
+    df, counts = cleanse_po_values(df)
+
+    print_po_cleansing_report(raw_count, len(df), po_cleansing_issues(dupes, counts), df.columns,
+                              df["date"].min(), df["date"].max(),
+                              df["vendor_id"].nunique(), df["department"].nunique(),
+                              df["total_amount"].sum())
 
     return df
 
@@ -91,8 +235,7 @@ def cleanse_department_budgets(df):
     issues = []
 
     # 1. Strip whitespace from string columns
-    str_cols = df.select_dtypes(include="object").columns
-    df[str_cols] = df[str_cols].apply(lambda col: col.str.strip())
+    df = strip_string_columns(df)
 
     # 2. Standardise column names
     df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
@@ -126,7 +269,7 @@ def cleanse_department_budgets(df):
 
     # 7. Standardise department names (preserve abbreviations)
     ABBREVIATIONS = {"It": "IT", "Hr": "HR"}
-    df["department"] = df["department"].str.title().replace(ABBREVIATIONS)
+    df["department"] = map_strings(df["department"], lambda values: values.str.title().replace(ABBREVIATIONS))
 
     print(f"\n{'='*60}")
     print("DEPARTMENT BUDGETS CLEANSING REPORT")
@@ -147,8 +290,7 @@ def cleanse_vendor_info(df):
     issues = []
 
     # 1. Strip whitespace from string columns
-    str_cols = df.select_dtypes(include="object").columns
-    df[str_cols] = df[str_cols].apply(lambda col: col.str.strip())
+    df = strip_string_columns(df)
 
     # 2. Standardise column names
     df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
@@ -186,7 +328,7 @@ def cleanse_vendor_info(df):
     issues.append("Parsed volume discount tiers into numeric pct & threshold columns")
 
     # 8. Standardise payment terms
-    df["payment_terms"] = df["payment_terms"].str.title()
+    df["payment_terms"] = map_strings(df["payment_terms"], lambda values: values.str.title())
 
     print(f"\n{'='*60}")
     print("VENDOR INFORMATION CLEANSING REPORT")
@@ -204,15 +346,328 @@ def cleanse_vendor_info(df):
     return df
 
 
-def run_cleansing_pipeline():
-    print("Loading raw data...")
-    po_raw, budgets_raw, vendors_raw = load_data()
+# ---- Chunked (out-of-core) PO cleansing ----
+def po_id_hashes(ids):
+    return pd.util.hash_pandas_object(ids, index=False).to_numpy()
+
+
+class SeenPoIds:
+    """
+    Compact set of po_ids seen so far, for de-duplicating across chunks.
+
+    Stores 64-bit hashes (8 bytes per PO) in a few sorted uint64 runs, so a
+    hit may be a hash collision rather than a repeated po_id; callers confirm
+    hits against the real ids (see first_occurrence_positions). A new
+    run is merged into the previous one while it is at least half its size,
+    so there are only O(log n) runs to binary-search. Merges are a stable
+    (timsort) sort of two sorted runs, i.e. linear.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, hashes):
+        seen = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            pos = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+            seen |= run[pos] == hashes
+        return seen
+
+    def add(self, hashes):
+        """Add hashes not already seen (repeats within `hashes` are harmless)."""
+        if len(hashes) == 0:
+            return
+        self._runs.append(np.sort(hashes))
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newest = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newest]), kind="stable")
+
+
+def po_parquet_schema(columns):
+    import pyarrow as pa
+
+    types = {"date": pa.timestamp("ns"), "quantity": pa.float64(),
+             "unit_price": pa.float64(), "total_amount": pa.float64()}
+    return pa.schema([(col, types.get(col, pa.string())) for col in columns])
+
+
+def first_occurrence_positions(csv_path, hashes, chunk_rows=PO_CHUNK_ROWS):
+    """
+    Re-read only the po_id column and return the row positions at which each
+    po_id whose hash is in `hashes` first occurs. Holds one chunk plus the
+    distinct matching po_ids.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    po_id_col = next(name for name in header if standard_column_name(name) == "po_id")
+    known, positions = set(), []
+    for chunk in pd.read_csv(csv_path, usecols=[po_id_col], chunksize=chunk_rows):
+        ids = standardise_po_frame(chunk)["po_id"]
+        ids = ids[np.isin(po_id_hashes(ids), hashes)]
+        ids = ids[~ids.duplicated(keep="first") & ~ids.isin(known)]
+        known.update(ids)
+        positions.append(ids.index.to_numpy())
+    return np.concatenate(positions) if positions else np.array([], dtype=np.int64)
+
+
+def read_rows_at(csv_path, positions, chunk_rows=PO_CHUNK_ROWS):
+    """Re-read the raw CSV rows at `positions` (a few rows; index = row position)."""
+    rows = [chunk[chunk.index.isin(positions)] for chunk in pd.read_csv(csv_path, chunksize=chunk_rows)]
+    return standardise_po_frame(pd.concat(rows))
+
+
+def cleanse_purchase_orders_chunked(csv_path, out_path=CLEANED_PO_PATH, chunk_rows=PO_CHUNK_ROWS):
+    """
+    Same cleansing as cleanse_purchase_orders, streamed chunk by chunk into
+    one Parquet file (a row group per chunk). First occurrence of a po_id
+    wins across the whole file, as with drop_duplicates. Rows dropped as
+    repeats of an earlier chunk come from a hash match, so they are confirmed
+    against the real po_ids in a second pass over that column; a PO wrongly
+    dropped by a hash collision is re-read and kept after all, in a final
+    row group. Returns the Parquet path.
+
+    Memory is one chunk plus state that grows with the ledger rather than
+    the chunk: 8 bytes per kept PO (SeenPoIds), 16 bytes per cross-chunk
+    duplicate (hash and row position) and, during the confirm pass, the
+    distinct po_ids among those duplicates.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(".parquet.tmp")
+
+    seen = SeenPoIds()
+    writer = schema = columns = None
+    raw_count = row_count = dupes = 0
+    counts = {"bad_dates": 0, "mismatches": 0, "missing_contracts": 0, "bad_amounts": 0}
+    date_mins, date_maxes = [], []
+    vendor_ids, departments = set(), set()
+    total_spend = 0.0
+    held_hashes, held_positions = [], []  # rows whose po_id hash matched an earlier chunk
+
+    def write_chunk(chunk):
+        nonlocal writer, schema, columns, row_count, total_spend
+        chunk, chunk_counts = cleanse_po_values(chunk)
+        for key, value in chunk_counts.items():
+            counts[key] += int(value)
+
+        row_count += len(chunk)
+        date_mins.append(chunk["date"].min())
+        date_maxes.append(chunk["date"].max())
+        vendor_ids.update(chunk["vendor_id"].dropna().unique())
+        departments.update(chunk["department"].dropna().unique())
+        total_spend += chunk["total_amount"].sum()
+
+        if writer is None:
+            columns = list(chunk.columns)
+            schema = po_parquet_schema(columns)
+            writer = pq.ParquetWriter(tmp_path, schema)
+        writer.write_table(pa.Table.from_pandas(chunk[columns], schema=schema, preserve_index=False))
+
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+            raw_count += len(chunk)
+            chunk = standardise_po_frame(chunk)
+
+            # 3. Remove duplicate PO rows, within the chunk and against earlier chunks
+            hashes = po_id_hashes(chunk["po_id"])
+            repeated = chunk["po_id"].duplicated(keep="first").to_numpy()
+            earlier = seen.contains(hashes) & ~repeated
+            seen.add(hashes[~(repeated | earlier)])
+            dupes += int(repeated.sum() + earlier.sum())
+            if earlier.any():
+                held_hashes.append(hashes[earlier])
+                held_positions.append(chunk.index.to_numpy()[earlier])
+
+            write_chunk(chunk[~(repeated | earlier)])
+            print(f"  ...{raw_count:,} rows read, {row_count:,} kept", flush=True)
+
+        # Keep dropped rows that are in fact the first occurrence of their po_id (hash collisions)
+        if held_positions:
+            held_positions = np.concatenate(held_positions)
+            first = first_occurrence_positions(csv_path, np.unique(np.concatenate(held_hashes)), chunk_rows)
+            collided = held_positions[np.isin(held_positions, first)]
+            if len(collided):
+                collided = read_rows_at(csv_path, collided, chunk_rows)
+                dupes -= len(collided)
+                write_chunk(collided)
+                print(f"  Kept {len(collided):,} PO(s) whose po_id hash collided with an earlier PO", flush=True)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError(f"No rows in {csv_path}")
+    tmp_path.replace(out_path)
+
+    print_po_cleansing_report(raw_count, row_count, po_cleansing_issues(dupes, counts), columns,
+                              pd.Series(date_mins).min(), pd.Series(date_maxes).max(),
+                              len(vendor_ids), len(departments), total_spend)
+    print(f"  Cleaned Parquet       : {out_path}")
+
+    return out_path
+
+
+# ---- Cleaned-data snapshot cache ----
+def file_fingerprint(path, known=None):
+    """
+    Size, mtime and SHA-256 of a source file. When size and mtime match a
+    `known` fingerprint its hash is reused instead of re-reading the file.
+    """
+    stat = Path(path).stat()
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if known and all(known.get(key) == value for key, value in fingerprint.items()):
+        fingerprint["sha256"] = known["sha256"]
+        return fingerprint
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    fingerprint["sha256"] = digest.hexdigest()
+    return fingerprint
+
+
+def snapshot_key(chunked=False, data_dir=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Fingerprints of the current source files, the cleansing rules version and
+    the PO cleansing mode. Chunked cleansing goes through Parquet
+    (po_parquet_schema) and yields different dtypes, so each mode has its own
+    snapshot.
+    """
+    data_dir = Path(data_dir or DATA_DIR)
+    known = read_manifest(snapshot_dir) or {}
+    known_sources = known.get("sources", {})
+    return {
+        "rules_version": CLEANSING_RULES_VERSION,
+        "po_mode": "chunked" if chunked else "in_memory",
+        "sources": {name: file_fingerprint(data_dir / filename, known_sources.get(name))
+                    for name, filename in SOURCE_FILES.items()},
+    }
+
+
+def snapshot_is_valid(key, snapshot_dir=SNAPSHOT_DIR):
+    """
+    True when the snapshot was built by these rules, in the same PO cleansing
+    mode, from sources with the same size and content. A file whose mtime
+    changed but whose content did not (e.g. a re-copy) still matches.
+    """
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None or any(manifest.get(field) != key[field] for field in ("rules_version", "po_mode")):
+        return False
+    stored = manifest.get("sources", {})
+    for name, fingerprint in key["sources"].items():
+        if name not in stored:
+            return False
+        if (stored[name]["size"], stored[name]["sha256"]) != (fingerprint["size"], fingerprint["sha256"]):
+            return False
+        if not (Path(snapshot_dir) / f"{name}.parquet").exists():
+            return False
+    return True
+
+
+def load_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    tables = load_tables(SOURCE_FILES, snapshot_dir)
+    return tables["po"], tables["budgets"], tables["vendors"]
+
+
+def save_snapshot(frames, key, snapshot_dir=SNAPSHOT_DIR):
+    """Write the cleaned (po, budgets, vendors) frames and the key they were built from."""
+    tables = dict(zip(SOURCE_FILES, frames))
+    save_tables(tables, {**key, "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+                         "rows": {name: len(frame) for name, frame in tables.items()}},
+                snapshot_dir)
+
+
+# ---- Parquet table directories (snapshot, aggregate state) ----
+def read_manifest(directory):
+    try:
+        with open(Path(directory) / "manifest.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(manifest, directory):
+    manifest_path = Path(directory) / "manifest.json"
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    tmp_path.replace(manifest_path)
+
+
+def load_tables(names, directory):
+    return {name: pd.read_parquet(Path(directory) / f"{name}.parquet") for name in names}
+
+
+def save_tables(tables, manifest, directory):
+    """
+    Write {name: frame} as Parquet files plus a manifest.json. Tables go to
+    temp files first and the manifest is written last, so an interrupted save
+    never leaves a directory that looks valid.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "manifest.json").unlink(missing_ok=True)
+    for name, frame in tables.items():
+        tmp_path = directory / f"{name}.parquet.tmp"
+        frame.to_parquet(tmp_path, index=False)
+        tmp_path.replace(directory / f"{name}.parquet")
+    write_manifest(manifest, directory)
+
+
+def run_cleansing_pipeline(chunked=False, chunk_rows=PO_CHUNK_ROWS, engine="c",
+                           use_snapshot=True, refresh_snapshot=False):
+    """
+    Load and cleanse the three source files. With `use_snapshot`, cleaned
+    frames are reused from SNAPSHOT_DIR while the sources and cleansing rules
+    are unchanged, and saved there after a fresh cleanse.
+    """
+    if not use_snapshot:
+        return cleanse_sources(chunked, chunk_rows, engine)
+
+    # Fingerprint before reading, so a source edited mid-run leaves the snapshot stale rather than wrong
+    key = snapshot_key(chunked)
+    if not refresh_snapshot and snapshot_is_valid(key):
+        po, budgets, vendors = load_snapshot()
+        manifest = read_manifest(SNAPSHOT_DIR)
+        if manifest["sources"] != key["sources"]:
+            # Content unchanged but mtimes moved: record them so the next run skips re-hashing
+            write_manifest({**manifest, "sources": key["sources"]}, SNAPSHOT_DIR)
+        print(f"Loaded cleaned snapshot from {SNAPSHOT_DIR} "
+              f"(sources unchanged, rules v{CLEANSING_RULES_VERSION}, {key['po_mode'].replace('_', '-')} cleanse)")
+        print(f"  purchase_orders   : {po.shape}")
+        print(f"  department_budgets: {budgets.shape}")
+        print(f"  vendor_information: {vendors.shape}")
+        return po, budgets, vendors
+
+    po, budgets, vendors = cleanse_sources(chunked, chunk_rows, engine)
+    save_snapshot((po, budgets, vendors), key)
+    print(f"  Saved cleaned snapshot to {SNAPSHOT_DIR}")
+    return po, budgets, vendors
+
+
+def cleanse_sources(chunked=False, chunk_rows=PO_CHUNK_ROWS, engine="c"):
+    if chunked:
+        # Purchase orders never held whole in memory while cleansing
+        print(f"Cleansing purchase_orders in chunks of {chunk_rows:,} rows...")
+        po_path = cleanse_purchase_orders_chunked(DATA_DIR / "purchase_orders.csv", CLEANED_PO_PATH, chunk_rows)
+        budgets_raw = read_csv_typed(DATA_DIR / "department_budgets.csv", BUDGET_SCHEMA, engine)
+        vendors_raw = read_csv_typed(DATA_DIR / "vendor_information.csv", VENDOR_SCHEMA, engine)
+        po = pd.read_parquet(po_path)
+    else:
+        print("Loading raw data...")
+        po_raw, budgets_raw, vendors_raw = load_data(engine)
 
-    print(f"  purchase_orders   : {po_raw.shape}")
-    print(f"  department_budgets: {budgets_raw.shape}")
-    print(f"  vendor_information: {vendors_raw.shape}")
+        print(f"  purchase_orders   : {po_raw.shape}")
+        print(f"  department_budgets: {budgets_raw.shape}")
+        print(f"  vendor_information: {vendors_raw.shape}")
+
+        po = cleanse_purchase_orders(po_raw.copy())
 
-    po = cleanse_purchase_orders(po_raw.copy())
     budgets = cleanse_department_budgets(budgets_raw.copy())
     vendors = cleanse_vendor_info(vendors_raw.copy())
 
@@ -223,24 +678,307 @@ def run_cleansing_pipeline():
     return po, budgets, vendors
 
 
+# ============================================================
+# Incremental Aggregates (for phases 2, 4 and 5)
+# ============================================================
+
+# Grouping keys of each aggregate table; "month" is derived from date
+AGGREGATE_LEVELS = {
+    "vendor": ["vendor_id", "vendor_name"],
+    "department": ["department"],
+    "department_vendor": ["department", "vendor_id"],
+    "department_category": ["department", "category"],
+    "month": ["month"],
+    "category": ["category"],
+    "item": ["item_description"],
+}
+# Additive per-group statistics. Money is summed in whole cents (integer-valued float64),
+# which is exact, so totals and means don't depend on how the history was split into runs.
+# PO columns the statistics are built from (po_id and contract_id only via notna)
+AGGREGATE_INPUTS = ["date", "department", "vendor_id", "vendor_name", "category", "item_description",
+                    "unit_price", "total_amount"]
+SUM_STATS = ["rows", "po_count", "amount_count", "amount_cents", "contracted",
+             "spot_po_count", "spot_amount_cents", "price_cents"]
+
+
+def to_cents(values):
+    return (values * 100).round()
+
+
+def po_group_stats(po, keys):
+    """
+    Per-group counts, cent sums and unit-price Welford statistics (count,
+    mean, M2) of a batch of cleaned POs.
+    """
+    contracted = po["contract_id"].notna()
+    has_po_id = po["po_id"].notna()
+    amount_cents = to_cents(po["total_amount"])
+    columns = {key: po["date"].dt.to_period("M") if key == "month" else po[key] for key in keys}
+    frame = pd.DataFrame({
+        **columns,
+        "rows": 1,
+        "po_count": has_po_id.astype("int64"),
+        "amount_count": po["total_amount"].notna().astype("int64"),
+        "amount_cents": amount_cents,
+        "contracted": contracted.astype("int64"),
+        "spot_po_count": (has_po_id & ~contracted).astype("int64"),
+        "spot_amount_cents": amount_cents.where(~contracted),
+        "price_cents": to_cents(po["unit_price"]),
+        "price": po["unit_price"],
+    })
+    grouped = frame.groupby(keys, observed=True)
+    stats = grouped[SUM_STATS].sum()
+    stats["price_count"] = grouped["price"].count()
+    stats["price_mean"] = grouped["price"].mean().fillna(0.0)
+    stats["price_m2"] = (grouped["price"].var(ddof=0) * stats["price_count"]).fillna(0.0)
+    stats = stats.reset_index()
+    # Keys are stored as plain strings ("2024-01" for months), so state from different runs merges
+    stats[keys] = stats[keys].astype("str")
+    return stats
+
+
+def merge_group_stats(a, b, keys):
+    """
+    Combine two group-stat tables: sums add, and the unit-price means and
+    M2s merge with Chan's parallel form of Welford's update.
+    """
+    merged = a.merge(b, on=keys, how="outer", suffixes=("_a", "_b"), sort=True)
+    out = merged[keys].copy()
+    for stat in SUM_STATS:
+        out[stat] = merged[f"{stat}_a"].fillna(0) + merged[f"{stat}_b"].fillna(0)
+    na, nb = merged["price_count_a"].fillna(0), merged["price_count_b"].fillna(0)
+    mean_a, mean_b = merged["price_mean_a"].fillna(0.0), merged["price_mean_b"].fillna(0.0)
+    n = na + nb
+    # nb / n is exactly 0 or 1 when one side is empty, so an unmatched group keeps its values bit for bit
+    weight = (nb / n).where(n > 0, 0.0)
+    delta = mean_b - mean_a
+    out["price_count"] = n
+    out["price_mean"] = mean_a + delta * weight
+    out["price_m2"] = merged["price_m2_a"].fillna(0.0) + merged["price_m2_b"].fillna(0.0) + delta ** 2 * na * weight
+    counts = [stat for stat in SUM_STATS + ["price_count"] if not stat.endswith("_cents")]
+    out[counts] = out[counts].astype("int64")
+    return out
+
+
+class PoAggregates:
+    """
+    Running per-vendor, department, month, category and item statistics of
+    the cleaned purchase orders, persisted between runs so each run only
+    aggregates the POs appended since the last one.
+
+    The watermark is the number of POs aggregated so far plus two SHA-256
+    digests of the aggregated rows' inputs: `chain`, chained over every
+    complete block of AGGREGATE_BLOCK_ROWS rows, and `tail`, over the last
+    AGGREGATE_BLOCK_ROWS rows. Each run re-hashes only the tail and the new
+    POs, so checking and extending cost O(block + appended rows), not
+    O(history). The tail check catches appended, removed or inserted rows
+    and edits near the end; an in-place edit or reorder further back is
+    only caught by verify() (--verify-aggregates), which re-hashes the whole
+    history, or by a --rebuild-aggregates. On a mismatch the state is
+    rebuilt from scratch.
+    """
+
+    def __init__(self, tables=None, rows=0, chain=None, tail=None):
+        self.tables = tables or {}
+        self.rows = rows
+        self.chain = chain or hashlib.sha256().hexdigest()
+        self.tail = tail or hashlib.sha256().hexdigest()
+
+    @property
+    def chain_rows(self):
+        """Rows covered by `chain`: every complete block."""
+        return self.rows - self.rows % AGGREGATE_BLOCK_ROWS
+
+    @property
+    def hash_start(self):
+        """First row whose hash is needed to check the tail and extend the chain."""
+        return max(0, self.rows - AGGREGATE_BLOCK_ROWS)
+
+    @classmethod
+    def load(cls, directory=AGGREGATES_DIR):
+        manifest = read_manifest(directory)
+        if manifest is None or manifest.get("version") != AGGREGATES_VERSION \
+                or manifest.get("rules_version") != CLEANSING_RULES_VERSION:
+            return None
+        try:
+            tables = load_tables(AGGREGATE_LEVELS, directory)
+        except OSError:
+            return None
+        return cls(tables, manifest["rows"], manifest["chain"], manifest["tail"])
+
+    def save(self, directory=AGGREGATES_DIR):
+        save_tables(self.tables, {
+            "version": AGGREGATES_VERSION,
+            "rules_version": CLEANSING_RULES_VERSION,
+            "rows": self.rows,
+            "chain": self.chain,
+            "tail": self.tail,
+        }, directory)
+
+    @staticmethod
+    def row_hashes(po, start=0):
+        """64-bit hash of each PO's aggregate inputs, from row `start` on."""
+        po = po.iloc[start:]
+        inputs = po[AGGREGATE_INPUTS].assign(has_po_id=po["po_id"].notna(), contracted=po["contract_id"].notna())
+        return pd.util.hash_pandas_object(inputs, index=False, categorize=False).to_numpy()
+
+    @staticmethod
+    def chain_blocks(chain, row_hashes):
+        """Extend `chain` with each complete block of `row_hashes` (a block-aligned run)."""
+        for start in range(0, len(row_hashes) - AGGREGATE_BLOCK_ROWS + 1, AGGREGATE_BLOCK_ROWS):
+            block = row_hashes[start:start + AGGREGATE_BLOCK_ROWS]
+            chain = hashlib.sha256(bytes.fromhex(chain) + block.tobytes()).hexdigest()
+        return chain
+
+    def tail_digest(self, row_hashes, rows):
+        """Digest of the last AGGREGATE_BLOCK_ROWS of the first `rows`; `row_hashes` start at hash_start."""
+        offset = self.hash_start
+        return hashlib.sha256(row_hashes[max(0, rows - AGGREGATE_BLOCK_ROWS) - offset:rows - offset].tobytes()).hexdigest()
+
+    def matches(self, po, row_hashes=None):
+        """
+        True when `po` still ends its aggregated prefix with the same rows and
+        is no shorter. `row_hashes` are row_hashes(po, self.hash_start).
+        """
+        if len(po) < self.rows:
+            return False
+        row_hashes = self.row_hashes(po, self.hash_start) if row_hashes is None else row_hashes
+        return self.tail_digest(row_hashes, self.rows) == self.tail
+
+    def verify(self, po):
+        """Full check: re-hash the whole aggregated history against both digests (O(history))."""
+        if not self.matches(po):
+            return False
+        chain = self.chain_blocks(hashlib.sha256().hexdigest(), self.row_hashes(po.iloc[:self.chain_rows]))
+        return chain == self.chain
+
+    def extend(self, po, row_hashes=None):
+        """
+        Aggregate the POs after the watermark; returns how many were applied.
+        `row_hashes` are row_hashes(po, self.hash_start).
+        """
+        new = po.iloc[self.rows:]
+        if len(new):
+            for level, keys in AGGREGATE_LEVELS.items():
+                stats = po_group_stats(new, keys)
+                self.tables[level] = merge_group_stats(self.tables[level], stats, keys) if level in self.tables else stats
+        row_hashes = self.row_hashes(po, self.hash_start) if row_hashes is None else row_hashes
+        chain_start = self.chain_rows - self.hash_start
+        self.chain = self.chain_blocks(self.chain, row_hashes[chain_start:])
+        self.tail = self.tail_digest(row_hashes, len(po))
+        self.rows = len(po)
+        return len(new)
+
+    # ---- Report frames, shaped like the full-recompute groupbys ----
+    @staticmethod
+    def dollars(cents, count=1):
+        """Cent sum (optionally averaged over `count`) in dollars, with a single rounding."""
+        return cents / (count * 100)
+
+    def by_vendor(self):
+        t = self.tables["vendor"]
+        return pd.DataFrame({
+            "vendor_id": t["vendor_id"],
+            "vendor_name": t["vendor_name"],
+            "total_spend": self.dollars(t["amount_cents"]),
+            "po_count": t["po_count"],
+            "avg_po_size": self.dollars(t["amount_cents"], t["amount_count"]),
+        })
+
+    def by_department(self):
+        t = self.tables["department"]
+        unique_vendors = self.tables["department_vendor"].groupby("department").size()
+        unique_categories = self.tables["department_category"].groupby("department").size()
+        return pd.DataFrame({
+            "department": t["department"],
+            "total_spend": self.dollars(t["amount_cents"]),
+            "po_count": t["po_count"],
+            "avg_po_size": self.dollars(t["amount_cents"], t["amount_count"]),
+            "unique_vendors": t["department"].map(unique_vendors).fillna(0).astype("int64"),
+            "unique_categories": t["department"].map(unique_categories).fillna(0).astype("int64"),
+            "contracted": t["contracted"],
+            "spot": t["rows"] - t["contracted"],
+        })
+
+    def by_month(self):
+        t = self.tables["month"]
+        return pd.DataFrame({
+            "month": pd.PeriodIndex(t["month"], freq="M"),
+            "total_spend": self.dollars(t["amount_cents"]),
+            "po_count": t["po_count"],
+        })
+
+    def by_category(self):
+        t = self.tables["category"]
+        return pd.DataFrame({
+            "category": t["category"],
+            "total_spend": self.dollars(t["amount_cents"]),
+            "po_count": t["po_count"],
+            "avg_unit_price": self.dollars(t["price_cents"], t["price_count"]),
+        })
+
+    def item_price_stats(self):
+        """Unit-price mean and sample std of items with more than one PO."""
+        t = self.tables["item"]
+        t = t[t["rows"] > 1]
+        std = np.sqrt(t["price_m2"] / (t["price_count"] - 1)).where(t["price_count"] > 1)
+        return pd.DataFrame({"item_description": t["item_description"],
+                             "mean": self.dollars(t["price_cents"], t["price_count"]), "std": std})
+
+    def spot_by_department(self):
+        t = self.tables["department"]
+        t = t[t["rows"] > t["contracted"]]
+        return pd.DataFrame({
+            "department": t["department"],
+            "spot_count": t["spot_po_count"],
+            "spot_spend": self.dollars(t["spot_amount_cents"]),
+            "total_pos": t["po_count"],
+        })
+
+
+def update_aggregates(po, directory=AGGREGATES_DIR, rebuild=False, verify=False):
+    """
+    Load the persisted aggregates, apply POs past the watermark and save them
+    back. With `verify`, the whole aggregated history is re-hashed first
+    rather than just its tail.
+    """
+    aggregates = None if rebuild else PoAggregates.load(directory)
+    if aggregates is not None:
+        row_hashes = PoAggregates.row_hashes(po, aggregates.hash_start)
+        if not (aggregates.verify(po) if verify else aggregates.matches(po, row_hashes)):
+            print("  Aggregate state does not match the purchase order history; rebuilding")
+            aggregates = None
+    if aggregates is None:
+        aggregates = PoAggregates()
+        row_hashes = PoAggregates.row_hashes(po)
+    previous = aggregates.rows
+    applied = aggregates.extend(po, row_hashes)
+    aggregates.save(directory)
+    print(f"Incremental aggregates: {applied:,} new POs applied to {previous:,} already aggregated")
+    return aggregates
+
+
 # ============================================================
 # Phase 2: Basic Spend Analysis
 # ============================================================
 
-def spend_analysis(po, budgets):
+def spend_analysis(po, budgets, aggregates=None):
     print(f"\n{'='*60}")
     print("PHASE 2: BASIC SPEND ANALYSIS")
     print(f"{'='*60}")
 
     # --- By Vendor ---
-    by_vendor = (
-        po.groupby(["vendor_id", "vendor_name"])
-        .agg(total_spend=("total_amount", "sum"),
-             po_count=("po_id", "count"),
-             avg_po_size=("total_amount", "mean"))
-        .sort_values("total_spend", ascending=False)
-        .reset_index()
-    )
+    if aggregates is not None:
+        by_vendor = aggregates.by_vendor().sort_values("total_spend", ascending=False).reset_index(drop=True)
+    else:
+        by_vendor = (
+            po.groupby(["vendor_id", "vendor_name"], observed=True)
+            .agg(total_spend=("total_amount", "sum"),
+                 po_count=("po_id", "count"),
+                 avg_po_size=("total_amount", "mean"))
+            .sort_values("total_spend", ascending=False)
+            .reset_index()
+        )
     by_vendor["spend_share"] = (by_vendor["total_spend"] / by_vendor["total_spend"].sum() * 100).round(1)
 
     print(f"\n  SPEND BY VENDOR (Top 10)")
@@ -250,15 +988,22 @@ def spend_analysis(po, budgets):
         print(f"  {r['vendor_name']:<25} ${r['total_spend']:>10,.2f} {r['po_count']:>5} ${r['avg_po_size']:>8,.2f} {r['spend_share']:>6.1f}%")
 
     # --- By Department ---
-    by_dept = (
-        po.groupby("department")
-        .agg(total_spend=("total_amount", "sum"),
-             po_count=("po_id", "count"),
-             avg_po_size=("total_amount", "mean"),
-             unique_vendors=("vendor_id", "nunique"))
-        .sort_values("total_spend", ascending=False)
-        .reset_index()
-    )
+    if aggregates is not None:
+        by_dept = (
+            aggregates.by_department()[["department", "total_spend", "po_count", "avg_po_size", "unique_vendors"]]
+            .sort_values("total_spend", ascending=False)
+            .reset_index(drop=True)
+        )
+    else:
+        by_dept = (
+            po.groupby("department", observed=True)
+            .agg(total_spend=("total_amount", "sum"),
+                 po_count=("po_id", "count"),
+                 avg_po_size=("total_amount", "mean"),
+                 unique_vendors=("vendor_id", "nunique"))
+            .sort_values("total_spend", ascending=False)
+            .reset_index()
+        )
     by_dept["spend_share"] = (by_dept["total_spend"] / by_dept["total_spend"].sum() * 100).round(1)
 
     # Merge with budgets to show utilization
@@ -275,13 +1020,16 @@ def spend_analysis(po, budgets):
         print(f"  {r['department']:<15} ${r['total_spend']:>10,.2f} {r['po_count']:>5} {r['unique_vendors']:>8} {budget_str} {r['spend_share']:>6.1f}%")
 
     # --- By Month ---
-    po["month"] = po["date"].dt.to_period("M")
-    by_month = (
-        po.groupby("month")
-        .agg(total_spend=("total_amount", "sum"),
-             po_count=("po_id", "count"))
-        .reset_index()
-    )
+    if aggregates is not None:
+        by_month = aggregates.by_month()
+    else:
+        po["month"] = po["date"].dt.to_period("M")
+        by_month = (
+            po.groupby("month", observed=True)
+            .agg(total_spend=("total_amount", "sum"),
+                 po_count=("po_id", "count"))
+            .reset_index()
+        )
 
     print(f"\n  SPEND BY MONTH")
     print(f"  {'Month':<12} {'Spend':>12} {'POs':>5}")
@@ -291,14 +1039,17 @@ def spend_analysis(po, budgets):
         print(f"  {str(r['month']):<12} ${r['total_spend']:>10,.2f} {r['po_count']:>5}  {bar}")
 
     # --- By Category ---
-    by_cat = (
-        po.groupby("category")
-        .agg(total_spend=("total_amount", "sum"),
-             po_count=("po_id", "count"),
-             avg_unit_price=("unit_price", "mean"))
-        .sort_values("total_spend", ascending=False)
-        .reset_index()
-    )
+    if aggregates is not None:
+        by_cat = aggregates.by_category().sort_values("total_spend", ascending=False).reset_index(drop=True)
+    else:
+        by_cat = (
+            po.groupby("category", observed=True)
+            .agg(total_spend=("total_amount", "sum"),
+                 po_count=("po_id", "count"),
+                 avg_unit_price=("unit_price", "mean"))
+            .sort_values("total_spend", ascending=False)
+            .reset_index()
+        )
     by_cat["spend_share"] = (by_cat["total_spend"] / by_cat["total_spend"].sum() * 100).round(1)
 
     print(f"\n  SPEND BY CATEGORY")
@@ -321,10 +1072,10 @@ def vendor_consolidation(po, vendors):
 
     # Find items supplied by multiple vendors
     item_vendors = (
-        po.groupby("item_description")
+        po.groupby("item_description", observed=True)
         .agg(vendor_count=("vendor_id", "nunique"),
              vendors=("vendor_name", lambda x: list(x.unique())),
-             vendor_ids=("vendor_id", lambda x: list(x.unique())),
+             vendor_ids=("vendor_id", "unique"),
              total_qty=("quantity", "sum"),
              total_spend=("total_amount", "sum"),
              min_price=("unit_price", "min"),
@@ -332,6 +1083,7 @@ def vendor_consolidation(po, vendors):
              avg_price=("unit_price", "mean"))
         .reset_index()
     )
+    item_vendors["vendor_ids"] = item_vendors["vendor_ids"].map(list)
 
     multi_vendor_items = item_vendors[item_vendors["vendor_count"] > 1].sort_values("total_spend", ascending=False)
 
@@ -355,7 +1107,7 @@ def vendor_consolidation(po, vendors):
         # Show per-vendor breakdown
         item_pos = po[po["item_description"] == item["item_description"]]
         vendor_detail = (
-            item_pos.groupby(["vendor_id", "vendor_name"])
+            item_pos.groupby(["vendor_id", "vendor_name"], observed=True)
             .agg(qty=("quantity", "sum"), avg_price=("unit_price", "mean"), spend=("total_amount", "sum"))
             .reset_index()
         )
@@ -367,7 +1119,7 @@ def vendor_consolidation(po, vendors):
     print(f"\n  VOLUME DISCOUNT OPPORTUNITIES")
     print(f"  {'-'*70}")
 
-    vendor_spend = po.groupby("vendor_id")["total_amount"].sum().reset_index()
+    vendor_spend = po.groupby("vendor_id", observed=True)["total_amount"].sum().reset_index()
     vendor_spend = vendor_spend.merge(vendors[["vendor_id", "vendor_name",
                                                 "volume_discount_tier_1_pct", "volume_discount_tier_1_threshold",
                                                 "volume_discount_tier_2_pct", "volume_discount_tier_2_threshold",
@@ -407,23 +1159,26 @@ def vendor_consolidation(po, vendors):
 # Phase 4: Department Efficiency Scoring & Red Flags
 # ============================================================
 
-def department_efficiency(po, budgets):
+def department_efficiency(po, budgets, aggregates=None):
     print(f"\n{'='*60}")
     print("PHASE 4: DEPARTMENT EFFICIENCY SCORING & RED FLAGS")
     print(f"{'='*60}")
 
     # Build metrics per department
-    dept_metrics = (
-        po.groupby("department")
-        .agg(total_spend=("total_amount", "sum"),
-             po_count=("po_id", "count"),
-             avg_po_size=("total_amount", "mean"),
-             unique_vendors=("vendor_id", "nunique"),
-             unique_categories=("category", "nunique"),
-             contracted=("contract_id", lambda x: x.notna().sum()),
-             spot=("contract_id", lambda x: x.isna().sum()))
-        .reset_index()
-    )
+    if aggregates is not None:
+        dept_metrics = aggregates.by_department()
+    else:
+        dept_metrics = (
+            po.groupby("department", observed=True)
+            .agg(total_spend=("total_amount", "sum"),
+                 po_count=("po_id", "count"),
+                 avg_po_size=("total_amount", "mean"),
+                 unique_vendors=("vendor_id", "nunique"),
+                 unique_categories=("category", "nunique"),
+                 contracted=("contract_id", lambda x: x.notna().sum()),
+                 spot=("contract_id", lambda x: x.isna().sum()))
+            .reset_index()
+        )
     dept_metrics["contract_rate"] = (dept_metrics["contracted"] / dept_metrics["po_count"] * 100).round(1)
 
     # Merge with budgets
@@ -541,82 +1296,128 @@ def department_efficiency(po, budgets):
 # Phase 5: Automated Purchase Order Anomaly Detection
 # ============================================================
 
-def anomaly_detection(po, budgets):
+def price_anomalies(po, item_stats=None, z_threshold=1.5):
+    """
+    POs whose unit price is more than `z_threshold` standard deviations from
+    the mean of their item (items with more than one PO and a non-zero std),
+    in item order. `item_stats` (item_description, mean, std) defaults to
+    the stats of `po` itself.
+    """
+    if item_stats is None:
+        prices = po.groupby("item_description", observed=True)["unit_price"]
+        mean = prices.transform("mean")
+        std = prices.transform("std").where(prices.transform("size") > 1)
+    else:
+        stats = item_stats.set_index("item_description")
+        items = po["item_description"].astype("str")
+        mean = stats["mean"].reindex(items).set_axis(po.index)
+        std = stats["std"].reindex(items).set_axis(po.index)
+
+    z_score = (po["unit_price"] - mean).abs() / std
+    mask = (std > 0) & (z_score > z_threshold)
+    anomalies = po.loc[mask, ["po_id", "item_description", "unit_price"]].assign(
+        mean=mean[mask], z_score=z_score[mask],
+        direction=np.where(po.loc[mask, "unit_price"] > mean[mask], "ABOVE", "BELOW"),
+    )
+    return anomalies.sort_values("item_description", kind="stable")
+
+
+def high_value_pos(po, threshold=10000):
+    return po[po["total_amount"] > threshold].sort_values("total_amount", ascending=False)
+
+
+def approval_breaches(po, budgets):
+    po_with_limits = po.merge(budgets[["department", "approval_limit"]], on="department", how="left")
+    breaches = po_with_limits[po_with_limits["total_amount"] > po_with_limits["approval_limit"]]
+    return breaches.assign(overage=breaches["total_amount"] - breaches["approval_limit"])
+
+
+def duplicate_orders(po):
+    """Groups of POs for the same vendor and item on the same day, one row per group in key order."""
+    day = po["date"].dt.normalize()
+    keys = [po["vendor_id"], po["item_description"], day.rename("day")]
+    repeated = po.groupby(keys, observed=True)["po_id"].transform("size") > 1
+    dupes = po[repeated]
+    return (
+        dupes.groupby([dupes["vendor_id"], dupes["item_description"], day[repeated].rename("day")], observed=True)
+        ["po_id"].agg(", ".join)
+        .reset_index(name="po_ids")
+    )
+
+
+def anomaly_detection(po, budgets, aggregates=None):
     print(f"\n{'='*60}")
     print("PHASE 5: AUTOMATED PO ANOMALY DETECTION")
     print(f"{'='*60}")
 
     anomalies = []
 
-    # 1. Price anomalies - unit price >2 std devs from mean for the same item
+    # 1. Price anomalies - unit price >1.5 std devs from mean for the same item
     print(f"\n  1. PRICE ANOMALIES (unit price outliers per item)")
     print(f"  {'-'*60}")
-    items_with_multiple = po.groupby("item_description").filter(lambda x: len(x) > 1)
-    item_stats = items_with_multiple.groupby("item_description")["unit_price"].agg(["mean", "std"]).reset_index()
-    item_stats = item_stats[item_stats["std"] > 0]
-
-    price_anomaly_count = 0
-    for _, stats in item_stats.iterrows():
-        item = stats["item_description"]
-        mean_price = stats["mean"]
-        std_price = stats["std"]
-        item_pos = po[po["item_description"] == item]
-        for _, p in item_pos.iterrows():
-            z_score = abs(p["unit_price"] - mean_price) / std_price if std_price > 0 else 0
-            if z_score > 1.5:
-                price_anomaly_count += 1
-                direction = "ABOVE" if p["unit_price"] > mean_price else "BELOW"
-                anomalies.append({
-                    "type": "Price Anomaly",
-                    "po_id": p["po_id"],
-                    "detail": f"{item}: ${p['unit_price']:.2f} is {direction} avg ${mean_price:.2f} (z={z_score:.1f})"
-                })
-                print(f"    {p['po_id']}: {item} at ${p['unit_price']:.2f} vs avg ${mean_price:.2f} ({direction}, z={z_score:.1f})")
-
-    if price_anomaly_count == 0:
+    prices = price_anomalies(po, aggregates.item_price_stats() if aggregates is not None else None)
+    rows = list(zip(prices["po_id"], prices["item_description"], prices["unit_price"],
+                    prices["mean"], prices["z_score"], prices["direction"]))
+    anomalies.append(pd.DataFrame({
+        "type": "Price Anomaly",
+        "po_id": prices["po_id"].to_numpy(),
+        "detail": [f"{item}: ${price:.2f} is {direction} avg ${mean:.2f} (z={z:.1f})"
+                   for _, item, price, mean, z, direction in rows],
+    }))
+    if rows:
+        print("\n".join(f"    {po_id}: {item} at ${price:.2f} vs avg ${mean:.2f} ({direction}, z={z:.1f})"
+                        for po_id, item, price, mean, z, direction in rows))
+    else:
         print(f"    No significant price anomalies detected.")
 
     # 2. High-value PO anomalies (>$10K single PO)
     print(f"\n  2. HIGH-VALUE POs (>$10,000)")
     print(f"  {'-'*60}")
-    high_value = po[po["total_amount"] > 10000].sort_values("total_amount", ascending=False)
-    for _, p in high_value.iterrows():
-        contract_status = "CONTRACTED" if pd.notna(p["contract_id"]) else "SPOT PURCHASE"
-        anomalies.append({
-            "type": "High Value",
-            "po_id": p["po_id"],
-            "detail": f"${p['total_amount']:,.2f} - {p['item_description']} ({contract_status})"
-        })
-        print(f"    {p['po_id']}: ${p['total_amount']:>10,.2f} | {p['department']:<15} | {p['item_description']:<30} | {contract_status}")
+    high_value = high_value_pos(po)
+    contract_status = np.where(high_value["contract_id"].notna(), "CONTRACTED", "SPOT PURCHASE")
+    rows = list(zip(high_value["po_id"], high_value["total_amount"], high_value["department"],
+                    high_value["item_description"], contract_status))
+    anomalies.append(pd.DataFrame({
+        "type": "High Value",
+        "po_id": high_value["po_id"].to_numpy(),
+        "detail": [f"${amount:,.2f} - {item} ({status})" for _, amount, _, item, status in rows],
+    }))
+    if rows:
+        print("\n".join(f"    {po_id}: ${amount:>10,.2f} | {dept:<15} | {item:<30} | {status}"
+                        for po_id, amount, dept, item, status in rows))
 
     # 3. Approval limit breaches
     print(f"\n  3. APPROVAL LIMIT BREACHES")
     print(f"  {'-'*60}")
-    po_with_limits = po.merge(budgets[["department", "approval_limit"]], on="department", how="left")
-    breaches = po_with_limits[po_with_limits["total_amount"] > po_with_limits["approval_limit"]]
-    if len(breaches) > 0:
-        for _, b in breaches.iterrows():
-            overage = b["total_amount"] - b["approval_limit"]
-            anomalies.append({
-                "type": "Approval Breach",
-                "po_id": b["po_id"],
-                "detail": f"${b['total_amount']:,.2f} exceeds ${b['approval_limit']:,.0f} limit by ${overage:,.2f}"
-            })
-            print(f"    {b['po_id']}: ${b['total_amount']:>10,.2f} exceeds {b['department']} limit ${b['approval_limit']:>8,.0f} (over by ${overage:,.2f})")
+    breaches = approval_breaches(po, budgets)
+    rows = list(zip(breaches["po_id"], breaches["total_amount"], breaches["department"],
+                    breaches["approval_limit"], breaches["overage"]))
+    anomalies.append(pd.DataFrame({
+        "type": "Approval Breach",
+        "po_id": breaches["po_id"].to_numpy(),
+        "detail": [f"${amount:,.2f} exceeds ${limit:,.0f} limit by ${overage:,.2f}"
+                   for _, amount, _, limit, overage in rows],
+    }))
+    if rows:
+        print("\n".join(f"    {po_id}: ${amount:>10,.2f} exceeds {dept} limit ${limit:>8,.0f} (over by ${overage:,.2f})"
+                        for po_id, amount, dept, limit, overage in rows))
     else:
         print(f"    No approval limit breaches found.")
 
     # 4. Spot purchase concentration
     print(f"\n  4. SPOT PURCHASE PATTERNS (no contract)")
     print(f"  {'-'*60}")
-    spot = po[po["contract_id"].isna()]
-    spot_by_dept = spot.groupby("department").agg(
-        spot_count=("po_id", "count"),
-        spot_spend=("total_amount", "sum")
-    ).reset_index()
-
-    total_by_dept = po.groupby("department")["po_id"].count().reset_index(name="total_pos")
-    spot_by_dept = spot_by_dept.merge(total_by_dept, on="department")
+    if aggregates is not None:
+        spot_by_dept = aggregates.spot_by_department()
+    else:
+        spot = po[po["contract_id"].isna()]
+        spot_by_dept = spot.groupby("department", observed=True).agg(
+            spot_count=("po_id", "count"),
+            spot_spend=("total_amount", "sum")
+        ).reset_index()
+
+        total_by_dept = po.groupby("department", observed=True)["po_id"].count().reset_index(name="total_pos")
+        spot_by_dept = spot_by_dept.merge(total_by_dept, on="department")
     spot_by_dept["spot_rate"] = (spot_by_dept["spot_count"] / spot_by_dept["total_pos"] * 100).round(1)
 
     for _, s in spot_by_dept.sort_values("spot_rate", ascending=False).iterrows():
@@ -626,21 +1427,19 @@ def anomaly_detection(po, budgets):
     # 5. Duplicate / near-duplicate detection
     print(f"\n  5. POTENTIAL DUPLICATE ORDERS")
     print(f"  {'-'*60}")
-    po["date_only"] = po["date"].dt.date
-    dupes = po.groupby(["vendor_id", "item_description", "date_only"]).filter(lambda x: len(x) > 1)
-    if len(dupes) > 0:
-        for (vid, item, date), group in dupes.groupby(["vendor_id", "item_description", "date_only"]):
-            po_ids = ", ".join(group["po_id"])
-            anomalies.append({
-                "type": "Potential Duplicate",
-                "po_id": po_ids,
-                "detail": f"{item} from {vid} on {date}"
-            })
-            print(f"    {po_ids}: {item} from {vid} on {date}")
+    dupes = duplicate_orders(po)
+    rows = list(zip(dupes["po_ids"], dupes["item_description"], dupes["vendor_id"], dupes["day"].dt.date))
+    anomalies.append(pd.DataFrame({
+        "type": "Potential Duplicate",
+        "po_id": dupes["po_ids"].to_numpy(),
+        "detail": [f"{item} from {vid} on {date}" for _, item, vid, date in rows],
+    }))
+    if rows:
+        print("\n".join(f"    {po_ids}: {item} from {vid} on {date}" for po_ids, item, vid, date in rows))
     else:
         print(f"    No duplicate orders detected.")
 
-    po.drop(columns=["date_only"], inplace=True)
+    anomalies = pd.concat(anomalies, ignore_index=True)
 
     print(f"\n  ANOMALY SUMMARY: {len(anomalies)} anomalies detected")
 
@@ -741,20 +1540,59 @@ def executive_summary(po, budgets, vendors, by_vendor, dept_metrics, red_flags,
 
 # ---- Main ----
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procurement Optimization System")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Cleanse purchase_orders.csv chunk by chunk into a Parquet file (bounded memory)")
+    parser.add_argument("--chunk-rows", type=int, default=PO_CHUNK_ROWS,
+                        help=f"Rows per chunk with --chunked (default: {PO_CHUNK_ROWS:,})")
+    parser.add_argument("--engine", choices=["c", "pyarrow"], default="c",
+                        help="CSV parser for the typed loaders (pyarrow is multi-threaded)")
+    parser.add_argument("--cleanse-only", action="store_true",
+                        help="With --chunked, stop once the cleaned Parquet file is written")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Always cleanse from the CSVs and don't read or write the cleaned snapshot")
+    parser.add_argument("--refresh-snapshot", action="store_true",
+                        help="Re-cleanse even if the cleaned snapshot is still valid, then rewrite it")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Phases 2, 4 and 5 use persisted aggregates, updated with only the POs added since the last run")
+    parser.add_argument("--rebuild-aggregates", action="store_true",
+                        help="With --incremental, rebuild the aggregate state from the full PO history")
+    parser.add_argument("--verify-aggregates", action="store_true",
+                        help="With --incremental, re-hash the whole aggregated PO history, not just "
+                             f"its last {AGGREGATE_BLOCK_ROWS:,} rows, before applying new POs")
+    args = parser.parse_args()
+
+    if args.rebuild_aggregates and not args.incremental:
+        parser.error("--rebuild-aggregates requires --incremental")
+    if args.verify_aggregates and not args.incremental:
+        parser.error("--verify-aggregates requires --incremental")
+    if args.cleanse_only:
+        if not args.chunked:
+            parser.error("--cleanse-only requires --chunked")
+        cleanse_purchase_orders_chunked(DATA_DIR / "purchase_orders.csv", CLEANED_PO_PATH, args.chunk_rows)
+        raise SystemExit(0)
+
     # Phase 1
-    purchase_orders, department_budgets, vendor_info = run_cleansing_pipeline()
+    purchase_orders, department_budgets, vendor_info = run_cleansing_pipeline(
+        args.chunked, args.chunk_rows, args.engine,
+        use_snapshot=not args.no_snapshot, refresh_snapshot=args.refresh_snapshot)
+
+    aggregates = None
+    if args.incremental:
+        aggregates = update_aggregates(purchase_orders, rebuild=args.rebuild_aggregates,
+                                       verify=args.verify_aggregates)
 
     # Phase 2
-    by_vendor, by_dept, by_month, by_cat = spend_analysis(purchase_orders, department_budgets)
+    by_vendor, by_dept, by_month, by_cat = spend_analysis(purchase_orders, department_budgets, aggregates)
 
     # Phase 3
     multi_vendor_items, consolidation_savings, volume_savings = vendor_consolidation(purchase_orders, vendor_info)
 
     # Phase 4
-    dept_metrics, red_flags = department_efficiency(purchase_orders, department_budgets)
+    dept_metrics, red_flags = department_efficiency(purchase_orders, department_budgets, aggregates)
 
     # Phase 5
-    anomalies = anomaly_detection(purchase_orders, department_budgets)
+    anomalies = anomaly_detection(purchase_orders, department_budgets, aggregates)
 
     # Phase 6
     executive_summary(purchase_orders, department_budgets, vendor_info,
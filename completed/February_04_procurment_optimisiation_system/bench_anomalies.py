@@ -0,0 +1,124 @@
+"""
+Anomaly Detection Benchmark
+===========================
+Times the phase 5 anomaly checks on a synthetic ledger (default 1M POs,
+50k distinct items): the vectorised checks in Main against the previous
+row-by-row implementation. The old price check filters the whole ledger
+once per item, so it is timed on a sample of items and extrapolated; the
+other old checks run in full. Price anomalies found by both on the sampled
+items are compared.
+
+Usage:
+    python bench_anomalies.py
+    python bench_anomalies.py --rows 200000 --items 10000 --sample-items 500
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import Main
+from bench_loaders import DEPARTMENTS, build_ledger
+
+
+# ---- Previous implementation (row-by-row), kept for comparison ----
+def legacy_price_anomalies(po, items=None):
+    items_with_multiple = po.groupby("item_description", observed=True).filter(lambda x: len(x) > 1)
+    item_stats = items_with_multiple.groupby("item_description", observed=True)["unit_price"].agg(["mean", "std"]).reset_index()
+    item_stats = item_stats[item_stats["std"] > 0]
+    if items is not None:
+        item_stats = item_stats[item_stats["item_description"].isin(items)]
+
+    anomalies = []
+    for _, stats in item_stats.iterrows():
+        item = stats["item_description"]
+        item_pos = po[po["item_description"] == item]
+        for _, p in item_pos.iterrows():
+            z_score = abs(p["unit_price"] - stats["mean"]) / stats["std"]
+            if z_score > 1.5:
+                anomalies.append(p["po_id"])
+    return anomalies
+
+
+def legacy_high_value(po):
+    return [p["po_id"] for _, p in po[po["total_amount"] > 10000].sort_values("total_amount", ascending=False).iterrows()]
+
+
+def legacy_approval_breaches(po, budgets):
+    po_with_limits = po.merge(budgets[["department", "approval_limit"]], on="department", how="left")
+    breaches = po_with_limits[po_with_limits["total_amount"] > po_with_limits["approval_limit"]]
+    return [b["po_id"] for _, b in breaches.iterrows()]
+
+
+def legacy_duplicates(po):
+    po = po.assign(date_only=po["date"].dt.date)
+    keys = ["vendor_id", "item_description", "date_only"]
+    dupes = po.groupby(keys, observed=True).filter(lambda x: len(x) > 1)
+    return [", ".join(group["po_id"]) for _, group in dupes.groupby(keys, observed=True)]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark phase 5 anomaly detection")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="POs in the synthetic ledger")
+    parser.add_argument("--items", type=int, default=50_000, help="Distinct items")
+    parser.add_argument("--sample-items", type=int, default=200,
+                        help="Items the old price check is timed on before extrapolating")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "purchase_orders.csv"
+        print(f"\n  Building {args.rows:,}-PO ledger with {args.items:,} items...", flush=True)
+        build_ledger(path, args.rows, items=args.items)
+        with contextlib.redirect_stdout(io.StringIO()):
+            po = Main.cleanse_purchase_orders(Main.read_csv_typed(path, Main.PO_SCHEMA))
+    budgets = pd.DataFrame({"department": DEPARTMENTS, "approval_limit": 250_000.0})
+
+    n_items = po["item_description"].nunique()
+    sample = po["item_description"].drop_duplicates().sort_values().head(args.sample_items)
+
+    # Vectorised checks
+    prices, t_price = timed(Main.price_anomalies, po)
+    high_value, t_high = timed(Main.high_value_pos, po)
+    breaches, t_breach = timed(Main.approval_breaches, po, budgets)
+    dupes, t_dupes = timed(Main.duplicate_orders, po)
+
+    # Row-by-row checks
+    legacy_prices, t_legacy_sample = timed(legacy_price_anomalies, po, set(sample))
+    t_legacy_price = t_legacy_sample * n_items / len(sample)
+    _, t_legacy_high = timed(legacy_high_value, po)
+    _, t_legacy_breach = timed(legacy_approval_breaches, po, budgets)
+    legacy_dupes, t_legacy_dupes = timed(legacy_duplicates, po)
+
+    sampled = prices[prices["item_description"].isin(sample)]
+    price_match = sorted(sampled["po_id"]) == sorted(legacy_prices)
+    dupes_match = list(dupes["po_ids"]) == legacy_dupes
+
+    print(f"\n  {len(po):,} POs, {n_items:,} items\n")
+    print(f"  {'Check':<20} {'Found':>9} {'Row-by-row s':>13} {'Vectorised s':>13} {'Speedup':>9}")
+    print(f"  {'-'*68}")
+    rows = [
+        ("Price (z > 1.5)", len(prices), t_legacy_price, t_price, "*"),
+        ("High value", len(high_value), t_legacy_high, t_high, ""),
+        ("Approval breach", len(breaches), t_legacy_breach, t_breach, ""),
+        ("Duplicates", len(dupes), t_legacy_dupes, t_dupes, ""),
+    ]
+    for name, found, legacy, vectorised, note in rows:
+        print(f"  {name:<20} {found:>9,} {legacy:>12.1f}{note or ' '} {vectorised:>13.2f} {legacy / vectorised:>8,.0f}x")
+    print(f"\n  * extrapolated from {len(sample):,} items ({t_legacy_sample:.1f}s)")
+    print(f"  Price anomalies on sampled items match : {price_match}")
+    print(f"  Duplicate groups match                 : {dupes_match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Loader Benchmark
+================
+Measures load time, cleanse time, peak memory and in-memory frame size for
+the purchase order loaders on a synthetic ledger: the untyped pd.read_csv
+loader against the schema-driven typed loader (C and pyarrow engines).
+Each loader runs in its own process so peak RSS figures are independent.
+
+Usage:
+    python bench_loaders.py                  # 10M-row synthetic ledger
+    python bench_loaders.py --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEPARTMENTS = ["Manufacturing", "IT", "Facilities", "Marketing", "HR", "Operations", "Finance", "Quality"]
+CATEGORIES = ["Raw Materials", "Hardware", "Office Supplies", "Services", "Software", "Maintenance"]
+APPROVERS = ["John Miller", "Sarah Chen", "Mike Johnson", "Amy Rodriguez", "Lisa Park"]
+PAYMENT_TERMS = ["Net 30", "Net 45", "Net 15", "Net 60"]
+LOADERS = ["untyped", "typed-c", "typed-pyarrow"]
+
+
+def build_ledger(path: Path, rows: int, items: int = 50_000, chunk_rows: int = 1_000_000, seed: int = 0):
+    """Write a synthetic purchase_orders.csv in chunks (same columns as the real ledger)."""
+    rng = np.random.default_rng(seed)
+    vendors = np.array([f"V{i:03d}" for i in range(1, 201)])
+    item_names = np.array([f"Item {i:05d}" for i in range(items)])
+    start = pd.Timestamp("2020-01-01")
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        item = rng.integers(0, items, n)
+        vendor = rng.integers(0, len(vendors), n)
+        quantity = rng.integers(1, 1000, n)
+        unit_price = np.round((item % 997 + 1) * 1.25 * rng.normal(1, 0.05, n), 2)
+        contract = np.char.add("C", rng.integers(0, 500, n).astype(str)).astype(object)
+        contract[rng.random(n) < 0.4] = None
+        chunk = pd.DataFrame({
+            "PO_ID": np.char.add("PO-", np.arange(offset, offset + n).astype(str)),
+            "Date": (start + pd.to_timedelta(rng.integers(0, 1500, n), unit="D")).strftime("%Y-%m-%d"),
+            "Department": np.array(DEPARTMENTS)[rng.integers(0, len(DEPARTMENTS), n)],
+            "Vendor_ID": vendors[vendor],
+            "Vendor_Name": np.char.add("Vendor ", vendors[vendor]),
+            "Category": np.array(CATEGORIES)[item % len(CATEGORIES)],
+            "Item_Description": item_names[item],
+            "Quantity": quantity,
+            "Unit_Price": unit_price,
+            "Total_Amount": np.round(quantity * unit_price, 2),
+            "Approver": np.array(APPROVERS)[rng.integers(0, len(APPROVERS), n)],
+            "Payment_Terms": np.array(PAYMENT_TERMS)[rng.integers(0, len(PAYMENT_TERMS), n)],
+            "Contract_ID": contract,
+        })
+        chunk.to_csv(path, mode="w" if offset == 0 else "a", header=offset == 0, index=False)
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process. /proc's VmHWM resets on exec; ru_maxrss can carry over the parent's."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_loader(loader: str, path: Path) -> dict:
+    """Load and cleanse `path` with one loader; called in a fresh process."""
+    import Main
+
+    start = time.perf_counter()
+    if loader == "untyped":
+        df = pd.read_csv(path)
+    else:
+        df = Main.read_csv_typed(path, Main.PO_SCHEMA, engine=loader.split("-")[1])
+    loaded = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = Main.cleanse_purchase_orders(df)
+    cleansed = time.perf_counter()
+    return {
+        "load_s": loaded - start,
+        "cleanse_s": cleansed - loaded,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark purchase order loaders")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows in the synthetic ledger")
+    parser.add_argument("--run", choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument("--csv", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_loader(args.run, args.csv)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "purchase_orders.csv"
+        print(f"\n  Building {args.rows:,}-row synthetic ledger...", flush=True)
+        build_ledger(path, args.rows)
+        print(f"  Ledger: {path.stat().st_size / 1e6:,.0f} MB\n")
+
+        print(f"  {'Loader':<15} {'Load s':>8} {'Cleanse s':>10} {'Frame MB':>10} {'Peak RSS MB':>12}")
+        print(f"  {'-'*58}")
+        for loader in LOADERS:
+            out = subprocess.run(
+                [sys.executable, __file__, "--run", loader, "--csv", str(path)],
+                capture_output=True, text=True, cwd=Path(__file__).parent,
+            )
+            if out.returncode != 0:
+                print(f"  {loader:<15} failed: {out.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"  {loader:<15} {r['load_s']:>8.1f} {r['cleanse_s']:>10.1f} "
+                  f"{r['frame_mb']:>10,.0f} {r['peak_rss_mb']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
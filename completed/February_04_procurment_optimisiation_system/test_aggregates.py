@@ -0,0 +1,116 @@
+"""
+Incremental Aggregate Tests
+===========================
+Checks the persisted PoAggregates watermark on a small synthetic ledger,
+with digest blocks shrunk to 256 rows: appended POs are applied
+incrementally, a removed PO or an edit within the last block forces a
+rebuild, and an edit further back is caught by a full verify, so the
+report frames always equal a from-scratch aggregation.
+
+Usage:
+    python -m unittest test_aggregates
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import Main
+from bench_loaders import build_ledger
+
+
+def fresh(po):
+    aggregates = Main.PoAggregates()
+    aggregates.extend(po)
+    return aggregates
+
+
+class PoAggregatesWatermarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "purchase_orders.csv"
+            build_ledger(path, 2000, items=50)
+            with contextlib.redirect_stdout(io.StringIO()):
+                cls.po = Main.cleanse_purchase_orders(Main.read_csv_typed(path, Main.PO_SCHEMA))
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        block_rows = mock.patch.object(Main, "AGGREGATE_BLOCK_ROWS", 256)
+        block_rows.start()
+        self.addCleanup(block_rows.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def update(self, po, verify=False):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            aggregates = Main.update_aggregates(po, self.directory, verify=verify)
+        return aggregates, "rebuilding" in out.getvalue()
+
+    def edited(self, position):
+        edited = self.po.copy()
+        row = edited.index[position]
+        edited.loc[row, "quantity"] *= 10
+        edited.loc[row, "total_amount"] = (edited.loc[row, "quantity"] * edited.loc[row, "unit_price"]).round(2)
+        return edited
+
+    def assert_same_reports(self, aggregates, po):
+        expected = fresh(po)
+        for report in ("by_vendor", "by_department", "by_month", "by_category", "item_price_stats"):
+            pd.testing.assert_frame_equal(getattr(aggregates, report)(), getattr(expected, report)(), obj=report)
+
+    def test_appended_rows_are_applied_incrementally(self):
+        self.update(self.po.iloc[:1500])
+        aggregates, rebuilt = self.update(self.po)
+        self.assertFalse(rebuilt)
+        self.assertEqual(aggregates.rows, len(self.po))
+        self.assert_same_reports(aggregates, self.po)
+
+    def test_digests_do_not_depend_on_how_the_history_was_split(self):
+        for rows in (100, 300, 700, 1500):
+            self.update(self.po.iloc[:rows])
+        aggregates, rebuilt = self.update(self.po)
+        self.assertFalse(rebuilt)
+        expected = fresh(self.po)
+        self.assertEqual((aggregates.chain, aggregates.tail), (expected.chain, expected.tail))
+        self.assertTrue(Main.PoAggregates.load(self.directory).verify(self.po))
+
+    def test_unchanged_ledger_applies_nothing(self):
+        self.update(self.po)
+        loaded = Main.PoAggregates.load(self.directory)
+        self.assertTrue(loaded.matches(self.po))
+        self.assertEqual(loaded.extend(self.po), 0)
+
+    def test_edited_recent_row_forces_rebuild(self):
+        self.update(self.po.iloc[:1500])
+        edited = self.edited(1400)
+        aggregates, rebuilt = self.update(edited)
+        self.assertTrue(rebuilt)
+        self.assert_same_reports(aggregates, edited)
+
+    def test_edited_old_row_needs_full_verify(self):
+        self.update(self.po.iloc[:1500])
+        edited = self.edited(700)
+        # Only the last block is re-checked on a normal run
+        self.assertTrue(Main.PoAggregates.load(self.directory).matches(edited))
+        aggregates, rebuilt = self.update(edited, verify=True)
+        self.assertTrue(rebuilt)
+        self.assert_same_reports(aggregates, edited)
+
+    def test_removed_row_forces_rebuild(self):
+        self.update(self.po.iloc[:1500])
+        shortened = self.po.drop(self.po.index[10])
+        aggregates, rebuilt = self.update(shortened)
+        self.assertTrue(rebuilt)
+        self.assert_same_reports(aggregates, shortened)
+
+
+if __name__ == "__main__":
+    unittest.main()
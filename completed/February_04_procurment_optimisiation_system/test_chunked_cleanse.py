@@ -0,0 +1,87 @@
+"""
+Chunked Cleansing Tests
+=======================
+Checks cleanse_purchase_orders_chunked against the in-memory
+cleanse_purchase_orders on the sample ledger with extra duplicate POs,
+at every chunk size from 1 row up to the whole file, and with po_id
+hashes forced to collide so the second (confirming) pass has to keep POs
+that the hash check dropped.
+
+Usage:
+    python -m unittest test_chunked_cleanse
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import Main
+
+SAMPLE_PO_PATH = Path(__file__).resolve().parents[2] / "challenge_data" / "February_04_2026" / "purchase_orders.csv"
+
+
+@unittest.skipUnless(SAMPLE_PO_PATH.exists(), "sample purchase_orders.csv not found")
+class ChunkedCleanseTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        raw = pd.read_csv(SAMPLE_PO_PATH)
+        # Repeats of earlier rows spread through the file, plus back-to-back repeats
+        repeats = raw.sample(len(raw) // 2, random_state=1)
+        raw = pd.concat([raw, repeats], ignore_index=True).sample(frac=1, random_state=2)
+        raw = pd.concat([raw, raw.iloc[[5, 5, 20]]], ignore_index=True)
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.directory = Path(cls._tmp.name)
+        cls.csv_path = cls.directory / "purchase_orders.csv"
+        raw.to_csv(cls.csv_path, index=False)
+        cls.rows = len(raw)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.expected = Main.cleanse_purchase_orders(Main.read_csv_typed(cls.csv_path, Main.PO_SCHEMA))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def chunked(self, chunk_rows):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            path = Main.cleanse_purchase_orders_chunked(
+                self.csv_path, self.directory / "purchase_orders_clean.parquet", chunk_rows,
+            )
+        return pd.read_parquet(path), out.getvalue()
+
+    def assert_same_rows(self, got, sort=False):
+        # The in-memory path reads with PO_SCHEMA (categorical strings); Parquet holds plain strings
+        want = self.expected[list(got.columns)].astype(
+            {col: got[col].dtype for col, dtype in self.expected.dtypes.items() if dtype == "category"}
+        )
+        if sort:
+            got, want = got.sort_values("po_id"), want.sort_values("po_id")
+        pd.testing.assert_frame_equal(
+            got.reset_index(drop=True), want.reset_index(drop=True), check_dtype=False,
+        )
+
+    def test_every_chunk_size_matches_in_memory(self):
+        self.assertLess(len(self.expected), self.rows)
+        for chunk_rows in range(1, self.rows + 2):
+            with self.subTest(chunk_rows=chunk_rows):
+                got, out = self.chunked(chunk_rows)
+                self.assertNotIn("collided", out)
+                self.assert_same_rows(got)
+
+    def test_hash_collisions_are_kept(self):
+        real = Main.po_id_hashes
+        with mock.patch.object(Main, "po_id_hashes", lambda ids: real(ids) % np.uint64(7)):
+            for chunk_rows in (1, 3, 10, 45):
+                with self.subTest(chunk_rows=chunk_rows):
+                    got, out = self.chunked(chunk_rows)
+                    self.assertIn("collided", out)
+                    self.assert_same_rows(got, sort=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,28 +13,61 @@ Usage:
     python Main.py                    # Evaluate all resumes against all jobs
     python Main.py --job JD001        # Evaluate against a specific job only
     python Main.py --dry-run          # Parse and display data without API calls
+    python Main.py --workers 8        # Run up to 8 evaluations concurrently
+    python Main.py --no-cache         # Ignore and bypass the scoring response cache
+    python Main.py --batch            # Submit all API work via the Message Batches API
+    python Main.py --multi-job        # Score each resume against all jobs in one call
+    python Main.py --prescreen-top-k 20  # Only send the 20 best local matches per job to Claude
+    python Main.py --stream           # Stream-parse resumes straight into evaluation
+    python Main.py --parse-workers 8  # Parse resume files across 8 processes
+    python Main.py --resume           # Continue an interrupted run from its checkpoint journal
+    python Main.py --pipeline         # Start each job's profiles/rejections as soon as it is scored
+    python Main.py --pipeline --shortlist 3  # Publish each job's top 3 as soon as it is stable
+    python Main.py --rescore --threshold 3.8 [--rubric new_rubric.csv]  # Re-rank last run, no API calls
+    python Main.py --output-format zip --background-writer  # One archive per job, written off-thread
 """
 
 import argparse
 import json
 import os
 import sys
+import time
+from contextlib import closing
 from datetime import datetime
 
 from dotenv import load_dotenv
 load_dotenv()  # Load .env file (keeps API key out of source code)
 
-from config import OUTPUT_DIR, REJECTION_DIR, PROFILE_DIR, TOP_CANDIDATE_SCORE_THRESHOLD
-from resume_parser import load_all_resumes
+from config import (
+    OUTPUT_DIR,
+    METRICS_PATH,
+    REJECTION_DIR,
+    PROFILE_DIR,
+    SHORTLIST_DIR,
+    TOP_CANDIDATE_SCORE_THRESHOLD,
+    MAX_CONCURRENT_REQUESTS,
+    PRESCREEN_MIN_SIMILARITY,
+    PARSE_WORKERS,
+    REJECTION_GROUP_SIZE,
+    OUTPUT_FORMAT,
+)
+from resume_parser import load_all_resumes, iter_all_resumes
 from job_matcher import (
     load_job_descriptions,
     load_scoring_rubric,
     load_salary_benchmarks,
-    evaluate_candidate,
 )
+from evaluation_engine import run_evaluations, run_batch_evaluations, run_streaming_evaluations
+from pipeline import run_pipeline
+from rescore import load_report_evaluations, rescore_evaluations, classification_changes
+from prescreen import run_prescreen, build_prescreened_evaluations, compute_similarity_matrix
+from response_cache import scoring_cache
+from output_writer import OUTPUT_FORMATS, output_writer
+from metrics import call_metrics
+from checkpoint import run_journal
+from results_store import results_store
+from api_client import summarize_call_timings
 from scoring_engine import (
-    compute_weighted_score,
-    classify_candidate,
     rank_candidates_for_job,
     build_evaluation_report,
     build_pipeline_summary,
@@ -42,28 +75,32 @@ from scoring_engine import (
 from profile_generator import (
     load_interview_template,
     generate_interview_profile,
-    generate_rejection_email,
-    save_interview_profile,
-    save_rejection_email,
+    generate_interview_profiles_batch,
+    generate_rejection_emails,
+    generate_rejection_emails_batch,
 )
 
 
 def ensure_output_dirs():
     """Create output directory structure."""
-    for d in [OUTPUT_DIR, REJECTION_DIR, PROFILE_DIR]:
+    for d in [OUTPUT_DIR, REJECTION_DIR, PROFILE_DIR, SHORTLIST_DIR]:
         d.mkdir(parents=True, exist_ok=True)
 
 
-def phase_1_load(job_filter: str = None):
+def phase_1_load(job_filter: str = None, stream: bool = False, parse_workers: int = PARSE_WORKERS):
     """Phase 1: Load and parse all input data."""
     print("=" * 60)
     print("PHASE 1: LOADING DATA")
     print("=" * 60)
 
-    resumes = load_all_resumes()
-    print(f"  Loaded {len(resumes)} resumes")
-    for r in resumes:
-        print(f"    - {r['name']} ({r['total_years_experience']}yr exp, {len(r['skills'])} skills)")
+    if stream:
+        resumes = None
+        print("  Resumes will be streamed into evaluation as they are parsed")
+    else:
+        resumes = load_all_resumes(workers=parse_workers)
+        print(f"  Loaded {len(resumes)} resumes")
+        for r in resumes:
+            print(f"    - {r['name']} ({r['total_years_experience']}yr exp, {len(r['skills'])} skills)")
 
     jobs = load_job_descriptions()
     if job_filter:
@@ -87,44 +124,90 @@ def phase_1_load(job_filter: str = None):
     return resumes, jobs, rubric, template, benchmarks
 
 
-def phase_2_evaluate(resumes, jobs, rubric):
-    """Phase 2: Score every resume against target jobs using Claude API."""
-    print("\n" + "=" * 60)
-    print("PHASE 2: EVALUATING CANDIDATES VIA CLAUDE API")
-    print("=" * 60)
+def report_progress(done, total, job, evaluation):
+    """Print one progress line per completed evaluation."""
+    status = "TOP" if evaluation["classification"] == "top_candidate" else "---"
+    print(
+        f"  [{done}/{total or '?'}] {job['job_id']} {evaluation['name']:<25s} "
+        f"Score: {evaluation['weighted_score']:.2f} [{status}]",
+        flush=True,
+    )
+
+
+def prescreen_pairs(resumes, jobs, rubric, prescreen_top_k=None):
+    """
+    Run the local pre-screen when requested.
+
+    Returns (precomputed, to_score): auto-classified evaluations for the
+    engine to skip, and the number of pairs left for Claude.
+    """
+    to_score = len(resumes) * len(jobs)
+    if prescreen_top_k is None:
+        return None, to_score
+
+    routed, screened_out = run_prescreen(resumes, jobs, prescreen_top_k)
+    precomputed = build_prescreened_evaluations(resumes, jobs, screened_out, rubric)
+    skipped = sum(len(v) for v in screened_out.values())
+    to_score -= skipped
+    print(f"  Local pre-screen (top {prescreen_top_k} per job): "
+          f"{to_score} pair(s) routed to Claude, {skipped} auto-classified")
+    for job in jobs:
+        print(f"    {job['job_id']}: {len(routed[job['job_id']])} routed, "
+              f"{len(screened_out[job['job_id']])} screened out")
+    return precomputed, to_score
 
-    all_evaluations = {}
-    total = len(resumes) * len(jobs)
-    count = 0
 
-    for job in jobs:
-        job_id = job["job_id"]
-        all_evaluations[job_id] = []
+def print_job_ranking(job, ranked):
+    """Print the final ranking for one job."""
+    top = [e for e in ranked if e["classification"] == "top_candidate"]
+    not_selected = [e for e in ranked if e["classification"] == "not_selected"]
 
-        print(f"\n  --- {job['title']} ({job_id}) ---")
+    print(f"\n  {job['title']} ({job['job_id']})")
+    print(f"  Top Candidates: {len(top)} | Not Selected: {len(not_selected)}")
+    print()
+    for e in ranked:
+        marker = " *** TOP ***" if e["classification"] == "top_candidate" else ""
+        print(f"    #{e['rank']:2d}  {e['name']:<25s}  {e['weighted_score']:.2f}{marker}")
 
-        for resume in resumes:
-            count += 1
-            print(f"  [{count}/{total}] Evaluating {resume['name']}...", end=" ", flush=True)
 
-            raw_scores = evaluate_candidate(resume, job, rubric)
-            weighted = compute_weighted_score(raw_scores, rubric)
-            classification = classify_candidate(weighted)
+def phase_2_evaluate(
+    resumes, jobs, rubric, max_workers=MAX_CONCURRENT_REQUESTS, batch=False, multi_job=False,
+    prescreen_top_k=None, parse_workers=PARSE_WORKERS,
+):
+    """
+    Phase 2: Score every resume against target jobs using Claude API.
 
-            evaluation = {
-                "name": resume["name"],
-                "email": resume["email"],
-                "raw_scores": raw_scores,
-                "weighted_score": round(weighted, 2),
-                "classification": classification,
-                "resume": resume,
-            }
-            all_evaluations[job_id].append(evaluation)
+    Returns (resumes, all_evaluations). When `resumes` is None, resumes are
+    streamed from the input files and evaluated as they are parsed.
+    """
+    print("\n" + "=" * 60)
+    print("PHASE 2: EVALUATING CANDIDATES VIA CLAUDE API")
+    print("=" * 60)
 
-            status = "TOP" if classification == "top_candidate" else "---"
-            print(f"Score: {weighted:.2f} [{status}]")
+    if resumes is None:
+        print(f"  Streaming resumes across {max_workers} worker(s)\n")
+        return run_streaming_evaluations(
+            iter_all_resumes(workers=parse_workers), jobs, rubric,
+            max_workers=max_workers, on_complete=report_progress, multi_job=multi_job,
+        )
 
-    return all_evaluations
+    precomputed, to_score = prescreen_pairs(resumes, jobs, rubric, prescreen_top_k)
+
+    if batch:
+        print(f"  {to_score} evaluations via Message Batches API\n")
+        return resumes, run_batch_evaluations(resumes, jobs, rubric, precomputed=precomputed)
+
+    if multi_job:
+        print(f"  {to_score} evaluations in multi-job calls across {max_workers} worker(s)\n")
+    else:
+        print(f"  {to_score} evaluations across {max_workers} worker(s)\n")
+
+    all_evaluations = run_evaluations(
+        resumes, jobs, rubric,
+        max_workers=max_workers, on_complete=report_progress, multi_job=multi_job,
+        precomputed=precomputed,
+    )
+    return resumes, all_evaluations
 
 
 def phase_3_rank(all_evaluations, jobs):
@@ -134,30 +217,74 @@ def phase_3_rank(all_evaluations, jobs):
     print("=" * 60)
 
     for job in jobs:
-        job_id = job["job_id"]
-        ranked = rank_candidates_for_job(all_evaluations[job_id])
-        all_evaluations[job_id] = ranked
+        ranked = rank_candidates_for_job(all_evaluations[job["job_id"]])
+        all_evaluations[job["job_id"]] = ranked
+        print_job_ranking(job, ranked)
 
-        top = [e for e in ranked if e["classification"] == "top_candidate"]
-        not_selected = [e for e in ranked if e["classification"] == "not_selected"]
+    return all_evaluations
+
+
+def save_shortlist(snapshot):
+    """Write a job's current top-K shortlist to SHORTLIST_DIR, replacing any earlier one."""
+    path = SHORTLIST_DIR / f"{snapshot['job_id']}_shortlist.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2)
+    label = "Final" if snapshot["final"] else "Provisional"
+    names = ", ".join(c["name"] for c in snapshot["candidates"])
+    print(f"  >> {label} top {snapshot['k']} for {snapshot['job_id']} "
+          f"({snapshot['scored']}/{snapshot['total']} scored): {names}", flush=True)
+    return path
+
+
+def phases_2_to_5_pipelined(
+    resumes, jobs, rubric, template, benchmarks, max_workers=MAX_CONCURRENT_REQUESTS,
+    prescreen_top_k=None, shortlist_k=0,
+):
+    """
+    Phases 2-5 as one pipeline: each job is ranked as soon as its last score
+    arrives, and its profiles and rejections run while other jobs are scored.
+    With `shortlist_k`, each job's top K is saved as soon as it is stable.
+    """
+    print("\n" + "=" * 60)
+    print("PHASES 2-5: PIPELINED SCORING, RANKING, PROFILES & REJECTIONS")
+    print("=" * 60)
+
+    precomputed, to_score = prescreen_pairs(resumes, jobs, rubric, prescreen_top_k)
+    print(f"  {to_score} evaluations across {max_workers} worker(s), "
+          f"follow-ups start as each job finishes\n")
+
+    counts = {"profiles": 0, "rejections": 0}
+
+    def on_profile(job, eval_entry, profile):
+        name = output_writer.write("profile", job["job_id"], eval_entry["name"], profile)
+        counts["profiles"] += 1
+        print(f"    -> Profile saved: {name}", flush=True)
+
+    def on_rejection(job, eval_entry, email):
+        name = output_writer.write("rejection", job["job_id"], eval_entry["name"], email)
+        counts["rejections"] += 1
+        print(f"    -> Rejection saved: {name}", flush=True)
 
-        print(f"\n  {job['title']} ({job_id})")
-        print(f"  Top Candidates: {len(top)} | Not Selected: {len(not_selected)}")
-        print()
-        for e in ranked:
-            marker = " *** TOP ***" if e["classification"] == "top_candidate" else ""
-            print(f"    #{e['rank']:2d}  {e['name']:<25s}  {e['weighted_score']:.2f}{marker}")
+    all_evaluations = run_pipeline(
+        resumes, jobs, rubric, template, benchmarks,
+        max_workers=max_workers, precomputed=precomputed,
+        on_scored=report_progress, on_ranked=print_job_ranking,
+        on_profile=on_profile, on_rejection=on_rejection,
+        shortlist_k=shortlist_k, on_shortlist=save_shortlist,
+    )
 
+    print(f"\n  Total interview profiles generated: {counts['profiles']}")
+    print(f"  Total rejection emails generated: {counts['rejections']}")
     return all_evaluations
 
 
-def phase_4_profiles(all_evaluations, jobs, template, benchmarks):
+def phase_4_profiles(all_evaluations, jobs, template, benchmarks, batch=False):
     """Phase 4: Generate interview profiles for top candidates."""
     print("\n" + "=" * 60)
     print("PHASE 4: GENERATING INTERVIEW PROFILES")
     print("=" * 60)
 
-    profile_count = 0
+    items = []
     for job in jobs:
         job_id = job["job_id"]
         top_candidates = [
@@ -168,25 +295,31 @@ def phase_4_profiles(all_evaluations, jobs, template, benchmarks):
             print(f"\n  {job['title']}: No top candidates to profile.")
             continue
 
-        for eval_entry in top_candidates:
+        items.extend((e["resume"], job, e) for e in top_candidates)
+
+    if batch:
+        print(f"  Submitting {len(items)} profile request(s) via Message Batches API...", flush=True)
+        profiles = generate_interview_profiles_batch(items, benchmarks, template)
+    else:
+        profiles = []
+        for resume, job, eval_entry in items:
             print(f"  Generating profile: {eval_entry['name']} for {job['title']}...", flush=True)
-            profile = generate_interview_profile(
-                eval_entry["resume"], job, eval_entry, benchmarks, template
-            )
-            path = save_interview_profile(profile, eval_entry["name"], job_id)
-            print(f"    -> Saved: {path.name}")
-            profile_count += 1
+            profiles.append(generate_interview_profile(resume, job, eval_entry, benchmarks, template))
 
-    print(f"\n  Total interview profiles generated: {profile_count}")
+    for (_, job, eval_entry), profile in zip(items, profiles):
+        name = output_writer.write("profile", job["job_id"], eval_entry["name"], profile)
+        print(f"    -> Saved: {name}")
 
+    print(f"\n  Total interview profiles generated: {len(profiles)}")
 
-def phase_5_rejections(all_evaluations, jobs):
+
+def phase_5_rejections(all_evaluations, jobs, batch=False):
     """Phase 5: Generate rejection email drafts for non-selected candidates."""
     print("\n" + "=" * 60)
     print("PHASE 5: GENERATING REJECTION EMAILS")
     print("=" * 60)
 
-    email_count = 0
+    items = []
     for job in jobs:
         job_id = job["job_id"]
         rejected = [
@@ -197,39 +330,132 @@ def phase_5_rejections(all_evaluations, jobs):
             print(f"\n  {job['title']}: All candidates are top candidates!")
             continue
 
-        for eval_entry in rejected:
-            print(f"  Generating rejection: {eval_entry['name']} for {job['title']}...", flush=True)
-            email = generate_rejection_email(eval_entry["resume"], job, eval_entry)
-            path = save_rejection_email(email, eval_entry["name"], job_id)
-            print(f"    -> Saved: {path.name}")
-            email_count += 1
+        items.extend((e["resume"], job, e) for e in rejected)
 
-    print(f"\n  Total rejection emails generated: {email_count}")
+    if batch:
+        print(f"  Submitting {len(items)} rejection request(s) via Message Batches API...", flush=True)
+        emails = generate_rejection_emails_batch(items)
+    else:
+        print(f"  Personalising {len(items)} rejection email(s) in groups of {REJECTION_GROUP_SIZE}...", flush=True)
+        emails = generate_rejection_emails(items)
 
+    for (_, job, eval_entry), email in zip(items, emails):
+        name = output_writer.write("rejection", job["job_id"], eval_entry["name"], email)
+        print(f"    -> Saved: {name}")
 
-def phase_6_report(all_evaluations, jobs):
-    """Phase 6: Save final evaluation report and pipeline summary."""
-    print("\n" + "=" * 60)
-    print("PHASE 6: GENERATING REPORTS")
-    print("=" * 60)
+    print(f"\n  Total rejection emails generated: {len(emails)}")
 
+
+def run_phases(args, resumes, jobs, rubric, template, benchmarks) -> dict:
+    """Phases 2-5, pipelined or one after another; returns the ranked evaluations."""
+    if args.pipeline:
+        with call_metrics.phase("pipeline"):
+            all_evaluations = phases_2_to_5_pipelined(
+                resumes, jobs, rubric, template, benchmarks,
+                max_workers=args.workers, prescreen_top_k=args.prescreen_top_k, shortlist_k=args.shortlist,
+            )
+    else:
+        with call_metrics.phase("scoring"):
+            resumes, all_evaluations = phase_2_evaluate(
+                resumes, jobs, rubric, max_workers=args.workers, batch=args.batch, multi_job=args.multi_job,
+                prescreen_top_k=args.prescreen_top_k, parse_workers=args.parse_workers,
+            )
+        # Ranking is local (no API calls), so it is not timed as a metrics phase
+        all_evaluations = phase_3_rank(all_evaluations, jobs)
+        with call_metrics.phase("profiles"):
+            phase_4_profiles(all_evaluations, jobs, template, benchmarks, batch=args.batch)
+        with call_metrics.phase("rejections"):
+            phase_5_rejections(all_evaluations, jobs, batch=args.batch)
+    return all_evaluations
+
+
+def save_reports(all_evaluations, jobs, threshold=TOP_CANDIDATE_SCORE_THRESHOLD):
+    """Write evaluation_report.json and pipeline_summary.txt; returns the summary text."""
     # Build and save JSON report (strip resume raw data for cleanliness)
-    report = build_evaluation_report(all_evaluations, jobs)
+    report = build_evaluation_report(all_evaluations, jobs, threshold)
     report_path = OUTPUT_DIR / "evaluation_report.json"
     with open(report_path, "w", encoding="utf-8") as f:
         json.dump(report, f, indent=2)
     print(f"  Saved evaluation report: {report_path.name}")
 
     # Build and save text summary
-    summary = build_pipeline_summary(all_evaluations, jobs)
+    summary = build_pipeline_summary(all_evaluations, jobs, threshold)
     summary_path = OUTPUT_DIR / "pipeline_summary.txt"
     with open(summary_path, "w", encoding="utf-8") as f:
         f.write(summary)
     print(f"  Saved pipeline summary: {summary_path.name}")
+    return summary
+
+
+def phase_6_report(all_evaluations, jobs):
+    """Phase 6: Save final evaluation report and pipeline summary."""
+    print("\n" + "=" * 60)
+    print("PHASE 6: GENERATING REPORTS")
+    print("=" * 60)
+
+    summary = save_reports(all_evaluations, jobs)
+    run_id = results_store.append_run(all_evaluations, jobs, TOP_CANDIDATE_SCORE_THRESHOLD)
+    print(f"  Appended results to {results_store.path.name} (run {run_id})")
 
     # Print summary to console
     print("\n" + summary)
 
+    cache = scoring_cache.stats()
+    if cache["enabled"]:
+        print(f"\n  Scoring cache: {cache['hits']} hits / {cache['misses']} misses "
+              f"({cache['hit_rate']}% hit rate), {cache['entries']} entries, "
+              f"{cache['evictions']} evicted")
+    else:
+        print("\n  Scoring cache: disabled")
+
+    journal = run_journal.stats()
+    print(f"  Checkpoint journal: {journal['recorded']} unit(s) recorded, "
+          f"{journal['skipped']} skipped as already completed")
+
+    timings = summarize_call_timings()
+    if timings["calls"]:
+        print(f"  HTTP calls: {timings['calls']} ({timings['new_connections']} new connections, "
+              f"{timings['reused_connections']} reused), avg connect {timings['avg_connect_ms']}ms, "
+              f"avg latency {timings['avg_latency_ms']}ms")
+
+    print("\n" + call_metrics.format_summary())
+    metrics_path = call_metrics.save(METRICS_PATH)
+    print(f"\n  Saved run metrics: {metrics_path.name}")
+
+
+def rescore(rubric_path=None, threshold=TOP_CANDIDATE_SCORE_THRESHOLD):
+    """Re-apply a rubric and threshold to the last run's stored raw scores, without API calls."""
+    print("\n" + "=" * 60)
+    print("RESCORING STORED EVALUATIONS (NO API CALLS)")
+    print("=" * 60)
+
+    report_path = OUTPUT_DIR / "evaluation_report.json"
+    if not report_path.exists():
+        print(f"  [ERROR] No previous run found at {report_path}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    stored = load_report_evaluations(report_path)
+    rubric = load_scoring_rubric(rubric_path) if rubric_path else load_scoring_rubric()
+    jobs = [j for j in load_job_descriptions() if j["job_id"] in stored]
+    rescored = rescore_evaluations(stored, rubric, threshold)
+    changes = classification_changes(rescored)
+    save_reports(rescored, jobs, threshold)
+    elapsed = time.perf_counter() - started
+
+    evaluated = sum(len(evals) for evals in rescored.values())
+    print(f"\n  Rescored {evaluated} evaluation(s) with threshold {threshold} in {elapsed * 1000:.0f}ms")
+    if not changes:
+        print("  No classification changes.")
+        return
+
+    print(f"  {len(changes)} classification change(s):")
+    for c in changes:
+        print(f"    {c['job_id']}  {c['name']:<25s}  {c['from']:>13s} -> {c['to']:<13s}  "
+              f"score {c['old_score']:.2f} -> {c['new_score']:.2f}  rank #{c['old_rank']} -> #{c['new_rank']}")
+    print("  Profiles and rejection emails are not regenerated; re-run the pipeline "
+          "(cached scores are reused) to refresh them.")
+
 
 def dry_run(resumes, jobs, rubric):
     """Display parsed data without making API calls."""
@@ -257,6 +483,17 @@ def dry_run(resumes, jobs, rubric):
     for r in rubric:
         print(f"    {r['criteria']} (weight: {r['weight']})")
 
+    matrix = compute_similarity_matrix(resumes, jobs)
+    print(f"\n  Local Skill Match ({len(matrix['vocabulary'])} distinct job skills):")
+    for col, j in enumerate(jobs):
+        similarity = matrix["similarity"][:, col]
+        plausible = int((similarity >= PRESCREEN_MIN_SIMILARITY).sum())
+        print(f"    {j['job_id']}: {plausible}/{len(resumes)} plausible candidates")
+        for idx in (-similarity).argsort(kind="stable")[:3]:
+            print(f"      {resumes[idx]['name']:<25s} similarity {similarity[idx]:.2f}  "
+                  f"required skills {matrix['required_overlap'][idx, col]}/"
+                  f"{len(j['requirements']['technical_skills'])}")
+
     print(f"\n  Total evaluations that would be performed: {len(resumes) * len(jobs)}")
 
 
@@ -264,8 +501,77 @@ def main():
     parser = argparse.ArgumentParser(description="Candidate Resume Evaluation System")
     parser.add_argument("--job", type=str, help="Evaluate against a specific job ID only (e.g., JD001)")
     parser.add_argument("--dry-run", action="store_true", help="Parse data and display without API calls")
+    parser.add_argument(
+        "--workers", type=int, default=MAX_CONCURRENT_REQUESTS,
+        help=f"Max concurrent evaluation calls (default: {MAX_CONCURRENT_REQUESTS})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the scoring response cache")
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="Submit scoring, profile and rejection calls as Message Batches jobs (cheaper, slower)",
+    )
+    parser.add_argument(
+        "--multi-job", action="store_true",
+        help="Score each resume against every job in a single API call",
+    )
+    parser.add_argument(
+        "--prescreen-top-k", type=int, metavar="K",
+        help="Locally pre-screen pairs and only send the top K plausible candidates per job to Claude",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Stream resumes from the input files into evaluation instead of loading them all first",
+    )
+    parser.add_argument(
+        "--pipeline", action="store_true",
+        help="Overlap phases 2-5: start each job's profiles and rejections as soon as it is scored",
+    )
+    parser.add_argument(
+        "--shortlist", type=int, default=0, metavar="K",
+        help="With --pipeline, publish each job's top K to output/shortlists as soon as it is stable",
+    )
+    parser.add_argument(
+        "--rescore", action="store_true",
+        help="Re-apply the rubric/threshold to the last run's stored scores without any API calls",
+    )
+    parser.add_argument(
+        "--rubric", type=str, metavar="CSV",
+        help="With --rescore, a scoring rubric CSV to use instead of scoring_rubric.csv",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=TOP_CANDIDATE_SCORE_THRESHOLD,
+        help=f"With --rescore, the top-candidate threshold (default: {TOP_CANDIDATE_SCORE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Resume an interrupted run, skipping work units already in the checkpoint journal",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=PARSE_WORKERS, metavar="N",
+        help=f"Processes used to parse resume files (default: {PARSE_WORKERS})",
+    )
+    parser.add_argument(
+        "--output-format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT,
+        help=f"Profiles/rejections as one file per candidate, or one JSONL/zip per job (default: {OUTPUT_FORMAT})",
+    )
+    parser.add_argument(
+        "--background-writer", action="store_true",
+        help="Write profiles and rejection emails from a background thread",
+    )
     args = parser.parse_args()
 
+    if args.multi_job and args.batch:
+        parser.error("--multi-job cannot be combined with --batch")
+    if args.stream and (args.batch or args.prescreen_top_k is not None):
+        parser.error("--stream cannot be combined with --batch or --prescreen-top-k")
+    if args.pipeline and (args.batch or args.multi_job or args.stream):
+        parser.error("--pipeline cannot be combined with --batch, --multi-job or --stream")
+    if args.shortlist and not args.pipeline:
+        parser.error("--shortlist requires --pipeline")
+
+    if args.no_cache:
+        scoring_cache.enabled = False
+
     print()
     print("*" * 60)
     print("   CANDIDATE RESUME EVALUATION SYSTEM")
@@ -274,7 +580,13 @@ def main():
 
     ensure_output_dirs()
 
-    resumes, jobs, rubric, template, benchmarks = phase_1_load(job_filter=args.job)
+    if args.rescore:
+        rescore(args.rubric, args.threshold)
+        return
+
+    resumes, jobs, rubric, template, benchmarks = phase_1_load(
+        job_filter=args.job, stream=args.stream and not args.dry_run, parse_workers=args.parse_workers,
+    )
 
     if args.dry_run:
         dry_run(resumes, jobs, rubric)
@@ -287,10 +599,14 @@ def main():
         print("  Or:           export ANTHROPIC_API_KEY=your-key-here (Linux/Mac)")
         sys.exit(1)
 
-    all_evaluations = phase_2_evaluate(resumes, jobs, rubric)
-    all_evaluations = phase_3_rank(all_evaluations, jobs)
-    phase_4_profiles(all_evaluations, jobs, template, benchmarks)
-    phase_5_rejections(all_evaluations, jobs)
+    run_journal.open(resume=args.resume)
+    output_writer.open(args.output_format, background=args.background_writer)
+    if args.resume:
+        print(f"\n  Resuming: {run_journal.restored} completed work unit(s) in {run_journal.path.name}")
+
+    # Flush outputs and close the journal even if a phase fails or is interrupted
+    with closing(run_journal), closing(output_writer):
+        all_evaluations = run_phases(args, resumes, jobs, rubric, template, benchmarks)
     phase_6_report(all_evaluations, jobs)
 
     print("\n" + "*" * 60)
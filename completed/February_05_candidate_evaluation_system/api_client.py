@@ -0,0 +1,99 @@
+"""
+API Client Module
+=================
+Process-wide Anthropic client factory. Every call site shares one client and
+one pooled, keep-alive HTTP transport, so TLS handshakes and connection setup
+are paid once per pooled connection rather than once per request.
+
+Each HTTP call is traced: connect time (zero when a pooled connection was
+reused) and time-to-response-headers are recorded for reporting.
+"""
+
+import threading
+import time
+
+import anthropic
+import httpx
+
+from config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS,
+)
+
+_client = None
+_client_lock = threading.Lock()
+_timings = []
+_timings_lock = threading.Lock()
+
+
+def _on_request(request: httpx.Request):
+    """Attach a trace callback that timestamps connection setup events."""
+    timing = {"start": time.perf_counter()}
+
+    def trace(event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.started":
+            timing["connect_start"] = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            timing["connect_end"] = time.perf_counter()
+
+    request.extensions["trace"] = trace
+    request.extensions["call_timing"] = timing
+
+
+def _on_response(response: httpx.Response):
+    """Record connect and latency timings for the completed request."""
+    timing = response.request.extensions.get("call_timing")
+    if timing is None:
+        return
+    reused = "connect_start" not in timing
+    connect_ms = 0.0 if reused else (timing.get("connect_end", timing["connect_start"]) - timing["connect_start"]) * 1000
+    with _timings_lock:
+        _timings.append(
+            {
+                "path": response.request.url.path,
+                "status": response.status_code,
+                "connection_reused": reused,
+                "connect_ms": round(connect_ms, 1),
+                "latency_ms": round((time.perf_counter() - timing["start"]) * 1000, 1),
+            }
+        )
+
+
+def get_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http_client = anthropic.DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                    ),
+                    event_hooks={"request": [_on_request], "response": [_on_response]},
+                )
+                _client = anthropic.Anthropic(http_client=http_client)
+    return _client
+
+
+def get_call_timings() -> list[dict]:
+    """Return a copy of the per-call timing records collected so far."""
+    with _timings_lock:
+        return list(_timings)
+
+
+def summarize_call_timings() -> dict:
+    """Aggregate per-call timings into connection reuse and latency figures."""
+    timings = get_call_timings()
+    if not timings:
+        return {"calls": 0}
+    new_conns = [t for t in timings if not t["connection_reused"]]
+    return {
+        "calls": len(timings),
+        "new_connections": len(new_conns),
+        "reused_connections": len(timings) - len(new_conns),
+        "avg_connect_ms": round(sum(t["connect_ms"] for t in new_conns) / len(new_conns), 1) if new_conns else 0.0,
+        "avg_latency_ms": round(sum(t["latency_ms"] for t in timings) / len(timings), 1),
+    }
@@ -0,0 +1,75 @@
+"""
+Batch Runner Module
+===================
+Submits many Claude requests as Message Batches jobs, polls until they end and
+returns each result message keyed by custom_id.
+
+The client honours ANTHROPIC_BASE_URL, so the whole batch path can be exercised
+against a local fake batch server instead of the real API; test_batch_runner.py
+drives it with an in-process fake client instead.
+"""
+
+import re
+import time
+
+from api_client import get_client
+from config import BATCH_POLL_SECONDS, BATCH_MAX_REQUESTS, BATCH_MAX_WAIT_SECONDS
+
+
+def make_custom_id(*parts) -> str:
+    """Build a batch custom_id (letters, digits, '_' and '-' only, max 64 chars)."""
+    raw = "-".join(str(p) for p in parts)
+    return re.sub(r"[^A-Za-z0-9_-]", "_", raw)[:64]
+
+
+def run_message_batch(
+    requests: dict,
+    client=None,
+    poll_seconds: float = BATCH_POLL_SECONDS,
+    max_wait_seconds: float = BATCH_MAX_WAIT_SECONDS,
+) -> dict:
+    """
+    Run {custom_id: messages.create params} through the Message Batches API.
+
+    Requests are split into batches of at most BATCH_MAX_REQUESTS. A batch
+    still processing after `max_wait_seconds` is cancelled and polled until
+    it ends. Returns {custom_id: response message}, with None for errored,
+    cancelled or expired requests so callers can fall back per item.
+    """
+    client = client or get_client()
+    items = list(requests.items())
+    results = {}
+
+    for offset in range(0, len(items), BATCH_MAX_REQUESTS):
+        chunk = items[offset : offset + BATCH_MAX_REQUESTS]
+        batch = client.messages.batches.create(
+            requests=[{"custom_id": cid, "params": params} for cid, params in chunk]
+        )
+        print(f"    Submitted batch {batch.id} ({len(chunk)} requests)", flush=True)
+
+        deadline = time.monotonic() + max_wait_seconds
+        cancelled = False
+        while batch.processing_status != "ended":
+            if not cancelled and time.monotonic() >= deadline:
+                print(f"    [WARNING] Batch {batch.id} still running after {max_wait_seconds:.0f}s; cancelling")
+                client.messages.batches.cancel(batch.id)
+                cancelled = True
+            time.sleep(poll_seconds)
+            batch = client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            print(
+                f"    [{batch.processing_status}] processing={counts.processing} "
+                f"succeeded={counts.succeeded} errored={counts.errored}",
+                flush=True,
+            )
+
+        for entry in client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message
+            else:
+                print(f"    [WARNING] Batch request {entry.custom_id} {entry.result.type}")
+                results[entry.custom_id] = None
+
+    for cid, _ in items:
+        results.setdefault(cid, None)
+    return results
@@ -0,0 +1,108 @@
+"""
+Checkpoint Journal Module
+=========================
+Append-only JSONL journal of completed work units: scoring evaluations,
+interview profiles and rejection emails. Each record is flushed and fsynced
+as soon as its API call succeeds, so a run killed part-way through can be
+restarted with --resume and skip every unit it has already paid for.
+
+Keys are content-addressed (a hash of everything the unit's output depends
+on), so a resumed run never reuses a record whose inputs have changed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import CHECKPOINT_PATH
+
+
+def work_unit_key(kind: str, *parts) -> str:
+    """Return a stable key for a unit of work of `kind` built from JSON-serialisable parts."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:24]}"
+
+
+class CheckpointJournal:
+    """Thread-safe append-only JSONL journal of completed work units."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.restored = 0
+        self.recorded = 0
+        self.skipped = 0
+        self._records = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self, resume: bool = False):
+        """
+        Start journalling. With `resume`, load completed units from an existing
+        journal and keep appending to it; otherwise start a fresh journal.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._records = {}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if resume and self.path.exists():
+                torn = self._load()
+                self._file = open(self.path, "a", encoding="utf-8")
+                if torn:
+                    self._file.write("\n")
+            else:
+                self._file = open(self.path, "w", encoding="utf-8")
+            self.restored = len(self._records)
+
+    def _load(self) -> bool:
+        """Load records; returns True if the file ends in a torn (unterminated) line."""
+        line = "\n"
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a killed process; everything before it is intact
+                    continue
+                self._records[record["key"]] = record["value"]
+        return not line.endswith("\n")
+
+    def get(self, key: str):
+        """Return the journalled value for `key`, or None if the unit has not completed."""
+        with self._lock:
+            value = self._records.get(key)
+            if value is not None:
+                self.skipped += 1
+            return value
+
+    def record(self, key: str, value):
+        """Durably append a completed unit. A no-op until open() has been called."""
+        line = json.dumps({"key": key, "value": value}) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._records[key] = value
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict:
+        """Return counts of restored, newly recorded and skipped (already done) units."""
+        return {
+            "restored": self.restored,
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+        }
+
+
+# Shared journal for the current pipeline run
+run_journal = CheckpointJournal(CHECKPOINT_PATH)
@@ -5,6 +5,7 @@ PROJECT_DIR = Path(__file__).parent
 OUTPUT_DIR = PROJECT_DIR / "output"
 REJECTION_DIR = OUTPUT_DIR / "rejection_emails"
 PROFILE_DIR = OUTPUT_DIR / "interview_profiles"
+SHORTLIST_DIR = OUTPUT_DIR / "shortlists"
 
 # --- Data files (all co-located in project directory) ---
 SAMPLE_RESUMES_PATH = PROJECT_DIR / "sample_resumes.txt"
@@ -13,15 +14,69 @@ JOB_DESCRIPTIONS_PATH = PROJECT_DIR / "job_descriptions.json"
 SCORING_RUBRIC_PATH = PROJECT_DIR / "scoring_rubric.csv"
 INTERVIEW_TEMPLATE_PATH = PROJECT_DIR / "interview_template.json"
 SALARY_BENCHMARKS_PATH = PROJECT_DIR / "salary_benchmarks.csv"
+RESUME_READ_CHUNK_CHARS = 1 << 20  # characters read per chunk when streaming resume dumps
+PARSE_WORKERS = 1             # resume parser processes (>1 unproven, see bench_resume_parser)
+PARSE_BLOCKS_PER_TASK = 500   # resume blocks shipped to a parser process per work unit
 
 # --- LLM Settings ---
 MODEL_NAME = "claude-sonnet-4-20250514"
 MAX_TOKENS = 4096
-API_DELAY_SECONDS = 0.5
 MAX_RETRIES = 2
+MULTI_JOB_MAX_TOKENS_PER_JOB = 1024  # output budget per job in --multi-job calls
+REJECTION_GROUP_SIZE = 10            # candidates personalised per rejection API call
+REJECTION_PARAGRAPH_MAX_TOKENS = 150  # output budget per candidate's personalization paragraph
+
+# --- Concurrency & rate limiting ---
+MAX_CONCURRENT_REQUESTS = 4     # worker threads for parallel evaluation
+API_REQUESTS_PER_SECOND = 2.0   # token bucket refill rate shared by all API calls
+API_BURST_SIZE = 4              # max calls allowed back-to-back after idle time
+STREAM_MAX_PENDING_PER_WORKER = 4  # in-flight work units per worker when streaming resumes
+
+# --- Shared HTTP connection pool (api_client) ---
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# --- Checkpoint journal (resumable runs) ---
+CHECKPOINT_PATH = OUTPUT_DIR / "checkpoint_journal.jsonl"
+
+# --- Profile / rejection output (--output-format, --background-writer) ---
+OUTPUT_FORMAT = "files"            # "files" (one per candidate), "jsonl" or "zip" (one per job)
+OUTPUT_WRITER_QUEUE_SIZE = 1000    # outputs buffered ahead of the background writer thread
+
+# --- Evaluation history (append-only, queryable across runs) ---
+RESULTS_STORE_PATH = OUTPUT_DIR / "evaluation_history.sqlite3"
+
+# --- Response cache (scoring calls) ---
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_PATH = OUTPUT_DIR / "response_cache.sqlite3"
+RESPONSE_CACHE_TTL_DAYS = 30
+RESPONSE_CACHE_MAX_ENTRIES = 50_000
+SCORING_PROMPT_VERSION = "2"    # bump when build_scoring_prompt changes meaningfully
+
+# --- Message Batches API (--batch mode) ---
+BATCH_POLL_SECONDS = 30
+BATCH_MAX_REQUESTS = 10_000     # per submitted batch (API limit is 100,000)
+BATCH_MAX_WAIT_SECONDS = 24 * 3600  # cancel a batch still running after this long; its items fall back
 
 # --- Scoring ---
 TOP_CANDIDATE_SCORE_THRESHOLD = 3.5  # out of 5.0 weighted score
+SHORTLIST_STABLE_AFTER = 10  # arrivals without a top-K change before a provisional shortlist is emitted
+
+# --- Local pre-screen (--prescreen-top-k) ---
+PRESCREEN_MIN_SIMILARITY = 0.25  # pairs below this never reach the LLM
+PRESCREEN_WEIGHTS = {"skills": 0.5, "nice_to_have": 0.1, "experience": 0.25, "education": 0.15}
+
+# --- Cost estimation (USD per million tokens) ---
+MODEL_INPUT_PRICE_PER_MTOK = 3.00
+MODEL_OUTPUT_PRICE_PER_MTOK = 15.00
+EST_SCORING_OUTPUT_TOKENS = 400
+CACHE_WRITE_PRICE_MULTIPLIER = 1.25  # prompt-cache writes, relative to the input price
+CACHE_READ_PRICE_MULTIPLIER = 0.10   # prompt-cache reads, relative to the input price
+BATCH_PRICE_MULTIPLIER = 0.50        # Message Batches discount on all tokens
+
+# --- Run metrics (per-call latency, tokens and cost) ---
+METRICS_PATH = OUTPUT_DIR / "run_metrics.json"
 
 # --- Criteria key mapping (rubric CSV names -> JSON keys) ---
 CRITERIA_KEY_MAP = {
@@ -0,0 +1,209 @@
+"""
+Evaluation Engine Module
+========================
+Runs every (resume, job) evaluation on a bounded thread pool. API calls are
+paced by the shared token bucket in rate_limiter, and results are returned in
+the same deterministic order as the sequential loop regardless of which calls
+finish first. run_streaming_evaluations consumes resumes from an iterator as
+they are parsed, and run_batch_evaluations is the Message Batches alternative.
+
+Every successfully scored pair is written to the checkpoint journal as it
+completes, and pairs already in the journal are restored without an API call.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+from config import MAX_CONCURRENT_REQUESTS, STREAM_MAX_PENDING_PER_WORKER
+from job_matcher import evaluate_candidate, evaluate_candidate_all_jobs, evaluate_candidates_batch
+from scoring_engine import build_evaluation
+from checkpoint import run_journal, work_unit_key
+
+
+def evaluation_key(resume: dict, job: dict, rubric: list[dict]) -> str:
+    """Checkpoint key for one (resume, job) scoring unit."""
+    return work_unit_key("evaluation", resume["raw_text"], job, rubric)
+
+
+def restore_evaluation(resume: dict, job: dict, rubric: list[dict]) -> dict | None:
+    """Return the journalled evaluation for a pair, or None if it has not completed."""
+    stored = run_journal.get(evaluation_key(resume, job, rubric))
+    return None if stored is None else {**stored, "resume": resume}
+
+
+def checkpoint_evaluation(resume: dict, job: dict, rubric: list[dict], evaluation: dict):
+    """Journal a completed evaluation. Default-score fallbacks are not journalled, so they are retried."""
+    if evaluation["raw_scores"].get("parse_error"):
+        return
+    stored = {k: v for k, v in evaluation.items() if k != "resume"}
+    run_journal.record(evaluation_key(resume, job, rubric), stored)
+
+
+def evaluate_pair(resume: dict, job: dict, rubric: list[dict]) -> dict:
+    """Score one resume against one job and build its evaluation record."""
+    evaluation = restore_evaluation(resume, job, rubric)
+    if evaluation is None:
+        evaluation = build_evaluation(resume, evaluate_candidate(resume, job, rubric), rubric)
+        checkpoint_evaluation(resume, job, rubric, evaluation)
+    return evaluation
+
+
+def evaluate_resume_all_jobs(resume: dict, jobs: list[dict], rubric: list[dict]) -> dict:
+    """Score one resume against every job in one call; returns {job_id: evaluation}."""
+    evaluations = {}
+    for job in jobs:
+        restored = restore_evaluation(resume, job, rubric)
+        if restored is not None:
+            evaluations[job["job_id"]] = restored
+
+    pending = [j for j in jobs if j["job_id"] not in evaluations]
+    if pending:
+        raw_by_job = evaluate_candidate_all_jobs(resume, pending, rubric)
+        for job in pending:
+            evaluation = build_evaluation(resume, raw_by_job[job["job_id"]], rubric)
+            checkpoint_evaluation(resume, job, rubric, evaluation)
+            evaluations[job["job_id"]] = evaluation
+
+    return {job["job_id"]: evaluations[job["job_id"]] for job in jobs}
+
+
+def run_evaluations(
+    resumes: list[dict],
+    jobs: list[dict],
+    rubric: list[dict],
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    on_complete=None,
+    multi_job: bool = False,
+    precomputed: dict = None,
+) -> dict:
+    """
+    Evaluate every resume against every job concurrently.
+
+    Returns {job_id: [evaluation, ...]} with jobs in input order and each list in
+    resume order. `on_complete(done, total, job, evaluation)` is called from the
+    main thread as each evaluation finishes, for progress reporting. With
+    `multi_job`, each work unit is one resume scored against all jobs at once.
+    `precomputed` is {job_id: {resume index: evaluation}} for pairs that are
+    already decided and must not be submitted.
+    """
+    all_evaluations = seed_evaluations(resumes, jobs, precomputed)
+    jobs_by_id = {job["job_id"]: job for job in jobs}
+    total = sum(ev is None for evals in all_evaluations.values() for ev in evals)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {}
+        if multi_job:
+            for idx, resume in enumerate(resumes):
+                pending = [j for j in jobs if all_evaluations[j["job_id"]][idx] is None]
+                if pending:
+                    futures[pool.submit(evaluate_resume_all_jobs, resume, pending, rubric)] = (None, idx)
+        else:
+            for job in jobs:
+                for idx, resume in enumerate(resumes):
+                    if all_evaluations[job["job_id"]][idx] is None:
+                        future = pool.submit(evaluate_pair, resume, job, rubric)
+                        futures[future] = (job, idx)
+
+        for future in as_completed(futures):
+            job, idx = futures[future]
+            result = future.result()
+            completed = result.items() if job is None else [(job["job_id"], result)]
+            for job_id, evaluation in completed:
+                all_evaluations[job_id][idx] = evaluation
+                done += 1
+                if on_complete:
+                    on_complete(done, total, jobs_by_id[job_id], evaluation)
+
+    return all_evaluations
+
+
+def run_streaming_evaluations(
+    resume_stream,
+    jobs: list[dict],
+    rubric: list[dict],
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    on_complete=None,
+    multi_job: bool = False,
+) -> tuple[list[dict], dict]:
+    """
+    Evaluate resumes as they are read from an iterator, overlapping ingestion and scoring.
+
+    At most STREAM_MAX_PENDING_PER_WORKER * max_workers work units are in flight,
+    so the stream is only read as fast as the API can score it. Returns
+    (resumes, all_evaluations) in the same deterministic order as
+    run_evaluations. `on_complete` receives total=None, as the total is not
+    known until the stream is exhausted.
+
+    This bounds how far parsing runs ahead of scoring, not total memory: every
+    parsed resume (raw_text included) and every evaluation is retained, as
+    phases 4-6 need them once ranking is known.
+    """
+    resumes = []
+    all_evaluations = {job["job_id"]: [] for job in jobs}
+    max_pending = max(1, max_workers) * STREAM_MAX_PENDING_PER_WORKER
+    futures = {}
+    done = 0
+
+    def collect(return_when):
+        nonlocal done
+        finished, _ = wait(futures, return_when=return_when)
+        for future in finished:
+            job, idx = futures.pop(future)
+            result = future.result()
+            completed = result.items() if job is None else [(job["job_id"], result)]
+            for job_id, evaluation in completed:
+                all_evaluations[job_id][idx] = evaluation
+                done += 1
+                if on_complete:
+                    on_complete(done, None, jobs_by_id[job_id], evaluation)
+
+    jobs_by_id = {job["job_id"]: job for job in jobs}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for idx, resume in enumerate(resume_stream):
+            resumes.append(resume)
+            for job in jobs:
+                all_evaluations[job["job_id"]].append(None)
+
+            if multi_job:
+                futures[pool.submit(evaluate_resume_all_jobs, resume, jobs, rubric)] = (None, idx)
+            else:
+                for job in jobs:
+                    futures[pool.submit(evaluate_pair, resume, job, rubric)] = (job, idx)
+
+            while len(futures) >= max_pending:
+                collect(FIRST_COMPLETED)
+
+        while futures:
+            collect(FIRST_COMPLETED)
+
+    return resumes, all_evaluations
+
+
+def run_batch_evaluations(
+    resumes: list[dict], jobs: list[dict], rubric: list[dict], precomputed: dict = None
+) -> dict:
+    """Evaluate every resume against every job via one Message Batches submission."""
+    all_evaluations = seed_evaluations(resumes, jobs, precomputed)
+    slots = []
+    for job in jobs:
+        for idx, resume in enumerate(resumes):
+            if all_evaluations[job["job_id"]][idx] is None:
+                all_evaluations[job["job_id"]][idx] = restore_evaluation(resume, job, rubric)
+            if all_evaluations[job["job_id"]][idx] is None:
+                slots.append((job, idx))
+    raw_results = evaluate_candidates_batch([(resumes[idx], job) for job, idx in slots], rubric)
+
+    for (job, idx), raw_scores in zip(slots, raw_results):
+        evaluation = build_evaluation(resumes[idx], raw_scores, rubric)
+        checkpoint_evaluation(resumes[idx], job, rubric, evaluation)
+        all_evaluations[job["job_id"]][idx] = evaluation
+    return all_evaluations
+
+
+def seed_evaluations(resumes: list[dict], jobs: list[dict], precomputed: dict = None) -> dict:
+    """Empty result slots per job, pre-filled with any already-decided evaluations."""
+    all_evaluations = {job["job_id"]: [None] * len(resumes) for job in jobs}
+    for job_id, by_index in (precomputed or {}).items():
+        for idx, evaluation in by_index.items():
+            all_evaluations[job_id][idx] = evaluation
+    return all_evaluations
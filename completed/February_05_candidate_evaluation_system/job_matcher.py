@@ -5,6 +5,8 @@ Uses Claude API to evaluate each resume against job descriptions using the scori
 """
 
 import csv
+import difflib
+import hashlib
 import json
 import re
 import time
@@ -17,9 +19,18 @@ from config import (
     SALARY_BENCHMARKS_PATH,
     MODEL_NAME,
     MAX_TOKENS,
-    API_DELAY_SECONDS,
     MAX_RETRIES,
+    SCORING_PROMPT_VERSION,
+    MULTI_JOB_MAX_TOKENS_PER_JOB,
+    CRITERIA_KEY_MAP,
 )
+from api_client import get_client
+from rate_limiter import api_rate_limiter
+from response_cache import make_cache_key, scoring_cache
+from batch_runner import make_custom_id, run_message_batch
+from metrics import call_metrics
+
+MULTI_JOB_USAGE_KEY = "multi-job"  # usage bucket for calls spanning several jobs
 
 
 def load_job_descriptions() -> list[dict]:
@@ -28,10 +39,10 @@ def load_job_descriptions() -> list[dict]:
         return json.load(f)
 
 
-def load_scoring_rubric() -> list[dict]:
+def load_scoring_rubric(path=SCORING_RUBRIC_PATH) -> list[dict]:
     """Load scoring rubric from CSV into structured list."""
     rubric = []
-    with open(SCORING_RUBRIC_PATH, "r", encoding="utf-8") as f:
+    with open(path, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
             rubric.append(
@@ -50,73 +61,240 @@ def load_scoring_rubric() -> list[dict]:
     return rubric
 
 
-def load_salary_benchmarks() -> dict:
-    """Load salary benchmarks into a lookup dict keyed by (Position, Level)."""
-    benchmarks = {}
+class SalaryBenchmarks(dict):
+    """
+    Salary benchmarks keyed by (Position, Level), with a prebuilt lookup index.
+
+    Positions are indexed per level as normalised word tuples plus a
+    word -> positions posting list. lookup() resolves a job title by, in
+    order: exact title match; the longest benchmark position found as a
+    whole-word span of the title (O(words^2) dict probes, independent of the
+    number of rows); the earliest position containing every title word
+    (posting-list intersection); then a difflib fuzzy match. Results are
+    cached per (title, level), so every candidate for a job reuses one lookup.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._positions = {}  # level -> {word tuple: (row order, position)}
+        self._postings = {}   # level -> {word: set of word tuples}
+        self._lookups = {}
+
+    def add(self, position: str, level: str, data: dict):
+        self[(position, level)] = data
+        words = _title_words(position)
+        positions = self._positions.setdefault(level, {})
+        positions.setdefault(words, (len(positions), position))
+        for word in words:
+            self._postings.setdefault(level, {}).setdefault(word, set()).add(words)
+        self._lookups.clear()
+
+    def lookup(self, title: str, level: str) -> tuple[str, str, dict] | None:
+        """Return (position, level, data) for the best benchmark match, or None."""
+        cache_key = (title, level)
+        if cache_key not in self._lookups:
+            position = self._match_position(_title_words(title), level)
+            self._lookups[cache_key] = (
+                None if position is None else (position, level, self[(position, level)])
+            )
+        return self._lookups[cache_key]
+
+    def _match_position(self, words: tuple, level: str) -> str | None:
+        positions = self._positions.get(level, {})
+        if not words or not positions:
+            return None
+        if words in positions:
+            return positions[words][1]
+
+        # Benchmark position inside the title, e.g. "Senior Software Engineer" -> "Software Engineer"
+        for length in range(len(words) - 1, 0, -1):
+            spans = [words[i : i + length] for i in range(len(words) - length + 1)]
+            found = [positions[span] for span in spans if span in positions]
+            if found:
+                return min(found)[1]
+
+        # Title inside a longer benchmark position, e.g. "Data Scientist" -> "Data Scientist II"
+        postings = self._postings[level]
+        candidates = set.intersection(*(postings.get(word, set()) for word in words))
+        if candidates:
+            return min(positions[c] for c in candidates)[1]
+
+        close = difflib.get_close_matches(" ".join(words), [" ".join(w) for w in positions], n=1, cutoff=0.8)
+        return positions[tuple(close[0].split())][1] if close else None
+
+
+def _title_words(title: str) -> tuple:
+    """Lowercase word tuple used to index and match job titles."""
+    return tuple(re.findall(r"[a-z0-9+#]+", title.lower()))
+
+
+def load_salary_benchmarks() -> SalaryBenchmarks:
+    """Load salary benchmarks into an indexed lookup dict keyed by (Position, Level)."""
+    benchmarks = SalaryBenchmarks()
     with open(SALARY_BENCHMARKS_PATH, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            key = (row["Position"].strip(), row["Level"].strip())
-            benchmarks[key] = {
-                "min": int(row["Min_Salary"]),
-                "max": int(row["Max_Salary"]),
-                "median": int(row["Median_Salary"]),
-                "trend": row["Market_Trend"].strip(),
-            }
+            benchmarks.add(
+                row["Position"].strip(),
+                row["Level"].strip(),
+                {
+                    "min": int(row["Min_Salary"]),
+                    "max": int(row["Max_Salary"]),
+                    "median": int(row["Median_Salary"]),
+                    "trend": row["Market_Trend"].strip(),
+                },
+            )
     return benchmarks
 
 
-def build_scoring_prompt(resume: dict, job: dict, rubric: list[dict]) -> str:
-    """Construct the Claude prompt for resume scoring."""
+def rubric_version(rubric: list[dict]) -> str:
+    """Short fingerprint of the rubric contents and scoring prompt version."""
+    payload = json.dumps([SCORING_PROMPT_VERSION, rubric], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# JSON structure Claude must return for one (resume, job) evaluation
+SCORE_OBJECT_FORMAT = """{
+  "technical_skills_match": {"score": <1-5>, "justification": "<brief reason>"},
+  "relevant_experience": {"score": <1-5>, "justification": "<brief reason>"},
+  "education_alignment": {"score": <1-5>, "justification": "<brief reason>"},
+  "communication_skills": {"score": <1-5>, "justification": "<brief reason>"},
+  "leadership_experience": {"score": <1-5>, "justification": "<brief reason>"},
+  "problem_solving": {"score": <1-5>, "justification": "<brief reason>"},
+  "skill_gaps": ["<missing skill 1>", "<missing skill 2>"],
+  "nice_to_have_matches": ["<matching nice-to-have 1>"],
+  "overall_impression": "<2-3 sentence summary of candidate fit>"
+}"""
+
+
+def build_rubric_text(rubric: list[dict]) -> str:
+    """Render the rubric criteria and score descriptors as prompt text."""
     rubric_text = ""
     for r in rubric:
         rubric_text += f"\n### {r['criteria']} (Weight: {r['weight']})\n"
         for score, desc in r["descriptors"].items():
             rubric_text += f"  - Score {score}: {desc}\n"
+    return rubric_text
+
+
+def build_scoring_system_prompt(job: dict, rubric: list[dict]) -> str:
+    """
+    Construct the static part of the scoring prompt for one job.
 
+    Everything that is identical for every resume scored against this job
+    (role, rubric, output format, job description) lives here so the provider
+    can cache it as a prefix. Rubric comes before the job so the longest
+    possible prefix is also shared across jobs.
+    """
     job_text = json.dumps(job, indent=2)
 
     return f"""You are an expert HR recruiter evaluating a candidate resume against a job description.
 Score the candidate on each criterion using the rubric below.
 
+## Scoring Rubric
+For each criterion, assign a score from 1 to 5 using these guidelines:
+{build_rubric_text(rubric)}
+
+## Instructions
+Evaluate the candidate carefully and return ONLY a valid JSON object with this exact structure:
+```json
+{SCORE_OBJECT_FORMAT}
+```
+
+Return ONLY the JSON. No other text.
+
 ## Job Description
-{job_text}
+{job_text}"""
 
-## Candidate Resume
-{resume['raw_text']}
+
+def build_scoring_prompt(resume: dict) -> str:
+    """Construct the per-resume part of the scoring prompt."""
+    return f"""## Candidate Resume
+{resume['raw_text']}"""
+
+
+def build_scoring_request(resume: dict, job: dict, rubric: list[dict]) -> dict:
+    """Return messages.create parameters with the static system block marked for prompt caching."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": MAX_TOKENS,
+        "system": [
+            {
+                "type": "text",
+                "text": build_scoring_system_prompt(job, rubric),
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+        "messages": [{"role": "user", "content": build_scoring_prompt(resume)}],
+    }
+
+
+def build_multi_job_system_prompt(jobs: list[dict], rubric: list[dict]) -> str:
+    """Construct the static prompt for scoring one resume against several jobs at once."""
+    jobs_text = json.dumps(jobs, indent=2)
+    example_ids = [j["job_id"] for j in jobs[:2]]
+    keyed_format = ",\n".join(f'  "{job_id}": <evaluation object>' for job_id in example_ids)
+
+    return f"""You are an expert HR recruiter evaluating a candidate resume against several job descriptions.
+Score the candidate against EACH job independently, on each criterion, using the rubric below.
 
 ## Scoring Rubric
 For each criterion, assign a score from 1 to 5 using these guidelines:
-{rubric_text}
+{build_rubric_text(rubric)}
 
 ## Instructions
-Evaluate the candidate carefully and return ONLY a valid JSON object with this exact structure:
+For each job, build an evaluation object with this exact structure:
+```json
+{SCORE_OBJECT_FORMAT}
+```
+
+Return ONLY a valid JSON object keyed by job_id, with one evaluation object per job:
 ```json
 {{
-  "technical_skills_match": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "relevant_experience": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "education_alignment": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "communication_skills": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "leadership_experience": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "problem_solving": {{"score": <1-5>, "justification": "<brief reason>"}},
-  "skill_gaps": ["<missing skill 1>", "<missing skill 2>"],
-  "nice_to_have_matches": ["<matching nice-to-have 1>"],
-  "overall_impression": "<2-3 sentence summary of candidate fit>"
+{keyed_format},
+  ...
 }}
 ```
+Include every job_id listed below. Return ONLY the JSON. No other text.
+
+## Job Descriptions
+{jobs_text}"""
+
+
+def build_multi_job_request(resume: dict, jobs: list[dict], rubric: list[dict]) -> dict:
+    """Return messages.create parameters for scoring one resume against several jobs."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": MULTI_JOB_MAX_TOKENS_PER_JOB * len(jobs),
+        "system": [
+            {
+                "type": "text",
+                "text": build_multi_job_system_prompt(jobs, rubric),
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+        "messages": [{"role": "user", "content": build_scoring_prompt(resume)}],
+    }
+
 
-Return ONLY the JSON. No other text."""
+def scoring_cache_key(request: dict, rubric: list[dict]) -> str:
+    """Response-cache key for a scoring request (system block + resume content)."""
+    prompt = request["system"][0]["text"] + "\n" + request["messages"][0]["content"]
+    return make_cache_key(request["model"], prompt, rubric_version(rubric))
 
 
-def call_claude_for_scoring(prompt: str) -> dict:
-    """Call Claude API and parse the JSON response."""
-    client = anthropic.Anthropic()
+def multi_job_cache_key(request: dict, job_id: str, rubric: list[dict]) -> str:
+    """Response-cache key for one job's answer within a multi-job scoring request."""
+    return scoring_cache_key(request, rubric) + f":{job_id}"
 
-    response = client.messages.create(
-        model=MODEL_NAME,
-        max_tokens=MAX_TOKENS,
-        messages=[{"role": "user", "content": prompt}],
-    )
+
+def call_claude_for_scoring(request: dict, call=None) -> dict:
+    """Call Claude API and parse the JSON response. `call` is the metrics record to fill in."""
+    client = get_client()
+
+    response = client.messages.create(**request)
+    if call is not None:
+        call.usage(response.usage)
 
     raw_text = response.content[0].text
     return _parse_json_response(raw_text)
@@ -139,13 +317,20 @@ def _parse_json_response(text: str) -> dict:
 
 
 def evaluate_candidate(resume: dict, job: dict, rubric: list[dict]) -> dict:
-    """Score a single resume against a job description with retry logic."""
-    prompt = build_scoring_prompt(resume, job, rubric)
+    """Score a single resume against a job description with caching and retry logic."""
+    request = build_scoring_request(resume, job, rubric)
+
+    cache_key = scoring_cache_key(request, rubric)
+    cached = scoring_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     for attempt in range(MAX_RETRIES + 1):
         try:
-            time.sleep(API_DELAY_SECONDS)
-            result = call_claude_for_scoring(prompt)
+            with call_metrics.call("scoring", job["job_id"], attempt) as call:
+                call.waited(api_rate_limiter.acquire())
+                result = call_claude_for_scoring(request, call)
+            scoring_cache.put(cache_key, result)
             return result
         except (json.JSONDecodeError, ValueError) as e:
             if attempt < MAX_RETRIES:
@@ -163,6 +348,127 @@ def evaluate_candidate(resume: dict, job: dict, rubric: list[dict]) -> dict:
                 return _default_scores(str(e))
 
 
+def evaluate_candidates_batch(pairs: list[tuple[dict, dict]], rubric: list[dict]) -> list[dict]:
+    """
+    Score many (resume, job) pairs through one Message Batches job.
+
+    Cached pairs are answered locally; the rest are submitted together. Returns
+    raw score dicts in the same order as `pairs`, using defaults for any
+    request that errored or could not be parsed.
+    """
+    results = [None] * len(pairs)
+    requests = {}
+    pending = {}
+
+    for idx, (resume, job) in enumerate(pairs):
+        request = build_scoring_request(resume, job, rubric)
+        cache_key = scoring_cache_key(request, rubric)
+        cached = scoring_cache.get(cache_key)
+        if cached is not None:
+            results[idx] = cached
+            continue
+        custom_id = make_custom_id("score", job["job_id"], idx)
+        requests[custom_id] = request
+        pending[custom_id] = (idx, cache_key, job["job_id"])
+
+    print(f"  {len(pairs) - len(requests)} served from cache, {len(requests)} submitted to batch")
+    if requests:
+        messages = run_message_batch(requests)
+        for custom_id, (idx, cache_key, job_id) in pending.items():
+            message = messages.get(custom_id)
+            call_metrics.record_batch("scoring", job_id, message.usage if message is not None else None)
+            if message is None:
+                results[idx] = _default_scores("Batch request did not succeed")
+                continue
+            try:
+                results[idx] = _parse_json_response(message.content[0].text)
+                scoring_cache.put(cache_key, results[idx])
+            except (json.JSONDecodeError, ValueError) as e:
+                results[idx] = _default_scores(str(e))
+
+    return results
+
+
+def validate_scores(scores) -> dict:
+    """Check a single evaluation object against the expected schema. Raises ValueError."""
+    if not isinstance(scores, dict):
+        raise ValueError("Evaluation is not a JSON object")
+    for key in CRITERIA_KEY_MAP.values():
+        entry = scores.get(key)
+        score = entry.get("score") if isinstance(entry, dict) else None
+        if not isinstance(score, (int, float)) or isinstance(score, bool) or not 1 <= score <= 5:
+            raise ValueError(f"Missing or out-of-range score for '{key}'")
+    for key in ("skill_gaps", "nice_to_have_matches"):
+        if not isinstance(scores.get(key, []), list):
+            raise ValueError(f"'{key}' must be a list")
+    return scores
+
+
+def evaluate_candidate_all_jobs(resume: dict, jobs: list[dict], rubric: list[dict]) -> dict:
+    """
+    Score one resume against several jobs in a single API call.
+
+    Answers are cached per job under a key derived from the multi-job request
+    itself, never under the single-job key: a multi-job score comes from a
+    different prompt and is not reused by single-job or --batch runs. If any
+    job is missing from the cache the whole request is sent again, so every
+    cached answer matches the prompt that produced it. Each job's evaluation
+    in the response is validated on its own; a missing or invalid entry falls
+    back to _default_scores for that job only. Returns {job_id: raw_scores}.
+    """
+    request = build_multi_job_request(resume, jobs, rubric)
+    results = {}
+    cache_keys = {}
+    for job in jobs:
+        cache_keys[job["job_id"]] = multi_job_cache_key(request, job["job_id"], rubric)
+        cached = scoring_cache.get(cache_keys[job["job_id"]])
+        if cached is not None:
+            results[job["job_id"]] = cached
+
+    pending = [j for j in jobs if j["job_id"] not in results]
+    if not pending:
+        return results
+
+    response_data = None
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            with call_metrics.call("scoring", MULTI_JOB_USAGE_KEY, attempt) as call:
+                call.waited(api_rate_limiter.acquire())
+                response = get_client().messages.create(**request)
+                call.usage(response.usage)
+                response_data = _parse_json_response(response.content[0].text)
+                if not isinstance(response_data, dict):
+                    raise ValueError("Response is not a JSON object keyed by job_id")
+            break
+        except (json.JSONDecodeError, ValueError) as e:
+            if attempt < MAX_RETRIES:
+                print(f"\n    [RETRY {attempt + 1}] JSON parse error, retrying...")
+                time.sleep(1 * (attempt + 1))
+            else:
+                print(f"\n    [ERROR] Failed to parse after {MAX_RETRIES + 1} attempts. Using defaults.")
+                return {**results, **{j["job_id"]: _default_scores(str(e)) for j in pending}}
+        except anthropic.APIError as e:
+            if attempt < MAX_RETRIES:
+                print(f"\n    [RETRY {attempt + 1}] API error: {e}, retrying...")
+                time.sleep(2 * (attempt + 1))
+            else:
+                print(f"\n    [ERROR] API failed after {MAX_RETRIES + 1} attempts. Using defaults.")
+                return {**results, **{j["job_id"]: _default_scores(str(e)) for j in pending}}
+
+    for job in pending:
+        job_id = job["job_id"]
+        try:
+            if job_id not in response_data:
+                raise ValueError("No evaluation returned for this job")
+            results[job_id] = validate_scores(response_data[job_id])
+            scoring_cache.put(cache_keys[job_id], results[job_id])
+        except ValueError as e:
+            print(f"\n    [WARNING] Invalid evaluation for {resume['name']} / {job_id}: {e}. Using defaults.")
+            results[job_id] = _default_scores(str(e))
+
+    return results
+
+
 def _default_scores(error_msg: str) -> dict:
     """Return default mid-range scores when evaluation fails."""
     default = {"score": 3, "justification": "Could not evaluate - using default score"}
@@ -0,0 +1,215 @@
+"""
+Metrics Module
+==============
+Per-call instrumentation for every Claude API call site. Each attempt
+records its phase (scoring, profiles, rejections), job, rate-limiter queue
+wait, API wall time, outcome, token usage and estimated cost; phases record
+their own wall-clock time. At the end of a run the records are rolled up per
+phase and per job with p50/p95/p99 latencies, printed as a summary table and
+saved as a machine-readable metrics JSON. This is the single record of
+token and prompt cache usage for a run.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import (
+    MODEL_INPUT_PRICE_PER_MTOK,
+    MODEL_OUTPUT_PRICE_PER_MTOK,
+    CACHE_WRITE_PRICE_MULTIPLIER,
+    CACHE_READ_PRICE_MULTIPLIER,
+    BATCH_PRICE_MULTIPLIER,
+)
+
+TOKEN_FIELDS = (
+    "input_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+    "output_tokens",
+)
+
+
+def estimate_cost(tokens: dict, batch: bool = False) -> float:
+    """Estimated USD cost of one call's token usage."""
+    cost = (
+        tokens["input_tokens"] * MODEL_INPUT_PRICE_PER_MTOK
+        + tokens["cache_creation_input_tokens"] * MODEL_INPUT_PRICE_PER_MTOK * CACHE_WRITE_PRICE_MULTIPLIER
+        + tokens["cache_read_input_tokens"] * MODEL_INPUT_PRICE_PER_MTOK * CACHE_READ_PRICE_MULTIPLIER
+        + tokens["output_tokens"] * MODEL_OUTPUT_PRICE_PER_MTOK
+    ) / 1_000_000
+    return cost * BATCH_PRICE_MULTIPLIER if batch else cost
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Linearly interpolated percentile of an ascending list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+class CallRecord:
+    """One API call attempt, filled in by the call site inside CallMetrics.call()."""
+
+    def __init__(self, phase: str, job_id: str, attempt: int):
+        self.phase = phase
+        self.job_id = job_id
+        self.attempt = attempt
+        self.queue_wait_s = 0.0
+        self.tokens = {field: 0 for field in TOKEN_FIELDS}
+        self.status = "ok"
+
+    def waited(self, seconds: float):
+        """Record time spent queued on the rate limiter before the request was sent."""
+        self.queue_wait_s += seconds
+
+    def usage(self, usage):
+        """Record token usage from a response's `usage` object."""
+        for field in TOKEN_FIELDS:
+            self.tokens[field] += getattr(usage, field, 0) or 0
+
+
+class CallMetrics:
+    """Thread-safe collector of per-call records and per-phase wall times."""
+
+    def __init__(self):
+        self._calls = []
+        self._phase_seconds = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def call(self, phase: str, job_id: str, attempt: int = 0):
+        """
+        Time one API call attempt. Latency excludes the queue wait reported via
+        record.waited(); an exception escaping the block marks the attempt
+        with its type name and is re-raised.
+        """
+        record = CallRecord(phase, job_id, attempt)
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record.status = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._append(record, latency_ms=(elapsed - record.queue_wait_s) * 1000, batch=False)
+
+    def record_batch(self, phase: str, job_id: str, usage):
+        """Record one Message Batches result; batch calls have no per-call latency."""
+        record = CallRecord(phase, job_id, 0)
+        if usage is None:
+            record.status = "batch_failed"
+        else:
+            record.usage(usage)
+        self._append(record, latency_ms=None, batch=True)
+
+    def _append(self, record: CallRecord, latency_ms, batch: bool):
+        entry = {
+            "phase": record.phase,
+            "job_id": record.job_id,
+            "attempt": record.attempt,
+            "status": record.status,
+            "batch": batch,
+            "queue_wait_ms": round(record.queue_wait_s * 1000, 1),
+            "latency_ms": None if latency_ms is None else round(latency_ms, 1),
+            **record.tokens,
+            "cost_usd": round(estimate_cost(record.tokens, batch), 6),
+        }
+        with self._lock:
+            self._calls.append(entry)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Accumulate the wall-clock time of a pipeline phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._phase_seconds[name] = self._phase_seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def calls(self) -> list[dict]:
+        with self._lock:
+            return list(self._calls)
+
+    def summary(self) -> dict:
+        """Roll call records up into totals, per-phase and per-job figures."""
+        calls = self.calls()
+        by_phase, by_job = {}, {}
+        for c in calls:
+            by_phase.setdefault(c["phase"], []).append(c)
+            by_job.setdefault(c["job_id"], []).append(c)
+        with self._lock:
+            phase_seconds = dict(self._phase_seconds)
+
+        phases = {name: _rollup(group) for name, group in by_phase.items()}
+        for name, seconds in phase_seconds.items():
+            phases.setdefault(name, _rollup([]))["wall_seconds"] = round(seconds, 2)
+        return {
+            "totals": _rollup(calls),
+            "phases": phases,
+            "jobs": {job_id: _rollup(group) for job_id, group in sorted(by_job.items())},
+        }
+
+    def format_summary(self, summary: dict = None) -> str:
+        """
+        Render the summary as one plain-text table: a row per phase, then a
+        row per job, then the total. Token columns include prompt cache
+        writes and reads, so this is the only usage table a run prints.
+        """
+        summary = summary or self.summary()
+        header = (f"    {'':<12} {'Calls':>6} {'Retry':>6} {'Fail':>5} {'p50 ms':>8} {'p95 ms':>8} "
+                  f"{'p99 ms':>8} {'Wait ms':>8} {'In tok':>10} {'Cache wr':>10} {'Cache rd':>10} "
+                  f"{'Out tok':>9} {'Cost $':>9} {'Wall s':>7}")
+        rule = "    " + "-" * (len(header) - 4)
+        lines = ["  API calls by phase and job:", header]
+        sections = [summary["phases"].items(), summary["jobs"].items(), [("TOTAL", summary["totals"])]]
+        for rows in sections:
+            lines.append(rule)
+            for name, m in rows:
+                wall = f"{m['wall_seconds']:>7.1f}" if "wall_seconds" in m else f"{'':>7}"
+                lines.append(
+                    f"    {name:<12} {m['calls']:>6} {m['retries']:>6} {m['failures']:>5} "
+                    f"{m['latency_ms']['p50']:>8.0f} {m['latency_ms']['p95']:>8.0f} {m['latency_ms']['p99']:>8.0f} "
+                    f"{m['avg_queue_wait_ms']:>8.0f} {m['input_tokens']:>10,} "
+                    f"{m['cache_creation_input_tokens']:>10,} {m['cache_read_input_tokens']:>10,} "
+                    f"{m['output_tokens']:>9,} {m['cost_usd']:>9.4f} {wall}"
+                )
+        return "\n".join(lines)
+
+    def save(self, path: Path) -> Path:
+        """Write the summary and every call record as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"summary": self.summary(), "calls": self.calls()}, f, indent=2)
+        return path
+
+
+def _rollup(calls: list[dict]) -> dict:
+    latencies = sorted(c["latency_ms"] for c in calls if c["latency_ms"] is not None)
+    return {
+        "calls": len(calls),
+        "retries": sum(1 for c in calls if c["attempt"] > 0),
+        "failures": sum(1 for c in calls if c["status"] != "ok"),
+        "batch_calls": sum(1 for c in calls if c["batch"]),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "avg_queue_wait_ms": round(sum(c["queue_wait_ms"] for c in calls) / len(calls), 1) if calls else 0.0,
+        **{field: sum(c[field] for c in calls) for field in TOKEN_FIELDS},
+        "cost_usd": round(sum(c["cost_usd"] for c in calls), 4),
+    }
+
+
+# Shared metrics for the current pipeline run
+call_metrics = CallMetrics()
@@ -0,0 +1,145 @@
+"""
+Output Writer Module
+====================
+Writes interview profiles and rejection emails. The default "files" format
+keeps one file per candidate; "jsonl" and "zip" write a single archive per
+job and output kind instead, so a run with thousands of rejections creates a
+handful of files rather than thousands of small ones. With a background
+writer, callers only enqueue outputs and a dedicated thread does the disk
+I/O, keeping slow (e.g. network) filesystems off the pipeline's path.
+"""
+
+import json
+import queue
+import threading
+import zipfile
+from pathlib import Path
+
+from config import PROFILE_DIR, REJECTION_DIR, OUTPUT_WRITER_QUEUE_SIZE
+
+OUTPUT_FORMATS = ("files", "jsonl", "zip")
+
+_DIRECTORIES = {"profile": PROFILE_DIR, "rejection": REJECTION_DIR}
+_ARCHIVE_SUFFIXES = {"profile": "profiles", "rejection": "rejections"}
+
+
+def output_filename(kind: str, candidate_name: str, job_id: str) -> str:
+    """File (or archive entry) name for one candidate's profile or rejection email."""
+    safe_name = candidate_name.replace(" ", "_").replace(".", "")
+    if kind == "profile":
+        return f"{job_id}_{safe_name}.json"
+    return f"{job_id}_{safe_name}_rejection.txt"
+
+
+class OutputWriter:
+    """Writes profiles and rejection emails as per-candidate files, per-job JSONL or per-job zip."""
+
+    def __init__(self, output_format: str = "files", background: bool = False):
+        self.output_format = output_format
+        self.background = background
+        self.written = 0
+        self._archives = {}
+        self._queue = None
+        self._thread = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def open(self, output_format: str = "files", background: bool = False):
+        """Start a run's output; archives are created fresh on first write per job."""
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.close()
+        self.output_format = output_format
+        self.background = background
+        self.written = 0
+        self._error = None
+        if background:
+            self._queue = queue.Queue(maxsize=OUTPUT_WRITER_QUEUE_SIZE)
+            self._thread = threading.Thread(target=self._drain, name="output-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, kind: str, job_id: str, candidate_name: str, content) -> str:
+        """
+        Write one output of `kind` ("profile" or "rejection"); returns where it
+        went, e.g. "JD001_Jane_Doe.json" or "JD001_rejections.zip:JD001_Jane_Doe_rejection.txt".
+        """
+        filename = output_filename(kind, candidate_name, job_id)
+        if self.background and self._queue is not None:
+            if self._error is not None:
+                raise self._error
+            self._queue.put((kind, job_id, candidate_name, filename, content))
+        else:
+            self._write(kind, job_id, candidate_name, filename, content)
+        if self.output_format == "files":
+            return filename
+        return f"{self._archive_path(kind, job_id).name}:{filename}"
+
+    def close(self):
+        """Wait for queued outputs and close every open archive. Re-raises a background write error."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._queue = None
+        with self._lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives = {}
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._write(*item)
+            except Exception as e:
+                # Keep draining so producers never block; the error surfaces on write()/close()
+                print(f"    [ERROR] Output writer failed on {item[3]}: {e}")
+                self._error = e
+
+    def _archive_path(self, kind: str, job_id: str) -> Path:
+        extension = "jsonl" if self.output_format == "jsonl" else "zip"
+        return _DIRECTORIES[kind] / f"{job_id}_{_ARCHIVE_SUFFIXES[kind]}.{extension}"
+
+    def _write(self, kind: str, job_id: str, candidate_name: str, filename: str, content):
+        text = json.dumps(content, indent=2) if kind == "profile" else content
+        with self._lock:
+            if self.output_format == "files":
+                directory = _DIRECTORIES[kind]
+                directory.mkdir(parents=True, exist_ok=True)
+                with open(directory / filename, "w", encoding="utf-8") as f:
+                    f.write(text)
+            else:
+                archive = self._archive(kind, job_id)
+                if self.output_format == "jsonl":
+                    archive.write(json.dumps({
+                        "job_id": job_id,
+                        "candidate": candidate_name,
+                        "filename": filename,
+                        "content": content,
+                    }) + "\n")
+                else:
+                    archive.writestr(filename, text)
+            self.written += 1
+
+    def _archive(self, kind: str, job_id: str):
+        archive = self._archives.get((kind, job_id))
+        if archive is None:
+            path = self._archive_path(kind, job_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self.output_format == "jsonl":
+                archive = open(path, "w", encoding="utf-8", buffering=1 << 20)
+            else:
+                archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+            self._archives[(kind, job_id)] = archive
+        return archive
+
+
+# Shared writer for the current pipeline run
+output_writer = OutputWriter()
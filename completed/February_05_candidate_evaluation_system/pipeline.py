@@ -0,0 +1,136 @@
+"""
+Pipeline Module
+===============
+Runs scoring, ranking, profile generation and rejection generation as one
+overlapping pipeline on a shared thread pool. As soon as every pair for a
+job has been scored, that job is ranked and its profile and rejection calls
+are queued while other jobs are still being scored, so total wall-clock time
+approaches that of the slowest stage rather than the sum of all stages.
+Each job's ranking is maintained incrementally as scores arrive, so a
+provisional top-K shortlist can be published before the job is fully scored.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import MAX_CONCURRENT_REQUESTS, REJECTION_GROUP_SIZE, STREAM_MAX_PENDING_PER_WORKER
+from evaluation_engine import evaluate_pair, seed_evaluations
+from scoring_engine import IncrementalRanking
+from profile_generator import generate_interview_profile, generate_rejection_emails
+
+
+def run_pipeline(
+    resumes: list[dict],
+    jobs: list[dict],
+    rubric: list[dict],
+    template: dict,
+    salary_benchmarks: dict,
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    precomputed: dict = None,
+    on_scored=None,
+    on_ranked=None,
+    on_profile=None,
+    on_rejection=None,
+    shortlist_k: int = 0,
+    on_shortlist=None,
+) -> dict:
+    """
+    Score, rank and generate follow-ups for every job with overlapping stages.
+
+    Scoring units are submitted job by job, with at most
+    STREAM_MAX_PENDING_PER_WORKER * max_workers in flight, so a finished job's
+    profile and rejection calls only queue behind a bounded number of scoring
+    calls. All callbacks run on the calling thread:
+      on_scored(done, total, job, evaluation)   as each pair is scored
+      on_ranked(job, ranked)                    once a job's ranking is final
+      on_profile(job, evaluation, profile)      as each profile completes
+      on_rejection(job, evaluation, email)      as each rejection email completes (rejections
+                                                are personalised REJECTION_GROUP_SIZE per call)
+      on_shortlist(snapshot)                    when a job's top `shortlist_k` is stable
+                                                (see IncrementalRanking)
+    Returns {job_id: ranked evaluations}, as phase 3 would.
+    """
+    all_evaluations = seed_evaluations(resumes, jobs, precomputed)
+    rankings = {
+        job["job_id"]: IncrementalRanking(
+            job["job_id"], len(resumes), k=shortlist_k, on_shortlist=on_shortlist,
+        )
+        for job in jobs
+    }
+    remaining = {
+        job["job_id"]: sum(ev is None for ev in all_evaluations[job["job_id"]]) for job in jobs
+    }
+    scoring_units = iter([
+        (job, idx)
+        for job in jobs
+        for idx in range(len(resumes))
+        if all_evaluations[job["job_id"]][idx] is None
+    ])
+    total = sum(remaining.values())
+    max_pending = max(1, max_workers) * STREAM_MAX_PENDING_PER_WORKER
+    futures = {}
+    scoring_in_flight = 0
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+
+        def finish_job(job):
+            ranked = rankings[job["job_id"]].ranked()
+            all_evaluations[job["job_id"]] = ranked
+            if on_ranked:
+                on_ranked(job, ranked)
+            rejected = []
+            for evaluation in ranked:
+                if evaluation["classification"] == "top_candidate":
+                    future = pool.submit(
+                        generate_interview_profile,
+                        evaluation["resume"], job, evaluation, salary_benchmarks, template,
+                    )
+                    futures[future] = ("profile", job, evaluation)
+                else:
+                    rejected.append(evaluation)
+            for start in range(0, len(rejected), REJECTION_GROUP_SIZE):
+                group = rejected[start : start + REJECTION_GROUP_SIZE]
+                future = pool.submit(generate_rejection_emails, [(e["resume"], job, e) for e in group])
+                futures[future] = ("rejection", job, group)
+
+        def fill_scoring():
+            nonlocal scoring_in_flight
+            while scoring_in_flight < max_pending:
+                unit = next(scoring_units, None)
+                if unit is None:
+                    return
+                job, idx = unit
+                futures[pool.submit(evaluate_pair, resumes[idx], job, rubric)] = ("score", job, idx)
+                scoring_in_flight += 1
+
+        for job in jobs:
+            for idx, evaluation in enumerate(all_evaluations[job["job_id"]]):
+                if evaluation is not None:
+                    rankings[job["job_id"]].seed(evaluation, idx)
+            if remaining[job["job_id"]] == 0:
+                finish_job(job)
+        fill_scoring()
+
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, job, item = futures.pop(future)
+                result = future.result()
+                if kind == "score":
+                    scoring_in_flight -= 1
+                    all_evaluations[job["job_id"]][item] = result
+                    rankings[job["job_id"]].add(result, item)
+                    remaining[job["job_id"]] -= 1
+                    done += 1
+                    if on_scored:
+                        on_scored(done, total, job, result)
+                    if remaining[job["job_id"]] == 0:
+                        finish_job(job)
+                elif kind == "profile" and on_profile:
+                    on_profile(job, item, result)
+                elif kind == "rejection" and on_rejection:
+                    for evaluation, email in zip(item, result):
+                        on_rejection(job, evaluation, email)
+            fill_scoring()
+
+    return all_evaluations
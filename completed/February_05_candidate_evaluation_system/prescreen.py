@@ -0,0 +1,189 @@
+"""
+Pre-screen Module
+=================
+Cheap, deterministic local screening that runs before any LLM scoring.
+Each (resume, job) pair gets a 0-1 similarity from parsed skills, years of
+experience and education level (zero required-skill overlap scores 0),
+computed for the whole resume x job matrix at once with NumPy. Only the plausible top-K candidates per job
+are routed to Claude; the rest are auto-classified as not selected with
+rubric-style scores derived from the same signals.
+"""
+
+import re
+
+import numpy as np
+
+from skill_matrix import compute_skill_match, normalize_skill
+from scoring_engine import build_evaluation
+from config import (
+    PRESCREEN_MIN_SIMILARITY,
+    PRESCREEN_WEIGHTS,
+    MODEL_INPUT_PRICE_PER_MTOK,
+    MODEL_OUTPUT_PRICE_PER_MTOK,
+    EST_SCORING_OUTPUT_TOKENS,
+)
+
+# Degree levels: none/certificate=0, bachelor=1, master=2, doctorate=3
+_DEGREE_PATTERNS = [
+    (3, re.compile(r"\b(ph\.?\s?d|doctorate|doctor of)\b", re.IGNORECASE)),
+    (2, re.compile(r"\b(m\.?s\.?|m\.?a\.?|m\.?b\.?a\.?|m\.?sc|master'?s?)\b", re.IGNORECASE)),
+    (1, re.compile(r"\b(b\.?s\.?|b\.?a\.?|b\.?f\.?a\.?|b\.?sc|bachelor'?s?)\b", re.IGNORECASE)),
+]
+
+
+def degree_level(text: str) -> int:
+    """Return the highest degree level mentioned in `text`."""
+    for level, pattern in _DEGREE_PATTERNS:
+        if pattern.search(text):
+            return level
+    return 0
+
+
+def compute_similarity_matrix(resumes: list[dict], jobs: list[dict]) -> dict:
+    """
+    Compute pre-screen signals for every (resume, job) pair as NumPy arrays.
+
+    Returns the skill_matrix results plus `years_over`, `degree_gap` and the
+    combined `similarity`, each shaped (len(resumes), len(jobs)).
+    """
+    match = compute_skill_match(resumes, jobs)
+
+    years = np.array([r["total_years_experience"] for r in resumes], dtype=float)
+    required_years = np.array([j["requirements"].get("experience_years", 0) for j in jobs], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        years_fit = np.where(
+            required_years > 0, np.minimum(1.0, years[:, None] / required_years[None, :]), 1.0
+        )
+
+    resume_degree = np.array(
+        [max((degree_level(e) for e in r["education"]), default=0) for r in resumes], dtype=int
+    )
+    job_degree = np.array([degree_level(j["requirements"].get("education", "")) for j in jobs], dtype=int)
+    degree_gap = resume_degree[:, None] - job_degree[None, :]
+    education_fit = np.select([degree_gap >= 0, degree_gap == -1], [1.0, 0.5], default=0.0)
+
+    coverage = match["required_coverage"]
+    combined = (
+        PRESCREEN_WEIGHTS["skills"] * coverage
+        + PRESCREEN_WEIGHTS["nice_to_have"] * match["nice_coverage"]
+        + PRESCREEN_WEIGHTS["experience"] * years_fit
+        + PRESCREEN_WEIGHTS["education"] * education_fit
+    )
+    # Zero overlap with the required skills is disqualifying on its own
+    similarity = np.round(np.where(coverage > 0, combined, 0.0), 4)
+
+    return {
+        **match,
+        "years_over": (years[:, None] - required_years[None, :]).astype(int),
+        "degree_gap": degree_gap,
+        "similarity": similarity,
+    }
+
+
+def estimate_scoring_cost(resume: dict, job: dict) -> float:
+    """Rough USD cost of one scoring call (~4 characters per input token)."""
+    input_tokens = (len(resume["raw_text"]) + len(str(job)) + 2500) / 4
+    return (
+        input_tokens * MODEL_INPUT_PRICE_PER_MTOK
+        + EST_SCORING_OUTPUT_TOKENS * MODEL_OUTPUT_PRICE_PER_MTOK
+    ) / 1_000_000
+
+
+def _bucket(value: float, edges: list[float]) -> int:
+    """Map `value` to a 1-5 score given four ascending bucket edges."""
+    return 1 + sum(value > edge for edge in edges)
+
+
+def prescreen_raw_scores(screen: dict) -> dict:
+    """Rubric-shaped raw scores for a pair that was screened out locally."""
+    not_assessed = {"score": 1, "justification": "Not assessed - screened out before LLM scoring"}
+    return {
+        "technical_skills_match": {
+            "score": _bucket(screen["skill_coverage"], [0.2, 0.4, 0.6, 0.8]),
+            "justification": f"{screen['skill_coverage']:.0%} of required skills listed",
+        },
+        "relevant_experience": {
+            "score": _bucket(screen["years_over_requirement"], [-1, 0, 2, 4]),
+            "justification": f"{screen['years_over_requirement']:+d} years vs requirement",
+        },
+        "education_alignment": {
+            "score": max(1, min(5, 3 + screen["degree_gap"])),
+            "justification": "Degree level compared with requirement",
+        },
+        "communication_skills": dict(not_assessed),
+        "leadership_experience": dict(not_assessed),
+        "problem_solving": dict(not_assessed),
+        "skill_gaps": screen["missing_skills"],
+        "nice_to_have_matches": [],
+        "overall_impression": (
+            f"Auto-classified by local pre-screen (similarity {screen['similarity']:.2f}); "
+            "not sent for LLM scoring."
+        ),
+        "prescreened": True,
+    }
+
+
+def run_prescreen(
+    resumes: list[dict], jobs: list[dict], top_k: int, min_similarity: float = PRESCREEN_MIN_SIMILARITY
+) -> tuple[dict, dict]:
+    """
+    Screen every (resume, job) pair locally.
+
+    Returns (routed, screened_out): routed is {job_id: [resume index, ...]} for
+    pairs that should go to the LLM (similarity >= min_similarity and within the
+    top_k for the job, ties broken by resume order); screened_out is
+    {job_id: {resume index: screen result}} for everything else.
+    """
+    matrix = compute_similarity_matrix(resumes, jobs)
+    similarity = matrix["similarity"]
+    skill_sets = [{normalize_skill(s) for s in r["skills"]} for r in resumes]
+
+    routed, screened_out = {}, {}
+    for col, job in enumerate(jobs):
+        order = np.argsort(-similarity[:, col], kind="stable")
+        keep = order[similarity[order, col] >= min_similarity][:top_k]
+        keep_set = set(keep.tolist())
+        routed[job["job_id"]] = sorted(keep_set)
+
+        # Plain lists: per-element NumPy indexing is slow in the loop below
+        sims = similarity[:, col].tolist()
+        coverage = matrix["required_coverage"][:, col].tolist()
+        years_over = matrix["years_over"][:, col].tolist()
+        degree_gap = matrix["degree_gap"][:, col].tolist()
+        required = [(s, normalize_skill(s)) for s in job["requirements"]["technical_skills"]]
+        screened_out[job["job_id"]] = {
+            i: {
+                "similarity": sims[i],
+                "skill_coverage": coverage[i],
+                "missing_skills": [s for s, key in required if key not in skill_sets[i]],
+                "years_over_requirement": years_over[i],
+                "degree_gap": degree_gap[i],
+            }
+            for i in range(len(resumes))
+            if i not in keep_set
+        }
+    return routed, screened_out
+
+
+def build_prescreened_evaluations(
+    resumes: list[dict], jobs: list[dict], screened_out: dict, rubric: list[dict]
+) -> dict:
+    """
+    Evaluation records for screened-out pairs, as {job_id: {resume index: evaluation}}.
+
+    These are always classified not_selected and carry the similarity and the
+    estimated API cost the skipped scoring call would have incurred.
+    """
+    precomputed = {}
+    for job in jobs:
+        job_id = job["job_id"]
+        precomputed[job_id] = {}
+        for idx, screen in screened_out.get(job_id, {}).items():
+            evaluation = build_evaluation(resumes[idx], prescreen_raw_scores(screen), rubric)
+            evaluation["classification"] = "not_selected"
+            evaluation["prescreen"] = {
+                "similarity": screen["similarity"],
+                "estimated_cost_saved_usd": round(estimate_scoring_cost(resumes[idx], job), 6),
+            }
+            precomputed[job_id][idx] = evaluation
+    return precomputed
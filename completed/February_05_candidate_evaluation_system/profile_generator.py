@@ -8,19 +8,23 @@ rejection email drafts (non-selected candidates) using Claude API.
 import json
 import re
 import time
-from pathlib import Path
 
 import anthropic
 
 from config import (
     INTERVIEW_TEMPLATE_PATH,
-    PROFILE_DIR,
-    REJECTION_DIR,
     MODEL_NAME,
     MAX_TOKENS,
-    API_DELAY_SECONDS,
     MAX_RETRIES,
+    REJECTION_GROUP_SIZE,
+    REJECTION_PARAGRAPH_MAX_TOKENS,
 )
+from api_client import get_client
+from rate_limiter import api_rate_limiter
+from batch_runner import make_custom_id, run_message_batch
+from checkpoint import run_journal, work_unit_key
+from job_matcher import SalaryBenchmarks
+from metrics import call_metrics
 
 
 def load_interview_template() -> dict:
@@ -83,33 +87,48 @@ Return ONLY a valid JSON object matching the template structure with all fields
 """
 
 
+def build_profile_request(prompt: str) -> dict:
+    """Return the messages.create parameters for an interview profile prompt."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": MAX_TOKENS,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def _wrap_profile(resume: dict, job: dict, evaluation: dict, profile: dict) -> dict:
+    """Wrap a generated profile body in candidate/job metadata."""
+    return {
+        "candidate_name": resume["name"],
+        "candidate_email": resume["email"],
+        "job_id": job["job_id"],
+        "job_title": job["title"],
+        "weighted_score": evaluation["weighted_score"],
+        "profile": profile,
+    }
+
+
 def generate_interview_profile(
     resume: dict, job: dict, evaluation: dict, salary_benchmarks: dict, template: dict
 ) -> dict:
     """Generate a filled interview profile for a top candidate."""
     prompt = build_interview_profile_prompt(resume, job, evaluation, salary_benchmarks, template)
-    client = anthropic.Anthropic()
+    checkpoint_key = work_unit_key("profile", prompt)
+    restored = run_journal.get(checkpoint_key)
+    if restored is not None:
+        return restored
+    client = get_client()
 
     for attempt in range(MAX_RETRIES + 1):
         try:
-            time.sleep(API_DELAY_SECONDS)
-            response = client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=MAX_TOKENS,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw_text = response.content[0].text
-            profile = _parse_json_response(raw_text)
-
-            # Wrap in metadata
-            return {
-                "candidate_name": resume["name"],
-                "candidate_email": resume["email"],
-                "job_id": job["job_id"],
-                "job_title": job["title"],
-                "weighted_score": evaluation["weighted_score"],
-                "profile": profile,
-            }
+            with call_metrics.call("profiles", job["job_id"], attempt) as call:
+                call.waited(api_rate_limiter.acquire())
+                response = client.messages.create(**build_profile_request(prompt))
+                call.usage(response.usage)
+                raw_text = response.content[0].text
+                profile = _wrap_profile(resume, job, evaluation, _parse_json_response(raw_text))
+            run_journal.record(checkpoint_key, profile)
+            return profile
         except (json.JSONDecodeError, ValueError) as e:
             if attempt < MAX_RETRIES:
                 print(f"    [RETRY {attempt + 1}] Profile JSON parse error, retrying...")
@@ -126,90 +145,285 @@ def generate_interview_profile(
                 return _fallback_profile(resume, job, evaluation)
 
 
-def save_interview_profile(profile: dict, candidate_name: str, job_id: str) -> Path:
-    """Save interview profile as JSON file."""
-    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
-    safe_name = candidate_name.replace(" ", "_").replace(".", "")
-    filename = f"{job_id}_{safe_name}.json"
-    path = PROFILE_DIR / filename
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2)
-    return path
+def generate_interview_profiles_batch(
+    items: list[tuple[dict, dict, dict]], salary_benchmarks: dict, template: dict
+) -> list[dict]:
+    """
+    Generate profiles for many (resume, job, evaluation) items via one batch job.
+
+    Items already in the checkpoint journal are restored and left out of the batch.
+    """
+    profiles = [None] * len(items)
+    requests = {}
+    pending = {}
+    for idx, (resume, job, evaluation) in enumerate(items):
+        prompt = build_interview_profile_prompt(resume, job, evaluation, salary_benchmarks, template)
+        checkpoint_key = work_unit_key("profile", prompt)
+        profiles[idx] = run_journal.get(checkpoint_key)
+        if profiles[idx] is None:
+            custom_id = make_custom_id("profile", job["job_id"], idx)
+            requests[custom_id] = build_profile_request(prompt)
+            pending[custom_id] = (idx, checkpoint_key)
+
+    messages = run_message_batch(requests) if requests else {}
+
+    for custom_id, (idx, checkpoint_key) in pending.items():
+        resume, job, evaluation = items[idx]
+        message = messages.get(custom_id)
+        call_metrics.record_batch("profiles", job["job_id"], message.usage if message is not None else None)
+        try:
+            if message is None:
+                raise ValueError("Batch request did not succeed")
+            profile = _parse_json_response(message.content[0].text)
+            profiles[idx] = _wrap_profile(resume, job, evaluation, profile)
+            run_journal.record(checkpoint_key, profiles[idx])
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"    [ERROR] Profile generation failed for {resume['name']}: {e}")
+            profiles[idx] = _fallback_profile(resume, job, evaluation)
+    return profiles
 
 
 # ---------------------------------------------------------------------------
 # Rejection Email Generation
 # ---------------------------------------------------------------------------
 
-def build_rejection_email_prompt(resume: dict, job: dict, evaluation: dict) -> str:
-    """Construct prompt for generating a rejection email."""
-    skill_gaps = evaluation["raw_scores"].get("skill_gaps", [])
+REJECTION_EMAIL_TEMPLATE = """Subject: Update on Your Application - {title} Position
+
+Dear {first_name},
+
+Thank you for taking the time to apply for the {title} position in our {department} department. We appreciate your interest in joining our team.
+
+After careful consideration, we have decided to move forward with other candidates whose qualifications more closely align with our current needs for this role.
+
+{personal_paragraph}
+
+We encourage you to continue developing your skills and to consider applying for future opportunities with us that may be a better match for your experience.
+
+We wish you all the best in your career journey.
+
+Warm regards,
+The Hiring Team"""
+
+
+def build_rejection_context(resume: dict, job: dict, evaluation: dict) -> dict:
+    """Structured facts a rejection email is built from. Scores and ranks are deliberately excluded."""
+    raw_scores = evaluation["raw_scores"]
 
     # Find strongest areas
     best_criteria = []
     for key in ("technical_skills_match", "relevant_experience", "education_alignment",
                 "communication_skills", "leadership_experience", "problem_solving"):
-        entry = evaluation["raw_scores"].get(key, {})
+        entry = raw_scores.get(key, {})
         if isinstance(entry, dict) and entry.get("score", 0) >= 4:
             best_criteria.append(key.replace("_", " ").title())
 
-    return f"""You are a professional HR communications specialist.
-Write a rejection email for a candidate who was not selected.
+    # Pre-screened and failed evaluations carry a system note, not a reviewer's impression
+    machine_note = raw_scores.get("prescreened") or raw_scores.get("parse_error")
+
+    return {
+        "first_name": resume["name"].split()[0],
+        "title": job["title"],
+        "department": job["department"],
+        "skill_gaps": raw_scores.get("skill_gaps", [])[:2],
+        "strengths": best_criteria,
+        "impression": "" if machine_note else raw_scores.get("overall_impression", ""),
+    }
 
-## Candidate
-Name: {resume['name']}
-Position Applied For: {job['title']} ({job['department']} department)
 
-## Context
-- Skill gaps identified: {', '.join(skill_gaps) if skill_gaps else 'General fit concerns'}
-- Strongest areas: {', '.join(best_criteria) if best_criteria else 'Multiple areas showed promise'}
+def render_rejection_email(context: dict, personal_paragraph: str = None) -> str:
+    """Render the rejection email locally; without a paragraph, one is built from the skill gaps."""
+    if not personal_paragraph:
+        gaps = context["skill_gaps"]
+        if gaps:
+            personal_paragraph = (
+                f"As you continue to grow, building further experience with {' and '.join(gaps)} "
+                f"would strengthen future applications for roles like this one."
+            )
+        else:
+            personal_paragraph = (
+                "Your application showed real promise, and we would be glad to see your "
+                "experience continue to develop."
+            )
+    return REJECTION_EMAIL_TEMPLATE.format(personal_paragraph=personal_paragraph, **context)
+
+
+def build_personalization_prompt(contexts: dict) -> str:
+    """Prompt for one short personalization paragraph per candidate, keyed by candidate id."""
+    candidates = "\n".join(
+        f"[{cid}] {c['first_name']}, applied for {c['title']} ({c['department']})\n"
+        f"  Skill gaps: {', '.join(c['skill_gaps']) if c['skill_gaps'] else 'General fit concerns'}\n"
+        f"  Strongest areas: {', '.join(c['strengths']) if c['strengths'] else 'Multiple areas showed promise'}\n"
+        f"  Reviewer notes: {c['impression'] or 'None'}"
+        for cid, c in contexts.items()
+    )
+    return f"""You are a professional HR communications specialist.
+Each candidate below was not selected. The rest of their rejection email is
+already written; write only the personalization paragraph for each.
+
+## Candidates
+{candidates}
 
 ## Requirements
-- Address the candidate by first name
-- Reference the specific position
-- Be professional, warm, and empathetic
-- Include 1-2 specific areas they could strengthen (based on skill gaps)
-- Encourage future applications
-- Do NOT reveal specific scores or rankings
-- Keep it under 200 words
-- Include a subject line at the top
-- Sign off as "The Hiring Team"
+- 2-3 sentences, under 60 words, warm and professional
+- Mention 1-2 specific areas they could strengthen (based on skill gaps)
+- Acknowledge a genuine strength where there is one
+- Do NOT reveal scores, rankings or reviewer notes verbatim
+- No greeting, subject line or sign-off
 
-Write the complete email now:"""
+Return ONLY a JSON object mapping each candidate id to its paragraph, e.g. {{"c0": "..."}}"""
 
 
-def generate_rejection_email(resume: dict, job: dict, evaluation: dict) -> str:
-    """Generate a personalized rejection email for a non-selected candidate."""
-    prompt = build_rejection_email_prompt(resume, job, evaluation)
-    client = anthropic.Anthropic()
+def build_personalization_request(prompt: str, count: int) -> dict:
+    """Return the messages.create parameters for a personalization prompt covering `count` candidates."""
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": REJECTION_PARAGRAPH_MAX_TOKENS * count,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def _rejection_group(items: list[tuple[dict, dict, dict]]):
+    """
+    Prepare one personalization group.
+
+    Returns (emails, pending): emails restored from the checkpoint journal
+    (None where still needed), and {candidate id: (index, context, checkpoint key)}.
+    """
+    emails = [None] * len(items)
+    pending = {}
+    for idx, (resume, job, evaluation) in enumerate(items):
+        context = build_rejection_context(resume, job, evaluation)
+        checkpoint_key = work_unit_key("rejection", REJECTION_EMAIL_TEMPLATE, context)
+        emails[idx] = run_journal.get(checkpoint_key)
+        if emails[idx] is None:
+            pending[f"c{idx}"] = (idx, context, checkpoint_key)
+    return emails, pending
+
+
+def _finish_rejection_group(emails: list, pending: dict, paragraphs) -> list[str]:
+    """Render every pending email; candidates without a usable paragraph get the local one."""
+    if not isinstance(paragraphs, dict):
+        paragraphs = {}
+    for cid, (idx, context, checkpoint_key) in pending.items():
+        paragraph = paragraphs.get(cid)
+        if isinstance(paragraph, str) and paragraph.strip():
+            emails[idx] = render_rejection_email(context, paragraph.strip())
+            run_journal.record(checkpoint_key, emails[idx])
+        else:
+            print(f"    [WARNING] No personalization for {context['first_name']} ({context['title']}), "
+                  f"using the local paragraph")
+            emails[idx] = render_rejection_email(context)
+    return emails
+
+
+def generate_rejection_emails(items: list[tuple[dict, dict, dict]]) -> list[str]:
+    """
+    Generate rejection emails for (resume, job, evaluation) items.
+
+    Emails are rendered locally from REJECTION_EMAIL_TEMPLATE; Claude only
+    writes a short personalization paragraph, for up to REJECTION_GROUP_SIZE
+    candidates of one job per call. Returns emails in item order.
+    """
+    emails = [None] * len(items)
+    for group in _rejection_groups(items):
+        for idx, email in zip(group, _generate_rejection_group([items[i] for i in group])):
+            emails[idx] = email
+    return emails
+
+
+def _rejection_groups(items: list[tuple[dict, dict, dict]]) -> list[list[int]]:
+    """
+    Split item indices into personalization groups: per job first, then in
+    chunks of REJECTION_GROUP_SIZE, so every call is attributed to one job.
+    """
+    by_job = {}
+    for idx, (_, job, _) in enumerate(items):
+        by_job.setdefault(job["job_id"], []).append(idx)
+    return [
+        indices[start : start + REJECTION_GROUP_SIZE]
+        for indices in by_job.values()
+        for start in range(0, len(indices), REJECTION_GROUP_SIZE)
+    ]
+
+
+def _generate_rejection_group(items: list[tuple[dict, dict, dict]]) -> list[str]:
+    emails, pending = _rejection_group(items)
+    if not pending:
+        return emails
+
+    contexts = {cid: context for cid, (_, context, _) in pending.items()}
+    request = build_personalization_request(build_personalization_prompt(contexts), len(contexts))
+    client = get_client()
 
     for attempt in range(MAX_RETRIES + 1):
         try:
-            time.sleep(API_DELAY_SECONDS)
-            response = client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            return response.content[0].text.strip()
+            with call_metrics.call("rejections", items[0][1]["job_id"], attempt) as call:
+                call.waited(api_rate_limiter.acquire())
+                response = client.messages.create(**request)
+                call.usage(response.usage)
+                paragraphs = _parse_json_response(response.content[0].text)
+            return _finish_rejection_group(emails, pending, paragraphs)
+        except (json.JSONDecodeError, ValueError) as e:
+            if attempt < MAX_RETRIES:
+                print(f"    [RETRY {attempt + 1}] Personalization JSON parse error, retrying...")
+                time.sleep(1 * (attempt + 1))
+            else:
+                print(f"    [ERROR] Rejection personalization failed: {e}")
+                return _finish_rejection_group(emails, pending, None)
         except anthropic.APIError as e:
             if attempt < MAX_RETRIES:
                 print(f"    [RETRY {attempt + 1}] API error: {e}, retrying...")
                 time.sleep(2 * (attempt + 1))
             else:
-                print(f"    [ERROR] Rejection email failed: {e}")
-                return _fallback_rejection_email(resume, job)
+                print(f"    [ERROR] Rejection personalization failed: {e}")
+                return _finish_rejection_group(emails, pending, None)
 
 
-def save_rejection_email(email_text: str, candidate_name: str, job_id: str) -> Path:
-    """Save rejection email as a .txt file."""
-    REJECTION_DIR.mkdir(parents=True, exist_ok=True)
-    safe_name = candidate_name.replace(" ", "_").replace(".", "")
-    filename = f"{job_id}_{safe_name}_rejection.txt"
-    path = REJECTION_DIR / filename
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(email_text)
-    return path
+def generate_rejection_email(resume: dict, job: dict, evaluation: dict) -> str:
+    """Generate a personalized rejection email for a non-selected candidate."""
+    return generate_rejection_emails([(resume, job, evaluation)])[0]
+
+
+def generate_rejection_emails_batch(items: list[tuple[dict, dict, dict]]) -> list[str]:
+    """
+    Generate rejection emails for many (resume, job, evaluation) items via one batch job.
+
+    Each batch request personalises one group of up to REJECTION_GROUP_SIZE
+    candidates of one job. Items already in the checkpoint journal are left out.
+    """
+    groups = []
+    requests = {}
+    for n, indices in enumerate(_rejection_groups(items)):
+        group = [items[i] for i in indices]
+        emails, pending = _rejection_group(group)
+        custom_id = make_custom_id("rejection", group[0][1]["job_id"], n)
+        groups.append((custom_id, indices, group[0][1]["job_id"], emails, pending))
+        if pending:
+            contexts = {cid: context for cid, (_, context, _) in pending.items()}
+            requests[custom_id] = build_personalization_request(
+                build_personalization_prompt(contexts), len(contexts)
+            )
+
+    messages = run_message_batch(requests) if requests else {}
+
+    all_emails = [None] * len(items)
+    for custom_id, indices, job_id, emails, pending in groups:
+        paragraphs = None
+        message = messages.get(custom_id)
+        if pending:
+            call_metrics.record_batch("rejections", job_id, message.usage if message is not None else None)
+        if message is not None:
+            try:
+                paragraphs = _parse_json_response(message.content[0].text)
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"    [ERROR] Rejection personalization failed: {e}")
+        elif pending:
+            print("    [ERROR] Rejection personalization batch request did not succeed")
+        if pending:
+            emails = _finish_rejection_group(emails, pending, paragraphs)
+        for idx, email in zip(indices, emails):
+            all_emails[idx] = email
+    return all_emails
 
 
 # ---------------------------------------------------------------------------
@@ -230,25 +444,23 @@ def _parse_json_response(text: str) -> dict:
     raise ValueError(f"Could not parse JSON from response: {text[:200]}")
 
 
-def _find_salary_benchmark(job: dict, benchmarks: dict) -> str:
+def _find_salary_benchmark(job: dict, benchmarks: SalaryBenchmarks) -> str:
     """Look up salary benchmark for a job's position and level."""
-    # Try to match job title to benchmark position names
-    title_lower = job["title"].lower()
     level = job.get("level", "Mid-level")
 
     level_map = {"Senior": "Senior", "Mid-level": "Mid", "Junior": "Junior"}
     bench_level = level_map.get(level, "Mid")
 
-    for (position, blevel), data in benchmarks.items():
-        if position.lower() in title_lower or title_lower in position.lower():
-            if blevel == bench_level:
-                return (
-                    f"Position: {position} ({blevel})\n"
-                    f"Market Range: ${data['min']:,} - ${data['max']:,}\n"
-                    f"Median: ${data['median']:,}\n"
-                    f"Market Trend: {data['trend']}\n"
-                    f"Job Posting Range: {job.get('salary_range', 'N/A')}"
-                )
+    match = benchmarks.lookup(job["title"], bench_level)
+    if match:
+        position, blevel, data = match
+        return (
+            f"Position: {position} ({blevel})\n"
+            f"Market Range: ${data['min']:,} - ${data['max']:,}\n"
+            f"Median: ${data['median']:,}\n"
+            f"Market Trend: {data['trend']}\n"
+            f"Job Posting Range: {job.get('salary_range', 'N/A')}"
+        )
 
     return f"No exact benchmark match found. Job Posting Range: {job.get('salary_range', 'N/A')}"
 
@@ -294,22 +506,3 @@ def _fallback_profile(resume: dict, job: dict, evaluation: dict) -> dict:
         },
         "generation_note": "Fallback profile - API generation failed",
     }
-
-
-def _fallback_rejection_email(resume: dict, job: dict) -> str:
-    """Return a generic rejection email when API generation fails."""
-    first_name = resume["name"].split()[0]
-    return f"""Subject: Update on Your Application - {job['title']} Position
-
-Dear {first_name},
-
-Thank you for taking the time to apply for the {job['title']} position in our {job['department']} department. We appreciate your interest in joining our team.
-
-After careful consideration, we have decided to move forward with other candidates whose qualifications more closely align with our current needs for this role.
-
-We encourage you to continue developing your skills and to consider applying for future opportunities with us that may be a better match for your experience.
-
-We wish you all the best in your career journey.
-
-Warm regards,
-The Hiring Team"""
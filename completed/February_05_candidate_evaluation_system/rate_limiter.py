@@ -0,0 +1,45 @@
+"""
+Rate Limiter Module
+===================
+Thread-safe token bucket shared by every Claude API call site, replacing the
+fixed per-call sleep so concurrent workers stay inside the account rate limit.
+"""
+
+import threading
+import time
+
+from config import API_REQUESTS_PER_SECOND, API_BURST_SIZE
+
+
+class TokenBucket:
+    """Token bucket allowing `rate` calls per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+# Shared limiter for all API calls made by this process
+api_rate_limiter = TokenBucket(API_REQUESTS_PER_SECOND, API_BURST_SIZE)
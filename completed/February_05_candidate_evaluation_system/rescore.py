@@ -0,0 +1,114 @@
+"""
+Rescore Module
+==============
+Re-applies a (possibly changed) rubric and threshold to the raw
+per-criterion scores stored in a previous run's evaluation_report.json,
+without any Claude calls. Weighted scores and classifications for every
+stored evaluation are computed in one pass with score_matrix. Candidates
+are re-ranked, and the report and pipeline summary are regenerated along
+with a list of everyone whose classification changed.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from score_matrix import criterion_scores, weighted_scores, classify_matrix, rank_matrix, is_prescreened
+
+# Report fields that came out of raw_scores and are folded back in on load
+_RAW_SCORE_EXTRAS = ("skill_gaps", "nice_to_have_matches", "overall_impression")
+
+
+def load_report_evaluations(report_path: Path) -> dict:
+    """Rebuild {job_id: [evaluation, ...]} from a saved evaluation_report.json."""
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    all_evaluations = {}
+    for job_id, job_report in report["jobs"].items():
+        evaluations = []
+        for candidate in job_report["candidates"]:
+            raw_scores = dict(candidate["raw_scores"])
+            for key in _RAW_SCORE_EXTRAS:
+                raw_scores[key] = candidate.get(key, raw_scores.get(key))
+            evaluation = {
+                "name": candidate["name"],
+                "email": candidate["email"],
+                "raw_scores": raw_scores,
+                "weighted_score": candidate["weighted_score"],
+                "classification": candidate["classification"],
+                "rank": candidate["rank"],
+            }
+            if candidate.get("prescreen"):
+                evaluation["prescreen"] = candidate["prescreen"]
+            elif candidate.get("prescreened"):
+                # Reports written before the prescreen details were stored
+                evaluation["prescreen"] = {"similarity": None, "estimated_cost_saved_usd": 0.0}
+            evaluations.append(evaluation)
+        all_evaluations[job_id] = evaluations
+    return all_evaluations
+
+
+def rescore_evaluations(all_evaluations: dict, rubric: list[dict], threshold: float) -> dict:
+    """
+    Return new, re-ranked evaluations under `rubric` and `threshold`.
+
+    Pre-screened pairs were never assessed by Claude, so they stay not_selected.
+    """
+    flat = [ev for evaluations in all_evaluations.values() for ev in evaluations]
+    prescreened = np.array([is_prescreened(ev) for ev in flat], dtype=bool)
+    weighted = weighted_scores(criterion_scores(flat), rubric)
+    selected = classify_matrix(weighted, threshold, prescreened)
+
+    rescored = {}
+    start = 0
+    for job_id, evaluations in all_evaluations.items():
+        end = start + len(evaluations)
+        # Score ties keep their previous relative order
+        previous_order = np.argsort([ev.get("rank", 0) for ev in evaluations], kind="stable")
+        positions = np.empty(len(evaluations), dtype=np.int64)
+        positions[previous_order] = np.arange(len(evaluations))
+        ranks = rank_matrix(
+            weighted[start:end, None], positions[:, None], prescreened[start:end, None],
+        )[:, 0].tolist()
+
+        updated = []
+        for ev, score, is_top, rank in zip(
+            evaluations, weighted[start:end].tolist(), selected[start:end].tolist(), ranks,
+        ):
+            updated.append({
+                **ev,
+                "weighted_score": score,
+                "classification": "top_candidate" if is_top else "not_selected",
+                "rank": rank,
+                "previous": {
+                    "weighted_score": ev["weighted_score"],
+                    "classification": ev["classification"],
+                    "rank": ev.get("rank", 0),
+                },
+            })
+        updated.sort(key=lambda e: e["rank"])
+        rescored[job_id] = updated
+        start = end
+    return rescored
+
+
+def classification_changes(rescored: dict) -> list[dict]:
+    """List every candidate whose classification changed, per job in rank order."""
+    changes = []
+    for job_id, evaluations in rescored.items():
+        for ev in evaluations:
+            before = ev["previous"]
+            if before["classification"] != ev["classification"]:
+                changes.append({
+                    "job_id": job_id,
+                    "name": ev["name"],
+                    "from": before["classification"],
+                    "to": ev["classification"],
+                    "old_score": before["weighted_score"],
+                    "new_score": ev["weighted_score"],
+                    "old_rank": before["rank"],
+                    "new_rank": ev["rank"],
+                })
+    return changes
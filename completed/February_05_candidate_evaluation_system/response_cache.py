@@ -0,0 +1,136 @@
+"""
+Response Cache Module
+=====================
+Persistent SQLite cache for parsed Claude scoring responses. Entries are
+content-addressed by a hash of model name, prompt and rubric version, so a
+re-run only pays for (resume, job) pairs whose inputs actually changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_TTL_DAYS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+)
+
+
+def make_cache_key(model: str, prompt: str, rubric_version: str) -> str:
+    """Return a stable SHA-256 key for a (model, prompt, rubric version) triple."""
+    digest = hashlib.sha256()
+    for part in (model, rubric_version, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed key/value cache with TTL and max-entry (LRU) eviction."""
+
+    def __init__(self, path: Path, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value):
+        """Store a JSON-serialisable value and evict expired/overflow entries."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+        self.evictions += expired + max(overflow, 0)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current entry count."""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+
+# Shared cache for scoring responses
+scoring_cache = ResponseCache(
+    RESPONSE_CACHE_PATH,
+    ttl_seconds=RESPONSE_CACHE_TTL_DAYS * 86400,
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    enabled=RESPONSE_CACHE_ENABLED,
+)
@@ -0,0 +1,159 @@
+"""
+Results Store Module
+====================
+Append-only SQLite history of evaluation results. Every pipeline run adds
+one row per (candidate, job) evaluation with flat, typed columns (scores,
+classification, job metadata, run date) and never rewrites earlier runs, so
+cross-run questions such as "all candidates above 4.0 for any Data role in
+the last 90 days" are a single indexed query instead of a scan of old JSON
+reports.
+
+Usage:
+    python results_store.py --min-score 4.0 --title Data --days 90
+"""
+
+import argparse
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import CRITERIA_KEY_MAP, RESULTS_STORE_PATH
+
+CRITERIA_COLUMNS = list(CRITERIA_KEY_MAP.values())
+
+_COLUMNS = [
+    ("run_id", "TEXT NOT NULL"),
+    ("run_at", "TEXT NOT NULL"),
+    ("run_date", "TEXT NOT NULL"),
+    ("job_id", "TEXT NOT NULL"),
+    ("job_title", "TEXT"),
+    ("department", "TEXT"),
+    ("level", "TEXT"),
+    ("candidate_name", "TEXT"),
+    ("candidate_email", "TEXT"),
+    ("weighted_score", "REAL"),
+    ("classification", "TEXT"),
+    ("rank", "INTEGER"),
+    ("threshold", "REAL"),
+    ("prescreened", "INTEGER"),
+] + [(key, "INTEGER") for key in CRITERIA_COLUMNS]
+
+_INDEXES = {
+    "idx_evaluations_job": "job_id",
+    "idx_evaluations_email": "candidate_email",
+    "idx_evaluations_score": "weighted_score",
+    "idx_evaluations_run_date": "run_date",
+}
+
+
+class ResultsStore:
+    """SQLite-backed append-only table of evaluation results across runs."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            columns = ", ".join(f"{name} {sql_type}" for name, sql_type in _COLUMNS)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS evaluations ({columns})")
+            for index_name, column in _INDEXES.items():
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON evaluations({column})")
+            self._conn.commit()
+        return self._conn
+
+    def append_run(self, all_evaluations: dict, jobs: list[dict], threshold: float) -> str:
+        """Append every evaluation of one run in a single transaction; returns the run id."""
+        run_at = datetime.now()
+        run_id = f"{run_at:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        jobs_by_id = {job["job_id"]: job for job in jobs}
+
+        rows = []
+        for job_id, evaluations in all_evaluations.items():
+            job = jobs_by_id.get(job_id, {})
+            for ev in evaluations:
+                raw = ev["raw_scores"]
+                rows.append((
+                    run_id, run_at.isoformat(), run_at.date().isoformat(),
+                    job_id, job.get("title"), job.get("department"), job.get("level"),
+                    ev["name"], (ev.get("email") or "").lower(),
+                    ev["weighted_score"], ev["classification"], ev.get("rank", 0), threshold,
+                    int("prescreen" in ev),
+                ) + tuple(
+                    raw[key]["score"] if isinstance(raw.get(key), dict) else None
+                    for key in CRITERIA_COLUMNS
+                ))
+
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(f"INSERT INTO evaluations VALUES ({placeholders})", rows)
+            conn.commit()
+        return run_id
+
+    def query(
+        self,
+        min_score: float = None,
+        title_contains: str = None,
+        since_days: int = None,
+        job_id: str = None,
+        email: str = None,
+        classification: str = None,
+    ) -> list[dict]:
+        """Return matching rows across all runs, best score first."""
+        clauses, params = [], []
+        if min_score is not None:
+            clauses.append("weighted_score >= ?")
+            params.append(min_score)
+        if title_contains:
+            clauses.append("job_title LIKE ?")
+            params.append(f"%{title_contains}%")
+        if since_days is not None:
+            clauses.append("run_date >= ?")
+            params.append((datetime.now().date() - timedelta(days=since_days)).isoformat())
+        if job_id:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        if email:
+            clauses.append("candidate_email = ?")
+            params.append(email.lower())
+        if classification:
+            clauses.append("classification = ?")
+            params.append(classification)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT * FROM evaluations {where} ORDER BY weighted_score DESC, run_at DESC", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+# Shared store for evaluation history
+results_store = ResultsStore(RESULTS_STORE_PATH)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query evaluation results across runs")
+    parser.add_argument("--min-score", type=float, help="Minimum weighted score")
+    parser.add_argument("--title", type=str, help="Job title contains (e.g. Data)")
+    parser.add_argument("--days", type=int, help="Only runs from the last N days")
+    parser.add_argument("--job", type=str, help="Job ID")
+    parser.add_argument("--email", type=str, help="Candidate email")
+    parser.add_argument("--top-only", action="store_true", help="Only top_candidate classifications")
+    args = parser.parse_args()
+
+    rows = results_store.query(
+        min_score=args.min_score, title_contains=args.title, since_days=args.days,
+        job_id=args.job, email=args.email, classification="top_candidate" if args.top_only else None,
+    )
+    print(f"{len(rows)} matching evaluation(s)")
+    for r in rows:
+        print(f"  {r['run_date']}  {r['job_id']}  {r['job_title'] or '':<28s}  "
+              f"{r['candidate_name']:<25s}  {r['weighted_score']:.2f}  {r['classification']}")
@@ -5,23 +5,119 @@ Extracts and structures candidate data from .txt (and optionally PDF) resume fil
 """
 
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-
-from config import SAMPLE_RESUMES_PATH, ADDITIONAL_RESUMES_PATH
+from typing import Iterable, Iterator
+
+from config import (
+    SAMPLE_RESUMES_PATH, ADDITIONAL_RESUMES_PATH, RESUME_READ_CHUNK_CHARS,
+    PARSE_WORKERS, PARSE_BLOCKS_PER_TASK,
+)
+
+# --- Patterns compiled once at import ---
+RESUME_DELIMITER = re.compile(r"\n-{3,}\n")
+
+# Contact fields: resume key -> pattern for "Label: value"
+CONTACT_PATTERNS = {
+    "name": re.compile(r"Name:\s*(.+)"),
+    "email": re.compile(r"Email:\s*(.+)"),
+    "phone": re.compile(r"Phone:\s*(.+)"),
+}
+
+# Section headers: "EXPERIENCE:" opens a section; "\nEDUCATION:" (on its own line) closes the previous one
+SECTION_START_PATTERNS = {
+    name: re.compile(rf"{name}:\s*\n") for name in ("EXPERIENCE", "EDUCATION", "SKILLS")
+}
+SECTION_END_PATTERNS = {
+    name: re.compile(rf"\n{name}:\s*\n") for name in ("EDUCATION", "SKILLS")
+}
+
+# Experience entry lines like: "Senior Software Developer, TechCorp (2020-2024)"
+EXPERIENCE_HEADER_PATTERN = re.compile(r"^(.+?),\s*(.+?)\s*\((\d{4})\s*-\s*(\d{4})\)", re.MULTILINE)
+
+
+def iter_resume_blocks(file_path: Path, chunk_chars: int = RESUME_READ_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Yield raw resume text blocks from a '---'-delimited file, reading in chunks.
+
+    Only the current chunk plus the unfinished trailing block is held by the
+    reader, so reading a large dump does not load the whole file. Parsed
+    resumes are still kept by the caller (see run_streaming_evaluations).
+    """
+    buffer = ""
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                break
+            buffer += chunk
+            last_end = 0
+            for match in RESUME_DELIMITER.finditer(buffer):
+                yield buffer[last_end : match.start()]
+                last_end = match.end()
+            buffer = buffer[last_end:]
+    yield buffer
+
+
+def iter_resumes_from_txt(
+    file_path: Path, chunk_chars: int = RESUME_READ_CHUNK_CHARS, workers: int = PARSE_WORKERS,
+) -> Iterator[dict]:
+    """
+    Stream parsed resumes one at a time from a '---'-delimited .txt file.
+
+    With workers > 1, blocks are parsed in a process pool (see
+    iter_parsed_blocks_parallel); output order is unchanged.
+    """
+    blocks = iter_resume_blocks(file_path, chunk_chars)
+    if workers > 1:
+        yield from iter_parsed_blocks_parallel(blocks, workers)
+        return
+    for block in blocks:
+        yield from parse_resume_blocks([block])
+
+
+def load_resumes_from_txt(file_path: Path, workers: int = PARSE_WORKERS) -> list[dict]:
+    """Read a .txt file containing multiple resumes separated by '---'."""
+    return list(iter_resumes_from_txt(file_path, workers=workers))
 
 
-def load_resumes_from_txt(file_path: Path) -> list[dict]:
-    """Read a .txt file containing multiple resumes separated by '---'."""
-    text = file_path.read_text(encoding="utf-8")
-    raw_blocks = re.split(r"\n-{3,}\n", text)
-    resumes = []
-    for block in raw_blocks:
+def parse_resume_blocks(blocks: list[str]) -> list[dict]:
+    """Parse a list of raw blocks, dropping empty blocks and ones without a name."""
+    parsed_resumes = []
+    for block in blocks:
         block = block.strip()
         if block:
             parsed = parse_single_resume(block)
             if parsed["name"]:
-                resumes.append(parsed)
-    return resumes
+                parsed_resumes.append(parsed)
+    return parsed_resumes
+
+
+def iter_parsed_blocks_parallel(
+    blocks: Iterable[str], workers: int, blocks_per_task: int = PARSE_BLOCKS_PER_TASK,
+) -> Iterator[dict]:
+    """
+    Parse resume blocks across `workers` processes, yielding results in input order.
+
+    Blocks are shipped in tasks of `blocks_per_task` so pickling/IPC overhead
+    is paid per task rather than per resume, and at most 2 tasks per worker
+    are in flight so parsing never runs far ahead of the consumer.
+    """
+    blocks = iter(blocks)
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            task = list(islice(blocks, blocks_per_task))
+            if not task:
+                break
+            pending.append(pool.submit(parse_resume_blocks, task))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
 def parse_single_resume(raw_text: str) -> dict:
@@ -37,18 +133,11 @@ def parse_single_resume(raw_text: str) -> dict:
         "total_years_experience": 0,
     }
 
-    # --- Contact info ---
-    name_match = re.search(r"Name:\s*(.+)", raw_text)
-    if name_match:
-        resume["name"] = name_match.group(1).strip()
-
-    email_match = re.search(r"Email:\s*(.+)", raw_text)
-    if email_match:
-        resume["email"] = email_match.group(1).strip()
-
-    phone_match = re.search(r"Phone:\s*(.+)", raw_text)
-    if phone_match:
-        resume["phone"] = phone_match.group(1).strip()
+    # --- Contact fields ---
+    for key, pattern in CONTACT_PATTERNS.items():
+        match = pattern.search(raw_text)
+        if match:
+            resume[key] = match.group(1).strip()
 
     # --- Section splitting ---
     experience_text = _extract_section(raw_text, "EXPERIENCE", "EDUCATION")
@@ -78,19 +167,17 @@ def parse_single_resume(raw_text: str) -> dict:
 
 
 def _extract_section(text: str, start_header: str, end_header: str | None) -> str:
-    """Extract text between two section headers."""
-    pattern_start = rf"{start_header}:\s*\n"
-    match_start = re.search(pattern_start, text)
-    if not match_start:
+    """Extract text between two section headers, searching in place without slicing."""
+    start_match = SECTION_START_PATTERNS[start_header].search(text)
+    if not start_match:
         return ""
 
-    start_pos = match_start.end()
+    start_pos = start_match.end()
 
     if end_header:
-        pattern_end = rf"\n{end_header}:\s*\n"
-        match_end = re.search(pattern_end, text[start_pos:])
-        if match_end:
-            return text[start_pos : start_pos + match_end.start()]
+        end_match = SECTION_END_PATTERNS[end_header].search(text, start_pos)
+        if end_match:
+            return text[start_pos : end_match.start()]
 
     return text[start_pos:]
 
@@ -98,12 +185,7 @@ def _extract_section(text: str, start_header: str, end_header: str | None) -> st
 def _parse_experience(exp_text: str) -> list[dict]:
     """Parse experience section into structured entries."""
     entries = []
-    # Match lines like: "Senior Software Developer, TechCorp (2020-2024)"
-    header_pattern = re.compile(
-        r"^(.+?),\s*(.+?)\s*\((\d{4})\s*-\s*(\d{4})\)", re.MULTILINE
-    )
-
-    headers = list(header_pattern.finditer(exp_text))
+    headers = list(EXPERIENCE_HEADER_PATTERN.finditer(exp_text))
 
     for i, match in enumerate(headers):
         title = match.group(1).strip()
@@ -140,17 +222,16 @@ def _calculate_total_years(entries: list[dict]) -> int:
     return sum(entry["duration"] for entry in entries)
 
 
-def load_all_resumes() -> list[dict]:
-    """Load and parse resumes from both resume files."""
-    resumes = []
-
-    if SAMPLE_RESUMES_PATH.exists():
-        resumes.extend(load_resumes_from_txt(SAMPLE_RESUMES_PATH))
+def iter_all_resumes(workers: int = PARSE_WORKERS) -> Iterator[dict]:
+    """Stream parsed resumes from both resume files, in file order."""
+    for path in (SAMPLE_RESUMES_PATH, ADDITIONAL_RESUMES_PATH):
+        if path.exists():
+            yield from iter_resumes_from_txt(path, workers=workers)
 
-    if ADDITIONAL_RESUMES_PATH.exists():
-        resumes.extend(load_resumes_from_txt(ADDITIONAL_RESUMES_PATH))
 
-    return resumes
+def load_all_resumes(workers: int = PARSE_WORKERS) -> list[dict]:
+    """Load and parse resumes from both resume files."""
+    return list(iter_all_resumes(workers))
 
 
 def load_resume_from_pdf(file_path: Path) -> dict | None:
@@ -0,0 +1,181 @@
+"""
+Score Matrix Module
+===================
+Vectorised weighted scoring over every stored evaluation at once. Raw
+criterion scores are stacked into a dense (candidates x jobs x criteria)
+NumPy array; weighted scores, classification, ranks and what-if sweeps over
+alternative rubric weights or thresholds are then array operations rather
+than walks over the nested evaluation dicts. rescore uses it to re-weight a
+stored run.
+
+Rubrics become a (rubrics x criteria) weight matrix, so every weighted score
+for every rubric is one `scores @ weights.T`. Pre-screened pairs were never
+assessed by Claude: they are never top candidates and rank after every
+LLM-scored pair, as in scoring_engine.
+"""
+
+import json
+
+import numpy as np
+
+from config import CRITERIA_KEY_MAP, OUTPUT_DIR, TOP_CANDIDATE_SCORE_THRESHOLD
+
+CRITERIA_KEYS = list(CRITERIA_KEY_MAP.values())
+
+
+def candidate_id(evaluation: dict) -> str:
+    """Identify a candidate across jobs by email, falling back to name."""
+    return (evaluation.get("email") or evaluation["name"]).strip().lower()
+
+
+def is_prescreened(evaluation: dict) -> bool:
+    """True for a pre-screened pair; report candidates carry prescreen=None when scored."""
+    return bool(evaluation.get("prescreen") or evaluation.get("prescreened"))
+
+
+def criterion_scores(evaluations: list[dict]) -> np.ndarray:
+    """Raw criterion scores as float64 (evaluations x criteria); a missing criterion is 0."""
+    return np.array([
+        [ev["raw_scores"][key]["score"] if isinstance(ev["raw_scores"].get(key), dict) else 0.0
+         for key in CRITERIA_KEYS]
+        for ev in evaluations
+    ], dtype=np.float64).reshape(len(evaluations), len(CRITERIA_KEYS))
+
+
+def build_score_matrix(all_evaluations: dict) -> dict:
+    """
+    Stack raw criterion scores from {job_id: [evaluation, ...]} into one array.
+
+    Works on pipeline evaluations and on evaluation_report.json candidates
+    alike. Returns {"candidates", "names", "job_ids", "criteria", "scores",
+    "positions", "prescreened"}:
+      scores     float64 (candidates x jobs x criteria). A missing criterion
+                 is 0 (it adds nothing, as in compute_weighted_score) and a
+                 pair that was never evaluated is NaN.
+      positions  int64 (candidates x jobs), each pair's index in its job's
+                 list, used to break ties the way rank_candidates_for_job does.
+      prescreened bool (candidates x jobs), True for pre-screened pairs.
+    """
+    job_ids = list(all_evaluations)
+    index = {}
+    names = []
+    cells = []
+    evaluations = []
+    for j, job_id in enumerate(job_ids):
+        for position, ev in enumerate(all_evaluations[job_id]):
+            row = index.setdefault(candidate_id(ev), len(index))
+            if row == len(names):
+                names.append(ev["name"])
+            cells.append((row, j, position, is_prescreened(ev)))
+            evaluations.append(ev)
+
+    scores = np.full((len(index), len(job_ids), len(CRITERIA_KEYS)), np.nan)
+    positions = np.zeros((len(index), len(job_ids)), dtype=np.int64)
+    prescreened = np.zeros((len(index), len(job_ids)), dtype=bool)
+    if cells:
+        rows, cols, pair_positions, screened = (list(c) for c in zip(*cells))
+        scores[rows, cols] = criterion_scores(evaluations)
+        positions[rows, cols] = pair_positions
+        prescreened[rows, cols] = screened
+    return {
+        "candidates": list(index),
+        "names": names,
+        "job_ids": job_ids,
+        "criteria": CRITERIA_KEYS,
+        "scores": scores,
+        "positions": positions,
+        "prescreened": prescreened,
+    }
+
+
+def weight_matrix(rubrics: list[list[dict]]) -> np.ndarray:
+    """Rubric weights as float64 (rubrics x criteria); criteria a rubric leaves out weigh 0."""
+    weights = np.zeros((len(rubrics), len(CRITERIA_KEYS)))
+    for r, rubric in enumerate(rubrics):
+        for entry in rubric:
+            key = CRITERIA_KEY_MAP.get(entry["criteria"])
+            if key:
+                weights[r, CRITERIA_KEYS.index(key)] += entry["weight"]
+    return weights
+
+
+def weighted_scores(scores: np.ndarray, rubrics: list[dict] | list[list[dict]]) -> np.ndarray:
+    """
+    Reported (2-decimal) weighted score for every scored pair: `scores @ weights.T`.
+
+    `scores` is (..., criteria), e.g. (candidates x jobs x criteria) from
+    build_score_matrix or (evaluations x criteria) from criterion_scores.
+    `rubrics` is one rubric -> (...), or a list of alternative rubrics for a
+    what-if sweep -> (rubrics x ...). Unevaluated (NaN) pairs stay NaN.
+
+    Rounding to the reported 2 decimals absorbs the float summation-order
+    differences from compute_weighted_score, so threshold decisions agree
+    with build_evaluation.
+    """
+    single = bool(rubrics) and isinstance(rubrics[0], dict)
+    totals = np.round(scores @ weight_matrix([rubrics] if single else rubrics).T, 2)
+    return totals[..., 0] if single else np.moveaxis(totals, -1, 0)
+
+
+def classify_matrix(
+    weighted: np.ndarray, thresholds=TOP_CANDIDATE_SCORE_THRESHOLD, prescreened: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Boolean top-candidate mask (weighted >= threshold, as classify_candidate).
+
+    A scalar threshold keeps the shape of `weighted`; an array of thresholds
+    adds a leading axis for a threshold sweep. Unevaluated (NaN) pairs and
+    `prescreened` pairs are False.
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    selected = weighted >= thresholds.reshape(thresholds.shape + (1,) * weighted.ndim)
+    return selected if prescreened is None else selected & ~prescreened
+
+
+def rank_matrix(weighted: np.ndarray, positions: np.ndarray = None, prescreened: np.ndarray = None) -> np.ndarray:
+    """
+    1-based rank of each candidate within each job (axis -2 is candidates).
+
+    Candidates are ordered by their 2-decimal reported score, ties broken by
+    `positions` (default: candidate order), with `prescreened` pairs after
+    every LLM-scored one, as in rank_candidates_for_job. Unevaluated pairs
+    rank after everyone else and are returned as 0.
+    """
+    n_candidates = weighted.shape[-2]
+    if positions is None:
+        positions = np.arange(n_candidates).reshape(-1, 1)
+    missing = np.isnan(weighted)
+    # Scores have two decimals (at most 500 hundredths), so (tier, -score in
+    # hundredths, position) packs into one int64 key; tiers are 1000 apart
+    hundredths = np.rint(np.where(missing, 0.0, weighted) * 100).astype(np.int64)
+    tier = np.where(missing, 2, 0 if prescreened is None else prescreened.astype(np.int64))
+    order = np.argsort((tier * 1000 - hundredths) * n_candidates + positions, axis=-2, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, n_candidates + 1).reshape(-1, 1), axis=-2)
+    return np.where(missing, 0, ranks)
+
+
+def top_counts(
+    weighted: np.ndarray, thresholds=TOP_CANDIDATE_SCORE_THRESHOLD, prescreened: np.ndarray = None,
+) -> np.ndarray:
+    """Number of top candidates per job (summed over the candidate axis) for each threshold."""
+    return classify_matrix(weighted, thresholds, prescreened).sum(axis=-2)
+
+
+if __name__ == "__main__":
+    report_path = OUTPUT_DIR / "evaluation_report.json"
+    with open(report_path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+
+    from job_matcher import load_scoring_rubric
+
+    matrix = build_score_matrix({job_id: data["candidates"] for job_id, data in report["jobs"].items()})
+    weighted = weighted_scores(matrix["scores"], load_scoring_rubric())
+    thresholds = np.arange(3.0, 4.51, 0.25)
+    counts = top_counts(weighted, thresholds, matrix["prescreened"])
+
+    print(f"{len(matrix['candidates'])} candidates x {len(matrix['job_ids'])} jobs\n")
+    print("Top candidates per job by threshold:")
+    print(f"  {'Threshold':>9}  " + "  ".join(f"{job_id:>6}" for job_id in matrix["job_ids"]))
+    for t, row in zip(thresholds, counts):
+        print(f"  {t:>9.2f}  " + "  ".join(f"{n:>6d}" for n in row))
@@ -4,9 +4,10 @@ Scoring Engine Module
 Applies rubric weights, computes final scores, ranks candidates, and classifies them.
 """
 
+import bisect
 from datetime import datetime
 
-from config import CRITERIA_KEY_MAP, TOP_CANDIDATE_SCORE_THRESHOLD
+from config import CRITERIA_KEY_MAP, TOP_CANDIDATE_SCORE_THRESHOLD, SHORTLIST_STABLE_AFTER
 
 
 def compute_weighted_score(raw_scores: dict, rubric: list[dict]) -> float:
@@ -25,19 +26,139 @@ def classify_candidate(weighted_score: float, threshold: float = TOP_CANDIDATE_S
     return "top_candidate" if weighted_score >= threshold else "not_selected"
 
 
+def build_evaluation(resume: dict, raw_scores: dict, rubric: list[dict]) -> dict:
+    """Build the evaluation record for a resume from its raw criterion scores."""
+    # Classify the reported score, so a pair shown as exactly the threshold is
+    # selected whatever the float summation order (see score_matrix.weighted_scores)
+    weighted = round(compute_weighted_score(raw_scores, rubric), 2)
+    return {
+        "name": resume["name"],
+        "email": resume["email"],
+        "raw_scores": raw_scores,
+        "weighted_score": weighted,
+        "classification": classify_candidate(weighted),
+        "resume": resume,
+    }
+
+
+def ranking_key(evaluation: dict) -> tuple:
+    """
+    Sort key, best first. Pre-screened pairs were never assessed by Claude,
+    so they rank after every LLM-scored evaluation whatever their local score.
+    """
+    return ("prescreen" in evaluation, -evaluation["weighted_score"])
+
+
 def rank_candidates_for_job(evaluations: list[dict]) -> list[dict]:
-    """Sort evaluations by weighted_score descending and add rank field."""
-    sorted_evals = sorted(evaluations, key=lambda e: e["weighted_score"], reverse=True)
+    """Sort evaluations best first (see ranking_key) and add rank field."""
+    sorted_evals = sorted(evaluations, key=ranking_key)
     for i, ev in enumerate(sorted_evals, start=1):
         ev["rank"] = i
     return sorted_evals
 
 
-def build_evaluation_report(all_evaluations: dict, jobs: list[dict] = None) -> dict:
+class IncrementalRanking:
+    """
+    One job's ranking, kept sorted as evaluations arrive.
+
+    Each evaluation is inserted at (ranking_key, position) with bisect,
+    which is the same order rank_candidates_for_job produces when `position`
+    is the resume index, so the final ranking needs no sort. After every
+    insert the top `k` is checked and `on_shortlist(snapshot)` is called
+    whenever a new shortlist is worth publishing:
+      - provisional, once top-k membership has not changed for
+        `stable_after` consecutive arrivals and the top k are all
+        LLM-scored (pre-screened pairs never make a provisional shortlist);
+      - final, once all `total` evaluations are in.
+    Evaluations known before scoring starts (pre-screened or restored from
+    the journal) go in with seed(), which does not count as an arrival.
+    """
+
+    def __init__(
+        self, job_id: str, total: int, k: int = 0,
+        stable_after: int = SHORTLIST_STABLE_AFTER, on_shortlist=None,
+    ):
+        self.job_id = job_id
+        self.total = total
+        self.k = k
+        self.stable_after = stable_after
+        self.on_shortlist = on_shortlist
+        self._keys = []
+        self._evaluations = []
+        self._top_members = ()
+        self._unchanged = 0
+        self._emitted_members = None
+
+    @property
+    def scored(self) -> int:
+        return len(self._evaluations)
+
+    def _insert(self, evaluation: dict, position: int):
+        key = ranking_key(evaluation) + (position,)
+        i = bisect.bisect(self._keys, key)
+        self._keys.insert(i, key)
+        self._evaluations.insert(i, evaluation)
+
+    def seed(self, evaluation: dict, position: int):
+        """Insert an evaluation that was not scored in this run; only a completed ranking is published."""
+        self._insert(evaluation, position)
+        if self.k and self.scored >= self.total and self.on_shortlist:
+            self._emitted_members = tuple(key[-1] for key in self._keys[: self.k])
+            self.on_shortlist(self.shortlist(final=True))
+
+    def add(self, evaluation: dict, position: int):
+        """Insert one newly scored evaluation and publish the shortlist if it has become stable."""
+        self._insert(evaluation, position)
+
+        if not self.k:
+            return
+        members = tuple(key[-1] for key in self._keys[: self.k])
+        self._unchanged = self._unchanged + 1 if members == self._top_members else 0
+        self._top_members = members
+
+        final = self.scored >= self.total
+        llm_scored = sum(not key[0] for key in self._keys[: self.k])
+        stable = llm_scored >= self.k and self._unchanged >= self.stable_after
+        if (final or stable) and self.on_shortlist and (final or members != self._emitted_members):
+            self._emitted_members = members
+            self.on_shortlist(self.shortlist(final))
+
+    def ranked(self) -> list[dict]:
+        """Return all evaluations best-first with their rank field set."""
+        for i, ev in enumerate(self._evaluations, start=1):
+            ev["rank"] = i
+        return list(self._evaluations)
+
+    def shortlist(self, final: bool = False) -> dict:
+        """Snapshot of the current top-k, safe to serialise as JSON."""
+        return {
+            "job_id": self.job_id,
+            "generated_at": datetime.now().isoformat(),
+            "final": final,
+            "scored": self.scored,
+            "total": self.total,
+            "k": self.k,
+            "threshold": TOP_CANDIDATE_SCORE_THRESHOLD,
+            "candidates": [
+                {
+                    "rank": i,
+                    "name": ev["name"],
+                    "email": ev["email"],
+                    "weighted_score": ev["weighted_score"],
+                    "classification": ev["classification"],
+                }
+                for i, ev in enumerate(self._evaluations[: self.k], start=1)
+            ],
+        }
+
+
+def build_evaluation_report(
+    all_evaluations: dict, jobs: list[dict] = None, threshold: float = TOP_CANDIDATE_SCORE_THRESHOLD
+) -> dict:
     """Structure all results into a comprehensive JSON report."""
     report = {
         "generated_at": datetime.now().isoformat(),
-        "threshold": TOP_CANDIDATE_SCORE_THRESHOLD,
+        "threshold": threshold,
         "jobs": {},
     }
 
@@ -61,8 +182,13 @@ def build_evaluation_report(all_evaluations: dict, jobs: list[dict] = None) -> d
                     "raw_scores": {
                         k: v
                         for k, v in ev["raw_scores"].items()
-                        if k not in ("skill_gaps", "nice_to_have_matches", "overall_impression", "parse_error")
+                        if k not in (
+                            "skill_gaps", "nice_to_have_matches", "overall_impression",
+                            "parse_error", "prescreened",
+                        )
                     },
+                    "prescreened": "prescreen" in ev,
+                    "prescreen": ev.get("prescreen"),
                     "skill_gaps": ev["raw_scores"].get("skill_gaps", []),
                     "nice_to_have_matches": ev["raw_scores"].get("nice_to_have_matches", []),
                     "overall_impression": ev["raw_scores"].get("overall_impression", ""),
@@ -81,17 +207,21 @@ def build_evaluation_report(all_evaluations: dict, jobs: list[dict] = None) -> d
     return report
 
 
-def build_pipeline_summary(all_evaluations: dict, jobs: list[dict]) -> str:
+def build_pipeline_summary(
+    all_evaluations: dict, jobs: list[dict], threshold: float = TOP_CANDIDATE_SCORE_THRESHOLD
+) -> str:
     """Generate a human-readable text summary of the pipeline results."""
     lines = []
     lines.append("=" * 70)
     lines.append("CANDIDATE EVALUATION PIPELINE - SUMMARY REPORT")
     lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"Score Threshold for Interview: {TOP_CANDIDATE_SCORE_THRESHOLD} / 5.0")
+    lines.append(f"Score Threshold for Interview: {threshold} / 5.0")
     lines.append("=" * 70)
 
     total_top = 0
     total_evaluated = 0
+    total_prescreened = 0
+    total_cost_saved = 0.0
 
     for job in jobs:
         job_id = job["job_id"]
@@ -99,8 +229,12 @@ def build_pipeline_summary(all_evaluations: dict, jobs: list[dict]) -> str:
         top = [e for e in evals if e["classification"] == "top_candidate"]
         rejected = [e for e in evals if e["classification"] == "not_selected"]
 
+        prescreened = [e for e in evals if "prescreen" in e]
+
         total_top += len(top)
         total_evaluated += len(evals)
+        total_prescreened += len(prescreened)
+        total_cost_saved += sum(e["prescreen"]["estimated_cost_saved_usd"] for e in prescreened)
 
         lines.append(f"\n{'-' * 70}")
         lines.append(f"JOB: {job['title']} ({job_id})")
@@ -108,6 +242,8 @@ def build_pipeline_summary(all_evaluations: dict, jobs: list[dict]) -> str:
         lines.append(f"Salary Range: {job['salary_range']}")
         lines.append(f"Candidates Evaluated: {len(evals)}")
         lines.append(f"Top Candidates: {len(top)} | Not Selected: {len(rejected)}")
+        if prescreened:
+            lines.append(f"Pre-screened Out (no LLM call): {len(prescreened)}")
         lines.append("")
 
         if top:
@@ -133,6 +269,9 @@ def build_pipeline_summary(all_evaluations: dict, jobs: list[dict]) -> str:
     lines.append(f"  Total Evaluations: {total_evaluated}")
     lines.append(f"  Total Top Candidates: {total_top}")
     lines.append(f"  Total Rejections: {total_evaluated - total_top}")
+    if total_prescreened:
+        lines.append(f"  Pairs Skipped by Local Pre-screen: {total_prescreened}")
+        lines.append(f"  Estimated API Cost Saved: ${total_cost_saved:,.2f}")
     lines.append("=" * 70)
 
     return "\n".join(lines)
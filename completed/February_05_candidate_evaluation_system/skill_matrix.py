@@ -0,0 +1,91 @@
+"""
+Skill Matrix Module
+===================
+Vectorised resume x job skill matching. All job `technical_skills` and
+`nice_to_have` entries form a shared vocabulary; resume skill lists and job
+skill lists are encoded as bit-packed NumPy rows over that vocabulary, and the
+full overlap/coverage matrices are computed with array operations instead of a
+Python double loop.
+
+Resume skills that no job asks for cannot affect any overlap, so they are left
+out of the vocabulary; this keeps rows short even for very large resume sets.
+"""
+
+import numpy as np
+
+# Set bits per byte value, for popcount over packed rows
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Resumes processed per block when intersecting, to bound peak memory
+_ROW_BLOCK = 4096
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace so skill names compare consistently."""
+    return " ".join(skill.lower().split())
+
+
+def build_vocabulary(jobs: list[dict]) -> dict:
+    """Map every normalised job skill (required and nice-to-have) to a column index."""
+    vocabulary = {}
+    for job in jobs:
+        for skill in job["requirements"]["technical_skills"] + job.get("nice_to_have", []):
+            vocabulary.setdefault(normalize_skill(skill), len(vocabulary))
+    return vocabulary
+
+
+def encode_skill_lists(skill_lists: list[list[str]], vocabulary: dict) -> np.ndarray:
+    """Encode skill lists as bit-packed rows (uint8, one bit per vocabulary entry)."""
+    dense = np.zeros((len(skill_lists), max(len(vocabulary), 1)), dtype=bool)
+    rows, cols = [], []
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            col = vocabulary.get(normalize_skill(skill))
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    dense[rows, cols] = True
+    return np.packbits(dense, axis=1)
+
+
+def _overlap_counts(resume_bits: np.ndarray, job_bits: np.ndarray) -> np.ndarray:
+    """Popcount of (resume AND job) for every pair -> int32 array (resumes x jobs)."""
+    counts = np.empty((resume_bits.shape[0], job_bits.shape[0]), dtype=np.int32)
+    for start in range(0, resume_bits.shape[0], _ROW_BLOCK):
+        block = resume_bits[start : start + _ROW_BLOCK]
+        shared = np.bitwise_and(block[:, None, :], job_bits[None, :, :])
+        counts[start : start + _ROW_BLOCK] = _POPCOUNT[shared].sum(axis=2, dtype=np.int32)
+    return counts
+
+
+def compute_skill_match(resumes: list[dict], jobs: list[dict]) -> dict:
+    """
+    Compute resume x job skill overlap and coverage matrices in one pass.
+
+    Returns a dict with the vocabulary (column order), `required_overlap` and
+    `nice_overlap` counts, and `required_coverage` / `nice_coverage` fractions
+    (1.0 where a job lists no skills of that kind), each shaped
+    (len(resumes), len(jobs)).
+    """
+    vocabulary = build_vocabulary(jobs)
+    resume_bits = encode_skill_lists([r["skills"] for r in resumes], vocabulary)
+    required_bits = encode_skill_lists([j["requirements"]["technical_skills"] for j in jobs], vocabulary)
+    nice_bits = encode_skill_lists([j.get("nice_to_have", []) for j in jobs], vocabulary)
+
+    required_total = _POPCOUNT[required_bits].sum(axis=1, dtype=np.int32)
+    nice_total = _POPCOUNT[nice_bits].sum(axis=1, dtype=np.int32)
+
+    required_overlap = _overlap_counts(resume_bits, required_bits)
+    nice_overlap = _overlap_counts(resume_bits, nice_bits)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        required_coverage = np.where(required_total > 0, required_overlap / required_total, 1.0)
+        nice_coverage = np.where(nice_total > 0, nice_overlap / nice_total, 1.0)
+
+    return {
+        "vocabulary": sorted(vocabulary, key=vocabulary.get),
+        "required_overlap": required_overlap,
+        "required_coverage": required_coverage,
+        "nice_overlap": nice_overlap,
+        "nice_coverage": nice_coverage,
+    }
@@ -0,0 +1,165 @@
+"""
+Batch Runner Tests
+==================
+Scripted checks of the Message Batches path against an in-process fake
+client: polling until a batch ends, the cancel-on-timeout path, succeeded /
+errored / expired / canceled / missing results, and the per-item fallback to
+default scores in evaluate_candidates_batch. No network or API key needed.
+
+Usage:
+    python -m unittest test_batch_runner
+"""
+
+import json
+import unittest
+from types import SimpleNamespace
+
+import api_client
+import batch_runner
+from config import CRITERIA_KEY_MAP
+from job_matcher import evaluate_candidates_batch, load_job_descriptions, load_scoring_rubric
+from response_cache import scoring_cache
+
+
+def _message(text: str):
+    usage = SimpleNamespace(input_tokens=100, output_tokens=50,
+                            cache_creation_input_tokens=0, cache_read_input_tokens=0)
+    return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+
+class FakeBatches:
+    """
+    Stand-in for client.messages.batches. `outcomes` maps a custom_id to
+    "succeeded", "errored", "expired", "canceled" or "missing" (no result
+    entry at all); unlisted ids succeed. A batch ends after `polls_to_end`
+    retrieves, or never (until cancelled) when that is None.
+    """
+
+    def __init__(self, outcomes=None, polls_to_end=1, reply=None):
+        self.outcomes = outcomes or {}
+        self.polls_to_end = polls_to_end
+        self.reply = reply or (lambda custom_id, params: "{}")
+        self.batches = {}
+        self.created = []
+        self.retrieves = 0
+        self.cancelled = []
+
+    def _status(self, batch_id):
+        batch = self.batches[batch_id]
+        ended = batch["cancelled"] or (self.polls_to_end is not None and batch["polls"] >= self.polls_to_end)
+        count = len(batch["requests"])
+        return SimpleNamespace(
+            id=batch_id,
+            processing_status="ended" if ended else "in_progress",
+            request_counts=SimpleNamespace(processing=0 if ended else count, succeeded=0, errored=0),
+        )
+
+    def create(self, requests):
+        batch_id = f"batch_{len(self.batches) + 1}"
+        self.batches[batch_id] = {"requests": requests, "polls": 0, "cancelled": False}
+        self.created.append(len(requests))
+        return self._status(batch_id)
+
+    def retrieve(self, batch_id):
+        self.retrieves += 1
+        self.batches[batch_id]["polls"] += 1
+        return self._status(batch_id)
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+        self.batches[batch_id]["cancelled"] = True
+
+    def results(self, batch_id):
+        batch = self.batches[batch_id]
+        for request in batch["requests"]:
+            custom_id = request["custom_id"]
+            outcome = "canceled" if batch["cancelled"] else self.outcomes.get(custom_id, "succeeded")
+            if outcome == "missing":
+                continue
+            if outcome == "succeeded":
+                result = SimpleNamespace(type="succeeded", message=_message(self.reply(custom_id, request["params"])))
+            else:
+                result = SimpleNamespace(type=outcome)
+            yield SimpleNamespace(custom_id=custom_id, result=result)
+
+
+class FakeClient:
+    def __init__(self, batches: FakeBatches):
+        self.messages = SimpleNamespace(batches=batches)
+
+
+class RunMessageBatchTests(unittest.TestCase):
+    def run_batch(self, batches, ids, **kwargs):
+        requests = {cid: {"model": "m", "messages": []} for cid in ids}
+        return batch_runner.run_message_batch(requests, client=FakeClient(batches), poll_seconds=0, **kwargs)
+
+    def test_polls_until_ended(self):
+        batches = FakeBatches(polls_to_end=3)
+        results = self.run_batch(batches, ["a", "b"])
+        self.assertEqual(batches.retrieves, 3)
+        self.assertEqual(batches.cancelled, [])
+        self.assertTrue(all(results[cid] is not None for cid in ("a", "b")))
+
+    def test_item_outcomes(self):
+        batches = FakeBatches(outcomes={"err": "errored", "exp": "expired", "can": "canceled", "gone": "missing"})
+        results = self.run_batch(batches, ["ok", "err", "exp", "can", "gone"])
+        self.assertEqual(results["ok"].content[0].text, "{}")
+        for cid in ("err", "exp", "can", "gone"):
+            self.assertIn(cid, results)
+            self.assertIsNone(results[cid])
+
+    def test_timeout_cancels_and_falls_back(self):
+        batches = FakeBatches(polls_to_end=None)
+        results = self.run_batch(batches, ["a", "b"], max_wait_seconds=0)
+        self.assertEqual(batches.cancelled, ["batch_1"])
+        self.assertEqual(results, {"a": None, "b": None})
+
+    def test_splits_large_submissions(self):
+        original = batch_runner.BATCH_MAX_REQUESTS
+        batch_runner.BATCH_MAX_REQUESTS = 2
+        try:
+            batches = FakeBatches()
+            results = self.run_batch(batches, ["a", "b", "c", "d", "e"])
+        finally:
+            batch_runner.BATCH_MAX_REQUESTS = original
+        self.assertEqual(batches.created, [2, 2, 1])
+        self.assertEqual(len(results), 5)
+
+
+class EvaluateCandidatesBatchTests(unittest.TestCase):
+    """evaluate_candidates_batch through the shared client, with the fake installed in api_client."""
+
+    def setUp(self):
+        self._client, self._cache_enabled = api_client._client, scoring_cache.enabled
+        scoring_cache.enabled = False
+
+    def tearDown(self):
+        api_client._client = self._client
+        scoring_cache.enabled = self._cache_enabled
+
+    def test_errored_and_unparseable_items_fall_back(self):
+        jobs = load_job_descriptions()[:1]
+        rubric = load_scoring_rubric()
+        resumes = [{"name": f"Candidate {i}", "email": f"c{i}@example.com", "raw_text": f"Resume {i}"}
+                   for i in range(4)]
+        pairs = [(resume, jobs[0]) for resume in resumes]
+        scores = {key: {"score": 5, "justification": "fits"} for key in CRITERIA_KEY_MAP.values()}
+
+        def reply(custom_id, params):
+            return "not json" if custom_id.endswith("-3") else json.dumps(scores)
+
+        job_id = jobs[0]["job_id"]
+        # Ended on submission, so run_message_batch never sleeps between polls
+        batches = FakeBatches(outcomes={f"score-{job_id}-1": "errored", f"score-{job_id}-2": "expired"},
+                              polls_to_end=0, reply=reply)
+        api_client._client = FakeClient(batches)
+
+        results = evaluate_candidates_batch(pairs, rubric)
+        self.assertEqual(results[0]["technical_skills_match"]["score"], 5)
+        for idx in (1, 2, 3):
+            self.assertTrue(results[idx].get("parse_error"), idx)
+            self.assertEqual(results[idx]["technical_skills_match"]["score"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
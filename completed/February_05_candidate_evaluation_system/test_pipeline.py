@@ -0,0 +1,99 @@
+"""
+Pipeline Shortlist Tests
+========================
+Checks provisional top-K shortlists when part of each job's ranking is
+known before scoring starts: pre-screened (auto-rejected) pairs must not
+make a shortlist stable on their own, or appear on a provisional one.
+Scoring, profile and rejection calls are replaced with local fakes, so no
+network or API key is needed.
+
+Usage:
+    python -m unittest test_pipeline
+"""
+
+import unittest
+from unittest import mock
+
+import pipeline
+from scoring_engine import IncrementalRanking
+
+
+def evaluation(name: str, score: float, prescreened: bool = False) -> dict:
+    ev = {
+        "name": name,
+        "email": f"{name.lower()}@example.com",
+        "resume": {"name": name},
+        "raw_scores": {},
+        "weighted_score": score,
+        "classification": "top_candidate" if score >= 3.5 and not prescreened else "not_selected",
+    }
+    if prescreened:
+        ev["prescreen"] = {"similarity": 0.1, "estimated_cost_saved_usd": 0.0}
+    return ev
+
+
+class IncrementalRankingSeedTests(unittest.TestCase):
+    def test_seeded_prescreens_do_not_publish(self):
+        published = []
+        ranking = IncrementalRanking("JD", total=40, k=3, stable_after=2, on_shortlist=published.append)
+        for idx in range(30):
+            ranking.seed(evaluation(f"Screened{idx}", 2.15, prescreened=True), idx)
+        self.assertEqual(published, [])
+
+        # Two LLM scores: top 3 still includes a pre-screened pair, so nothing is stable yet
+        for idx, score in ((30, 4.0), (31, 3.0)):
+            ranking.add(evaluation(f"Scored{idx}", score), idx)
+        self.assertEqual(published, [])
+
+        # Third LLM score fills the top 3; it becomes stable after two unchanged arrivals
+        for idx, score in ((32, 3.8), (33, 1.0), (34, 1.5)):
+            ranking.add(evaluation(f"Scored{idx}", score), idx)
+        self.assertEqual(len(published), 1)
+        shortlist = published[0]
+        self.assertFalse(shortlist["final"])
+        self.assertEqual([c["name"] for c in shortlist["candidates"]], ["Scored30", "Scored32", "Scored31"])
+
+    def test_fully_seeded_job_publishes_final(self):
+        published = []
+        ranking = IncrementalRanking("JD", total=2, k=1, on_shortlist=published.append)
+        ranking.seed(evaluation("A", 2.0, prescreened=True), 0)
+        ranking.seed(evaluation("B", 4.0), 1)
+        self.assertEqual(len(published), 1)
+        self.assertTrue(published[0]["final"])
+        self.assertEqual(published[0]["candidates"][0]["name"], "B")
+
+
+class PipelinePrescreenShortlistTests(unittest.TestCase):
+    def test_prescreen_and_shortlist(self):
+        n_resumes, scored = 60, 5
+        resumes = [{"name": f"Candidate{i}", "email": f"c{i}@example.com"} for i in range(n_resumes)]
+        jobs = [{"job_id": "JD001", "title": "Engineer"}]
+        precomputed = {"JD001": {
+            idx: evaluation(f"Candidate{idx}", 2.15, prescreened=True) for idx in range(scored, n_resumes)
+        }}
+        scores = iter([4.5, 3.9, 2.5, 3.6, 1.0])
+
+        def fake_score(resume, job, rubric):
+            return evaluation(resume["name"], next(scores))
+
+        published = []
+        with mock.patch.object(pipeline, "evaluate_pair", fake_score), \
+                mock.patch.object(pipeline, "generate_interview_profile", lambda *a: {}), \
+                mock.patch.object(pipeline, "generate_rejection_emails", lambda items: [""] * len(items)):
+            result = pipeline.run_pipeline(
+                resumes, jobs, [], {}, {}, max_workers=1, precomputed=precomputed,
+                shortlist_k=3, on_shortlist=published.append,
+            )
+
+        self.assertTrue(published)
+        for shortlist in published:
+            names = [c["name"] for c in shortlist["candidates"]]
+            self.assertTrue(all(int(name[len("Candidate"):]) < scored for name in names), shortlist)
+        self.assertTrue(published[-1]["final"])
+        self.assertEqual([c["weighted_score"] for c in published[-1]["candidates"]], [4.5, 3.9, 3.6])
+        ranked = result["JD001"]
+        self.assertTrue(all("prescreen" in ev for ev in ranked[scored:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
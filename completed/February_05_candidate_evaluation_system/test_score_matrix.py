@@ -0,0 +1,132 @@
+"""
+Score Matrix Tests
+==================
+Checks the vectorised scoring in score_matrix against the per-evaluation
+path in scoring_engine on random rubrics: weighted scores and
+classifications must equal build_evaluation's, and rank_matrix must order
+every job exactly as rank_candidates_for_job does, pre-screened pairs and
+score ties included.
+
+Usage:
+    python -m unittest test_score_matrix
+"""
+
+import random
+import unittest
+
+import numpy as np
+
+from config import CRITERIA_KEY_MAP
+from rescore import rescore_evaluations
+from score_matrix import (
+    build_score_matrix,
+    classify_matrix,
+    criterion_scores,
+    rank_matrix,
+    weighted_scores,
+)
+from scoring_engine import build_evaluation, rank_candidates_for_job
+
+CRITERIA = list(CRITERIA_KEY_MAP)
+
+
+def random_rubric(rng: random.Random) -> list[dict]:
+    """A rubric over a random subset of criteria, weights in hundredths summing to 1."""
+    criteria = rng.sample(CRITERIA, rng.randint(2, len(CRITERIA)))
+    cuts = sorted(rng.sample(range(1, 100), len(criteria) - 1))
+    weights = [(b - a) / 100 for a, b in zip([0] + cuts, cuts + [100])]
+    return [{"criteria": c, "weight": w} for c, w in zip(criteria, weights)]
+
+
+def random_raw_scores(rng: random.Random) -> dict:
+    """Integer 1-5 criterion scores, occasionally with a criterion missing."""
+    return {
+        key: {"score": rng.randint(1, 5), "justification": ""}
+        for key in CRITERIA_KEY_MAP.values()
+        if rng.random() > 0.1
+    }
+
+
+def random_job(rng: random.Random, rubric: list[dict], n: int) -> list[dict]:
+    evaluations = []
+    for i in range(n):
+        resume = {"name": f"Candidate{i}", "email": f"c{i}@example.com"}
+        ev = build_evaluation(resume, random_raw_scores(rng), rubric)
+        if rng.random() < 0.3:
+            ev["prescreen"] = {"similarity": 0.1, "estimated_cost_saved_usd": 0.0}
+            ev["classification"] = "not_selected"
+        evaluations.append(ev)
+    return evaluations
+
+
+class WeightedScoreTests(unittest.TestCase):
+    def test_matches_build_evaluation(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            rubric = random_rubric(rng)
+            threshold = rng.choice([3.0, 3.5, 3.75, 4.0])
+            evaluations = random_job(rng, rubric, 40)
+            weighted = weighted_scores(criterion_scores(evaluations), rubric)
+            self.assertEqual(weighted.tolist(), [ev["weighted_score"] for ev in evaluations])
+            selected = classify_matrix(weighted, threshold)
+            self.assertEqual(
+                selected.tolist(), [ev["weighted_score"] >= threshold for ev in evaluations],
+            )
+
+    def test_rubric_sweep_matches_each_rubric(self):
+        rng = random.Random(11)
+        rubrics = [random_rubric(rng) for _ in range(5)]
+        evaluations = random_job(rng, rubrics[0], 30)
+        scores = criterion_scores(evaluations)
+        sweep = weighted_scores(scores, rubrics)
+        self.assertEqual(sweep.shape, (5, 30))
+        for rubric, row in zip(rubrics, sweep):
+            self.assertEqual(row.tolist(), weighted_scores(scores, rubric).tolist())
+
+
+class RankMatrixTests(unittest.TestCase):
+    def test_matches_rank_candidates_for_job(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            rubric = random_rubric(rng)
+            jobs = {f"JD{j}": random_job(rng, rubric, rng.randint(1, 40)) for j in range(3)}
+            matrix = build_score_matrix(jobs)
+            ranks = rank_matrix(
+                weighted_scores(matrix["scores"], rubric), matrix["positions"], matrix["prescreened"],
+            )
+            for j, (job_id, evaluations) in enumerate(jobs.items()):
+                expected = [ev["name"] for ev in rank_candidates_for_job(list(evaluations))]
+                rows = [matrix["candidates"].index(f"c{name[len('Candidate'):]}@example.com")
+                        for name in expected]
+                self.assertEqual(ranks[rows, j].tolist(), list(range(1, len(expected) + 1)))
+
+    def test_unevaluated_pairs_rank_zero(self):
+        weighted = np.array([[4.0, np.nan], [3.5, 2.0], [np.nan, 4.5]])
+        self.assertEqual(rank_matrix(weighted).tolist(), [[1, 0], [2, 2], [0, 1]])
+
+
+class RescoreTests(unittest.TestCase):
+    def test_ties_keep_previous_order(self):
+        rng = random.Random(5)
+        old_rubric, new_rubric = random_rubric(rng), random_rubric(rng)
+        evaluations = rank_candidates_for_job(random_job(rng, old_rubric, 60))
+        rescored = rescore_evaluations({"JD": evaluations}, new_rubric, 3.5)["JD"]
+
+        # evaluations are in previous rank order, which ties must keep
+        expected = []
+        for ev in evaluations:
+            new = build_evaluation(ev, ev["raw_scores"], new_rubric)
+            if "prescreen" in ev:
+                new["prescreen"] = ev["prescreen"]
+                new["classification"] = "not_selected"
+            expected.append(new)
+        expected = rank_candidates_for_job(expected)
+        self.assertEqual([ev["rank"] for ev in rescored], list(range(1, 61)))
+        self.assertEqual(
+            [(ev["name"], ev["weighted_score"], ev["classification"]) for ev in rescored],
+            [(ev["name"], ev["weighted_score"], ev["classification"]) for ev in expected],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import anthropic
+import httpx
 import os
 import re
+import time
 from datetime import date
 
 # Portfolio log file path
@@ -197,9 +199,55 @@ Challenge:
 """
 
 
+# Shared client with a pooled keep-alive transport (created on first call)
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=5, max_keepalive_connections=5, keepalive_expiry=60.0)
+_client = None
+
+# Per-call timings: connect time (0 when the pooled connection was reused) and latency
+call_timings = []
+
+
+def _trace_request(request: httpx.Request):
+    """Timestamp request start and TCP/TLS connection setup."""
+    timing = {"start": time.perf_counter()}
+
+    def trace(event_name, info):
+        if event_name == "connection.connect_tcp.started":
+            timing["connect_start"] = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            timing["connect_end"] = time.perf_counter()
+
+    request.extensions["trace"] = trace
+    request.extensions["call_timing"] = timing
+
+
+def _record_response(response: httpx.Response):
+    """Store connect and latency timings for a completed request."""
+    timing = response.request.extensions.get("call_timing", {})
+    if "start" not in timing:
+        return
+    connect = timing.get("connect_end", timing.get("connect_start", 0)) - timing.get("connect_start", 0)
+    call_timings.append({
+        "connection_reused": "connect_start" not in timing,
+        "connect_ms": round(connect * 1000, 1),
+        "latency_ms": round((time.perf_counter() - timing["start"]) * 1000, 1),
+    })
+
+
+def get_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = anthropic.Anthropic(http_client=anthropic.DefaultHttpxClient(
+            limits=HTTP_POOL_LIMITS,
+            event_hooks={"request": [_trace_request], "response": [_record_response]},
+        ))
+    return _client
+
+
 def call_anthropic(prompt: str, model: str = "claude-sonnet-4-20250514") -> str:
     """Call the Anthropic API with a given prompt."""
-    client = anthropic.Anthropic()
+    client = get_client()
     response = client.messages.create(
         model=model,
         max_tokens=4096,
@@ -346,4 +394,8 @@ if __name__ == "__main__":
     # Extract summary and append to portfolio log
     extract_and_append_summary(challenge, today)
 
+    for i, t in enumerate(call_timings, 1):
+        reuse = "reused connection" if t["connection_reused"] else f"connect {t['connect_ms']}ms"
+        print(f"  API call {i}: {t['latency_ms']}ms ({reuse})")
+
     print("\nDaily challenge generation complete!")